@@ -0,0 +1,37 @@
+"""
+ACM Pipeline
+============
+Reusable building blocks for the Phase I–V coverage pipeline.
+
+The Quarto documents and Streamlit apps import from here instead of
+re-deriving the same logic cell by cell:
+
+    acm.coverage    — NEEDS vs HAS judgment (G / R / Y / N), overall status,
+                      gap summaries and the dashboard aggregation cube
+    acm.needs       — asset technology needs (P / S / N) from component lists,
+                      via compiled component → tech rules
+    acm.routes      — DEPT / TECH / VENDOR codes parsed from route descriptions
+                      and the asset-level route HAS flags
+    acm.recency     — meter reading age, per-technology recency thresholds
+                      and age histograms
+    acm.maximo      — pooled Maximo ODBC client with per-query metrics
+    acm.fetch       — streaming fetchmany into typed columnar batches
+    acm.schema      — declared column types / dictionaries / nullability per query
+    acm.extract     — the pipeline's Maximo extracts, run concurrently
+    acm.dimension   — the shared asset dimension (key, attributes, rank) and
+                      joins against it by integer ASSET_KEY
+    acm.artifacts   — stage outputs as partitioned Parquet datasets, with
+                      column-projected reads, CSV exports on request and
+                      memory-mapped Arrow copies for the apps
+    acm.incremental — ROWSTAMP-watermarked delta refresh of stored extracts
+    acm.pipeline    — one site's extraction → judgment run, and all sites in
+                      parallel worker processes into a SITEID-partitioned dataset
+    acm.stages      — the pipeline as a graph of stages cached by input / code
+                      hash, independent stages run in parallel
+    acm.cli         — ``python -m acm run``: headless stage runs with per-stage
+                      timing and non-zero exit on validation failures
+    acm.standin     — synthetic stand-in Maximo database (SQLite) and its client
+                      for offline runs and benchmarks
+    acm.refresh     — single-flight background refresh jobs and atomic pickle
+                      swaps for the Streamlit apps
+"""
@@ -0,0 +1,5 @@
+"""``python -m acm`` — see acm/cli.py."""
+
+from acm.cli import main
+
+raise SystemExit(main())
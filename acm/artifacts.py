@@ -0,0 +1,279 @@
+"""
+ACM Artifact Store
+==================
+Pipeline stage outputs as compressed, columnar Parquet datasets.
+
+Each stage of the main document used to write its frame twice — a pickle in
+``data/`` and a CSV twin in ``output/`` — and the dashboards unpickled the
+whole file. The store writes every stage once:
+
+    data/artifacts/<name>/SITEID=HMA/ASSET_DEPT=1AF/….parquet
+
+  · zstd-compressed Parquet, categoricals stored dictionary-encoded (they
+    come back as categoricals)
+  · partitioned by SITEID and ASSET_DEPT where the frame has them
+  · readers load only the columns (and partitions) they ask for
+  · CSVs are rendered from the stored artifact only on request
+
+    store = ArtifactStore()
+    store.write('coverage_report', report, site='HMA')
+    store.read('coverage_report', columns=['ASSETNUM', 'overall_status'],
+               filters=[('ASSET_DEPT', '==', '1AF')])
+    store.export_csv('coverage_report')      # → output/coverage_report.csv
+
+    python -m acm.artifacts --list
+    python -m acm.artifacts --export coverage_report --site HMA
+
+Artifacts the Streamlit apps load are also published as one uncompressed
+Arrow IPC (Feather v2) file per site, ``data/artifacts/<name>.<SITEID>.arrow``.
+Apps memory-map it instead of unpickling the whole file: the file's pages
+come from the OS page cache, only the projected columns are read, and
+null-free numeric columns stay backed by the mapping. Categorical, string
+and nullable columns are converted into each process's own memory (a frame
+of categoricals, far smaller than the pickle, but not shared between
+processes):
+
+    store.write('coverage_report', report, site='HMA', mapped=True)
+    store.map_frame('coverage_report', ['ASSETNUM', 'overall_status'], site='HMA')
+
+A write with ``site`` replaces only that site's partition; without it the
+whole artifact is replaced. Either way the new files are written to a
+staging directory and swapped in with two renames (old → backup, staging →
+target), so no reader sees a partly written file. The swap is not a single
+atomic step: in the instant between the renames the directory is absent, and
+a whole-artifact ``read()`` racing it returns the other sites without that
+one (a ``read(site=...)`` of it raises FileNotFoundError). Schedule refreshes
+apart from bulk reads, or read the memory-mapped copy, which is swapped in
+with a single ``os.replace``. Partitioned artifacts read back grouped by
+partition — sort if row order matters.
+"""
+
+import argparse
+import os
+import shutil
+import threading
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+# ── Constants ─────────────────────────────────────────────────────────────────
+
+DEFAULT_ROOT = 'data/artifacts'
+DEFAULT_EXPORT_DIR = 'output/intermediate'
+
+SITE_COL = 'SITEID'
+
+# Partition columns, outermost first; only those a frame has are used
+PARTITION_COLS = [SITE_COL, 'ASSET_DEPT']
+
+COMPRESSION = 'zstd'
+
+MAPPED_SUFFIX = '.arrow'
+
+
+# ── Store ─────────────────────────────────────────────────────────────────────
+
+class ArtifactStore:
+    """
+    Named Parquet datasets under one root directory.
+
+    Parameters
+    ----------
+    root : str or Path
+        Directory holding one dataset directory per artifact.
+    """
+
+    def __init__(self, root: str | Path = DEFAULT_ROOT):
+        self.root = Path(root)
+
+    def path(self, name: str, site: str | None = None) -> Path:
+        """Dataset directory of an artifact, or of one site's partition."""
+        path = self.root / name
+        return path / f'{SITE_COL}={site}' if site is not None else path
+
+    def mapped_path(self, name: str, site: str | None = None) -> Path:
+        """Memory-mappable Arrow file of an artifact (one per site)."""
+        stem = f'{name}.{site}' if site is not None else name
+        return self.root / f'{stem}{MAPPED_SUFFIX}'
+
+    def names(self) -> list[str]:
+        """Stored artifacts."""
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir()
+                      if p.is_dir() and not p.name.startswith('.'))
+
+    def write(self, name: str, df: pd.DataFrame, site: str | None = None,
+              partition_cols: list[str] | None = None, mapped: bool = False) -> Path:
+        """
+        Store a stage's frame, replacing the artifact (or, with ``site``, only
+        that site's partition).
+
+        Parameters
+        ----------
+        name : str
+            Artifact name ('coverage_report', 'has_monitoring', ...).
+        df : DataFrame
+            The frame; its index is not stored.
+        site : str, optional
+            Maximo SITEID the frame belongs to. Stored as the SITEID
+            partition; a SITEID column in ``df`` is dropped in favour of it.
+        partition_cols : list of str, optional
+            Partition columns (default: those of PARTITION_COLS in ``df``).
+        mapped : bool
+            Also publish the frame as a memory-mappable Arrow file for the
+            apps (``publish_mapped``).
+        """
+        if site is not None:
+            df = df.drop(columns=[SITE_COL], errors='ignore')
+        candidates = PARTITION_COLS if partition_cols is None else partition_cols
+        partitions = [col for col in candidates if col in df.columns]
+
+        target = self.path(name, site)
+        staging = target.with_name(f'.{target.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        shutil.rmtree(staging, ignore_errors=True)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        pq.write_to_dataset(table, staging, partition_cols=partitions or None,
+                            compression=COMPRESSION, use_dictionary=True)
+        _swap_dir(staging, target)
+
+        size = sum(f.stat().st_size for f in target.rglob('*.parquet'))
+        print(f"✓ {name}: {len(df):,} rows → {target} ({size / 1024**2:.2f} MB"
+              f"{', partitioned by ' + ', '.join(partitions) if partitions else ''})")
+        if mapped:
+            self.publish_mapped(name, df, site)
+        return target
+
+    def publish_mapped(self, name: str, df: pd.DataFrame, site: str | None = None) -> Path:
+        """
+        Write ``df`` as one uncompressed Arrow IPC file and swap it in with
+        ``os.replace``. Apps that still map the old file keep reading it
+        until they reload; new maps see the new file.
+        """
+        path = self.mapped_path(name, site)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f'.{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        try:
+            with pa.OSFile(str(tmp), 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            os.replace(tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
+        return path
+
+    def mapped_columns(self, name: str, site: str | None = None) -> list[str]:
+        """Column names of a mapped artifact (reads only the file footer)."""
+        path = self.mapped_path(name, site)
+        if not path.exists():
+            raise FileNotFoundError(f"Mapped artifact not found: {path}")
+        with pa.memory_map(str(path)) as source, pa.ipc.open_file(source) as reader:
+            return reader.schema.names
+
+    def map_frame(self, name: str, columns: list[str] | None = None,
+                  site: str | None = None) -> pd.DataFrame:
+        """
+        Memory-map a published artifact and convert only ``columns``.
+
+        Numeric columns without nulls are used in place, backed by the
+        mapping (it stays alive while the frame references it). Dictionary,
+        string and nullable columns are converted one column at a time into
+        private pandas memory — categoricals, not object strings.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the artifact was not published with ``mapped=True``.
+        """
+        path = self.mapped_path(name, site)
+        if not path.exists():
+            raise FileNotFoundError(f"Mapped artifact not found: {path}")
+        with pa.memory_map(str(path)) as source, pa.ipc.open_file(source) as reader:
+            table = reader.read_all()
+            if columns is not None:
+                table = table.select(columns)
+            return table.to_pandas(split_blocks=True)
+
+    def read(self, name: str, columns: list[str] | None = None,
+             site: str | None = None, filters: list | None = None) -> pd.DataFrame:
+        """
+        Load an artifact, or only some of its columns / partitions.
+
+        Parameters
+        ----------
+        columns : list of str, optional
+            Columns to read (partition columns included); default all.
+        site : str, optional
+            Read only this site's partition (no SITEID column in the result).
+        filters : list, optional
+            pyarrow filters, e.g. ``[('ASSET_DEPT', 'in', ['1AF', '2AF'])]``;
+            partition filters skip whole directories.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the artifact (or site partition) has not been written.
+        """
+        path = self.path(name, site)
+        if not path.exists():
+            raise FileNotFoundError(f"Artifact not found: {path}")
+        return pd.read_parquet(path, columns=columns, filters=filters)
+
+    def export_csv(self, name: str, out_path: str | Path | None = None,
+                   site: str | None = None, columns: list[str] | None = None) -> Path:
+        """Render a stored artifact as CSV (default ``output/intermediate/<name>.csv``)."""
+        out_path = Path(out_path or Path(DEFAULT_EXPORT_DIR) / f'{name}.csv')
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        df = self.read(name, columns=columns, site=site)
+        df.to_csv(out_path, index=False)
+        print(f"✓ Exported {name}: {len(df):,} rows → {out_path}")
+        return out_path
+
+
+def _swap_dir(staging: Path, target: Path):
+    """
+    Replace ``target`` with ``staging`` (a rename each way; old copy removed
+    after). Not atomic: ``target`` is missing between the two renames. If the
+    second rename fails the old copy is moved back before the error propagates.
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    retired = target.with_name(f'.{target.name}.{os.getpid()}.{threading.get_ident()}.old')
+    if target.exists():
+        os.replace(target, retired)
+    try:
+        os.replace(staging, target)
+    except BaseException:
+        if retired.exists():
+            os.replace(retired, target)
+        raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    shutil.rmtree(retired, ignore_errors=True)
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        prog='python -m acm.artifacts',
+        description="List stored pipeline artifacts or render one as CSV.")
+    parser.add_argument('--root', default=DEFAULT_ROOT, help="artifact store directory")
+    parser.add_argument('--list', action='store_true', help="list stored artifacts")
+    parser.add_argument('--export', metavar='NAME', help="artifact to render as CSV")
+    parser.add_argument('--site', help="only this SITEID's partition")
+    parser.add_argument('--out', help=f"CSV path (default {DEFAULT_EXPORT_DIR}/<NAME>.csv)")
+    args = parser.parse_args(argv)
+
+    store = ArtifactStore(args.root)
+    if args.export:
+        store.export_csv(args.export, args.out, site=args.site)
+    else:
+        for name in store.names():
+            print(name)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+"""
+ACM Command Line
+================
+Headless pipeline runs for the nightly refresh — no Quarto render, no
+notebook kernel. Drives the same stages the main document renders
+(acm/stages.py):
+
+    python -m acm run --site HMA                                   # every stage
+    python -m acm run --site HMA --stages needs,judge --jobs 4 --from-cache
+    python -m acm run --site HMA --site ELP --incremental --export-csv
+    python -m acm stages                                           # list the stages
+
+Each site prints its per-stage timing (ran / cached) when it finishes. Sites
+run in parallel worker processes (``--processes``, default one per site up to
+the CPU count), each with its own Maximo connection pool; stages within a
+site run in parallel threads (``--jobs``).
+
+Exit status: 0 on success, 2 when validation fails (a SchemaViolation while
+fetching, a ReportValidationError from ``validate_report``, an unknown
+stage), 1 on any other error — including ValueErrors from anywhere else,
+which are bugs, not data problems. A failing site does not stop the others.
+"""
+
+import argparse
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+from acm.artifacts import DEFAULT_ROOT as ARTIFACT_ROOT, ArtifactStore
+from acm.extract import DEFAULT_SITE
+from acm.pipeline import DEFAULT_CONFIG_DIR, ReportValidationError
+from acm.schema import SchemaViolation
+from acm.stages import DEFAULT_CACHE_DIR, GAP_REPORT_DIR, STAGES, StageRunner, format_stage_report
+
+
+EXIT_OK, EXIT_ERROR, EXIT_INVALID = 0, 1, 2
+
+# Data-quality rejections (exit 2); every other exception is an error (exit 1)
+VALIDATION_ERRORS = (SchemaViolation, ReportValidationError)
+
+
+# ── Commands ──────────────────────────────────────────────────────────────────
+
+def run_site(site: str, args: argparse.Namespace) -> int:
+    """One site's stages; returns its exit status."""
+    start = time.perf_counter()
+    runner = StageRunner(site=site, root=args.root, config_dir=args.config_dir,
+                         cache_dir=args.cache_dir, incremental=args.incremental,
+                         drill_down=args.drill_down, from_cache=args.from_cache,
+                         max_workers=args.jobs)
+    try:
+        results = runner.run(args.stages, force=args.force)
+        if args.export_csv and 'export' in results:
+            store = ArtifactStore(runner.root / ARTIFACT_ROOT)
+            store.export_csv('coverage_report',
+                             runner.root / GAP_REPORT_DIR / site / 'coverage_report.csv', site=site)
+    except VALIDATION_ERRORS as exc:
+        print(f"✗ {site}: validation failed — {exc}", file=sys.stderr)
+        return EXIT_INVALID
+    except Exception:
+        traceback.print_exc()
+        print(f"✗ {site}: failed", file=sys.stderr)
+        return EXIT_ERROR
+
+    print(format_stage_report(results))
+    print(f"✓ {site} done in {time.perf_counter() - start:.1f}s")
+    return EXIT_OK
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    sites = list(dict.fromkeys(args.site or [DEFAULT_SITE]))
+    workers = min(args.processes or os.cpu_count() or 1, len(sites))
+    if workers == 1:
+        return max(run_site(site, args) for site in sites)
+
+    statuses = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {site: pool.submit(run_site, site, args) for site in sites}
+        for site, future in futures.items():
+            try:
+                statuses[site] = future.result()
+            except Exception:          # the worker process itself died
+                traceback.print_exc()
+                print(f"✗ {site}: worker failed", file=sys.stderr)
+                statuses[site] = EXIT_ERROR
+    for site, status in statuses.items():
+        print(f"  {site:<8} exit {status}")
+    return max(statuses.values())
+
+
+def cmd_stages(args: argparse.Namespace) -> int:
+    for stage in STAGES.values():
+        after = f"  ← {', '.join(stage.deps)}" if stage.deps else ''
+        print(f"{stage.name:<8}{after}")
+    return EXIT_OK
+
+
+# ── Parser ────────────────────────────────────────────────────────────────────
+
+def _stage_list(value: str) -> list[str]:
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in names if name not in STAGES]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown stage(s) {', '.join(unknown)}; stages are {', '.join(STAGES)}")
+    return names
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m acm',
+                                     description="ACM coverage pipeline, without Quarto.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help="run pipeline stages for one or more sites")
+    run.add_argument('--site', action='append',
+                     help=f"Maximo SITEID (repeatable; default {DEFAULT_SITE})")
+    run.add_argument('--stages', type=_stage_list,
+                     help="comma-separated stages to run, plus whatever they need "
+                          "(default: all)")
+    run.add_argument('--jobs', type=int, default=3, help="stages run at once per site")
+    run.add_argument('--processes', type=int,
+                     help="sites run at once, one worker process each "
+                          "(default: one per site, up to the CPU count)")
+    run.add_argument('--from-cache', action='store_true',
+                     help="reuse the cached extract instead of querying Maximo")
+    run.add_argument('--force', action='store_true', help="ignore the stage cache")
+    run.add_argument('--incremental', action='store_true',
+                     help="extract with ROWSTAMP delta pulls")
+    run.add_argument('--drill-down', action='store_true',
+                     help="pull per-meter rows instead of the server-side aggregate")
+    run.add_argument('--export-csv', action='store_true',
+                     help=f"also render {GAP_REPORT_DIR}/<SITEID>/coverage_report.csv")
+    run.add_argument('--root', default='.', help="project root")
+    run.add_argument('--config-dir', default=DEFAULT_CONFIG_DIR)
+    run.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    run.set_defaults(handler=cmd_run)
+
+    stages = commands.add_parser('stages', help="list the pipeline stages")
+    stages.set_defaults(handler=cmd_stages)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    for flag in ('jobs', 'processes'):
+        value = getattr(args, flag, None)
+        if value is not None and value < 1:
+            print(f"✗ --{flag} must be at least 1", file=sys.stderr)
+            return EXIT_INVALID
+    return args.handler(args)
@@ -0,0 +1,295 @@
+"""
+ACM Coverage Judgment
+=====================
+Vectorized NEEDS vs HAS judgment for the Phase V coverage report.
+
+Every technology is judged per asset from two Y/N flags:
+
+    NEEDS   HAS    judgment
+    -----   ---    --------
+      Y      Y     G  — covered
+      Y      N     R  — gap (critical)
+      N      Y     Y  — over-monitored
+      N      N     N  — not applicable
+
+The flags are packed into a uint8 bit matrix (assets × techs) as
+``NEEDS << 1 | HAS``, so the matrix value *is* the judgment code. All
+technologies are judged in one NumPy pass and returned as categoricals whose
+codes are the same bit values — the gap summaries below then work straight
+off those codes without rescanning the report per technology or per class.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# ── Constants ─────────────────────────────────────────────────────────────────
+
+# Judgment label for each code (index == NEEDS << 1 | HAS)
+JUDGMENTS = ['N', 'Y', 'R', 'G']
+
+CODE_N, CODE_Y, CODE_R, CODE_G = range(len(JUDGMENTS))
+
+# Overall asset status, highest precedence first: any RED → RED, else any GREEN
+# → GREEN, else any YELLOW → YELLOW, else N
+STATUSES = ['RED', 'GREEN', 'YELLOW', 'N']
+
+# Precedence rank of each judgment code (N, Y, R, G); status code = 3 - max rank
+_STATUS_RANK = np.array([0, 1, 3, 2], dtype=np.uint8)
+
+
+def judge_column(tech: str) -> str:
+    """Name of the judgment column for a technology code, e.g. 'VI' → 'vi_judge'."""
+    return f'{tech.lower()}_judge'
+
+
+# ── Encoding ──────────────────────────────────────────────────────────────────
+
+def _flag_matrix(df: pd.DataFrame, cols: list[str]) -> np.ndarray:
+    """
+    Boolean matrix (rows × cols) of Y/N flag columns.
+    Accepts 'Y'/'N' strings, categoricals or booleans. Missing columns are all False.
+    """
+    flags = np.zeros((len(df), len(cols)), dtype=bool)
+    for j, col in enumerate(cols):
+        if col not in df.columns:
+            continue
+        values = df[col]
+        if pd.api.types.is_bool_dtype(values):
+            flags[:, j] = values.to_numpy(dtype=bool, na_value=False)
+        else:
+            flags[:, j] = (values == 'Y').to_numpy(dtype=bool, na_value=False)
+    return flags
+
+
+def encode_flags(df: pd.DataFrame, tech_cols: list[str]) -> np.ndarray:
+    """
+    Pack NEEDS_<tech> / HAS_<tech> columns into a uint8 code matrix (assets × techs).
+
+    Returns
+    -------
+    ndarray of uint8, values in 0..3 (see JUDGMENTS)
+    """
+    needs = _flag_matrix(df, [f'NEEDS_{tech}' for tech in tech_cols])
+    has = _flag_matrix(df, [f'HAS_{tech}' for tech in tech_cols])
+    return (needs.view(np.uint8) << 1) | has.view(np.uint8)
+
+
+def judgment_codes(report: pd.DataFrame, tech_cols: list[str]) -> np.ndarray:
+    """
+    Recover the uint8 code matrix from the ``*_judge`` columns of a report.
+
+    Categorical judge columns built by ``judge_coverage`` are read straight from
+    their codes; plain string columns (e.g. a report reloaded from CSV) are mapped.
+    """
+    codes = np.empty((len(report), len(tech_cols)), dtype=np.uint8)
+    lookup = {label: code for code, label in enumerate(JUDGMENTS)}
+    for j, tech in enumerate(tech_cols):
+        values = report[judge_column(tech)]
+        if (isinstance(values.dtype, pd.CategoricalDtype)
+                and list(values.cat.categories) == JUDGMENTS):
+            codes[:, j] = values.cat.codes.to_numpy()
+        else:
+            codes[:, j] = values.map(lookup).fillna(CODE_N).to_numpy(dtype=np.uint8)
+    return codes
+
+
+# ── Judgment ──────────────────────────────────────────────────────────────────
+
+def judge_coverage(df: pd.DataFrame, tech_cols: list[str]) -> pd.DataFrame:
+    """
+    Judge NEEDS vs HAS for every technology at once.
+
+    Parameters
+    ----------
+    df : DataFrame
+        Asset-level frame with NEEDS_<tech> and HAS_<tech> flag columns.
+    tech_cols : list[str]
+        Technology codes to judge, e.g. ['GM', 'IR', 'VI', ...].
+
+    Returns
+    -------
+    DataFrame indexed like ``df`` with one categorical ``<tech>_judge`` column
+    per technology (categories: N, Y, R, G).
+    """
+    codes = encode_flags(df, tech_cols)
+    return pd.DataFrame(
+        {
+            judge_column(tech): pd.Categorical.from_codes(codes[:, j], categories=JUDGMENTS)
+            for j, tech in enumerate(tech_cols)
+        },
+        index=df.index,
+    )
+
+
+def overall_status(report: pd.DataFrame, tech_cols: list[str]) -> pd.Series:
+    """
+    Classify each asset into ONE overall status from all its technology judgments.
+
+    Precedence reduction over the ``*_judge`` columns: each judgment is mapped to
+    its rank (R > G > Y > N) and the row-wise maximum picks the status.
+
+    Returns
+    -------
+    Series named 'overall_status', categorical with categories STATUSES.
+    """
+    rank = _STATUS_RANK[judgment_codes(report, tech_cols)].max(axis=1, initial=0)
+    return pd.Series(
+        pd.Categorical.from_codes(len(STATUSES) - 1 - rank, categories=STATUSES),
+        index=report.index,
+        name='overall_status',
+    )
+
+
+# ── Summaries ─────────────────────────────────────────────────────────────────
+
+def judgment_counts(codes: np.ndarray) -> np.ndarray:
+    """Count of each judgment per technology. Returns an int array (techs × 4)."""
+    n_techs = codes.shape[1]
+    offsets = np.arange(n_techs) * len(JUDGMENTS)
+    return (
+        np.bincount((codes + offsets).ravel(), minlength=n_techs * len(JUDGMENTS))
+        .reshape(n_techs, len(JUDGMENTS))
+    )
+
+
+def gap_summary_by_technology(report: pd.DataFrame, tech_cols: list[str]) -> pd.DataFrame:
+    """
+    Gap summary with one row per technology.
+
+    Returns
+    -------
+    DataFrame with columns: Technology, Total_Assets, Assets_Needing,
+    Assets_With_Monitoring, Covered_Green, Gap_Red, Over_Monitored_Yellow,
+    Not_Applicable_N, Coverage_Percent
+    """
+    counts = judgment_counts(judgment_codes(report, tech_cols))
+    green, red = counts[:, CODE_G], counts[:, CODE_R]
+    yellow, na = counts[:, CODE_Y], counts[:, CODE_N]
+    needs = green + red
+    coverage_pct = np.divide(green * 100, needs, out=np.zeros(len(tech_cols)), where=needs > 0)
+
+    return pd.DataFrame({
+        'Technology': tech_cols,
+        'Total_Assets': len(report),
+        'Assets_Needing': needs,
+        'Assets_With_Monitoring': green + yellow,
+        'Covered_Green': green,
+        'Gap_Red': red,
+        'Over_Monitored_Yellow': yellow,
+        'Not_Applicable_N': na,
+        'Coverage_Percent': coverage_pct.round(1),
+    })
+
+
+def gap_summary_by_class(report: pd.DataFrame, tech_cols: list[str],
+                         class_col: str = 'ASSET_CLASS') -> pd.DataFrame:
+    """
+    Gap summary with one row per asset class, sorted by Total_Gaps descending.
+
+    Returns
+    -------
+    DataFrame with columns: Asset_Class, Asset_Count, Total_Technology_Needs,
+    Total_Gaps, Gap_Rate_Percent
+    """
+    codes = judgment_codes(report, tech_cols)
+    per_asset = pd.DataFrame({
+        'Asset_Class': report[class_col].to_numpy(),
+        'Asset_Count': 1,
+        'Total_Technology_Needs': (codes >> 1).sum(axis=1),
+        'Total_Gaps': (codes == CODE_R).sum(axis=1),
+    })
+    summary = (
+        per_asset.dropna(subset=['Asset_Class'])
+        .groupby('Asset_Class', observed=True, sort=False)
+        .sum()
+        .reset_index()
+    )
+    needs = summary['Total_Technology_Needs'].to_numpy()
+    gaps = summary['Total_Gaps'].to_numpy()
+    summary['Gap_Rate_Percent'] = np.divide(
+        gaps * 100, needs, out=np.zeros(len(summary)), where=needs > 0
+    ).round(1)
+    return summary.sort_values('Total_Gaps', ascending=False)
+
+
+def critical_gaps(report: pd.DataFrame, tech_cols: list[str]) -> pd.DataFrame:
+    """
+    Assets with at least one RED judgment.
+
+    Returns a copy of those report rows with two extra columns:
+    ``total_gaps`` (count of RED judgments) and ``missing_technologies``
+    (comma-separated tech codes, in ``tech_cols`` order).
+    """
+    gap_mask = judgment_codes(report, tech_cols) == CODE_R
+    total_gaps = gap_mask.sum(axis=1)
+    rows = total_gaps > 0
+    gap_mask = gap_mask[rows]
+
+    # Few distinct gap patterns exist — label each pattern once, then broadcast
+    patterns, inverse = np.unique(gap_mask, axis=0, return_inverse=True)
+    labels = np.array(
+        [', '.join(t for t, missing in zip(tech_cols, p) if missing) for p in patterns],
+        dtype=object,
+    )
+
+    gaps = report.loc[rows].copy()
+    gaps['total_gaps'] = total_gaps[rows]
+    gaps['missing_technologies'] = labels[inverse.ravel()]
+    return gaps
+
+
+# ── Aggregation cube ──────────────────────────────────────────────────────────
+
+CUBE_DIMS = ['ASSET_DEPT', 'ASSET_CLASS', 'overall_status']
+
+
+def coverage_cube(report: pd.DataFrame, tech_cols: list[str],
+                  dims: list[str] = CUBE_DIMS) -> pd.DataFrame:
+    """
+    Asset counts by (ASSET_DEPT, ASSET_CLASS, overall_status, tech, judge).
+
+    Built with a single groupby over the report stacked once per technology, so
+    department, class and technology views are all slices of the same small
+    frame instead of repeated boolean scans of the asset-level report.
+
+    Returns
+    -------
+    DataFrame with columns: *dims, tech, judge, count
+    """
+    codes = judgment_codes(report, tech_cols)
+    n_assets, n_techs = codes.shape
+
+    stacked = report[dims].iloc[np.tile(np.arange(n_assets), n_techs)].reset_index(drop=True)
+    stacked['tech'] = pd.Categorical.from_codes(
+        np.repeat(np.arange(n_techs), n_assets), categories=tech_cols)
+    stacked['judge'] = pd.Categorical.from_codes(codes.T.ravel(), categories=JUDGMENTS)
+
+    return (
+        stacked.groupby(dims + ['tech', 'judge'], observed=True, dropna=False)
+        .size()
+        .reset_index(name='count')
+    )
+
+
+def cube_status_counts(cube: pd.DataFrame, by: list[str]) -> pd.DataFrame:
+    """
+    Asset counts per overall status, grouped by ``by`` (e.g. ['ASSET_DEPT']).
+
+    Every asset appears exactly once per technology in the cube, so asset counts
+    are read from a single technology slice. Rows with a missing ``by`` value
+    are dropped.
+
+    Returns
+    -------
+    DataFrame indexed by ``by`` with one column per status in STATUSES.
+    """
+    if cube.empty:
+        return pd.DataFrame(columns=STATUSES)
+    one_tech = cube[cube['tech'] == cube['tech'].cat.categories[0]]
+    return (
+        one_tech.groupby(by + ['overall_status'], observed=True)['count']
+        .sum()
+        .unstack('overall_status', fill_value=0)
+        .reindex(columns=STATUSES, fill_value=0)
+    )
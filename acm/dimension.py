@@ -0,0 +1,91 @@
+"""
+ACM Asset Dimension
+===================
+One shared asset table — key, attributes and rank — extracted once per refresh.
+
+``query/asset-dimension.sql`` returns one row per active asset with its
+integer Maximo key (``ASSETUID`` as ``ASSET_KEY``), description, class,
+department and rank tier (null for unranked assets). The pipeline, the Asset
+Rank page and the coverage dashboard all read this one extract instead of
+running their own asset queries, and join against it by ``ASSET_KEY``:
+
+    dimension = load_dimension('HMA')                    # data/asset_dimension.HMA.pkl
+    routes = attach_asset_key(has_mon_r, dimension)      # ASSETNUM → ASSET_KEY
+    report = join_dimension(report, dimension, ['RANK'])
+
+Integer keys join faster than the string/categorical ASSETNUM and line up
+across frames whose ASSETNUM categories differ. ASSETUIDs are unique across
+sites, so each site keeps its own dimension file and a report only joins
+against its own site's.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from acm.refresh import atomic_to_pickle
+
+
+# ── Constants ─────────────────────────────────────────────────────────────────
+
+DIMENSION_PATH = 'data/asset_dimension.{site}.pkl'
+
+KEY_COL = 'ASSET_KEY'
+
+# Columns of query/asset-dimension.sql, in order
+DIMENSION_COLS = [KEY_COL, 'ASSETNUM', 'ASSET_DESC', 'ASSET_CLASS', 'ASSET_DEPT', 'RANK']
+
+
+# ── Keys ──────────────────────────────────────────────────────────────────────
+
+def asset_keys(dimension: pd.DataFrame, assetnum: pd.Series) -> np.ndarray:
+    """ASSET_KEY for each ASSETNUM (-1 where the asset is not in the dimension)."""
+    if dimension.empty:                  # a site with no active assets
+        return np.full(len(assetnum), -1, dtype=np.int64)
+    lookup = pd.Index(dimension['ASSETNUM'].astype(str))
+    positions = lookup.get_indexer(assetnum.astype(str))
+    keys = dimension[KEY_COL].to_numpy()[positions]
+    return np.where(positions >= 0, keys, -1)
+
+
+def attach_asset_key(df: pd.DataFrame, dimension: pd.DataFrame,
+                     drop_missing: bool = True) -> pd.DataFrame:
+    """
+    Add ASSET_KEY to a frame keyed by ASSETNUM.
+
+    Rows whose asset is not in the dimension (inactive or other-site assets)
+    are dropped unless ``drop_missing`` is False, in which case their key is -1.
+    """
+    keyed = df.assign(**{KEY_COL: asset_keys(dimension, df['ASSETNUM'])})
+    if drop_missing:
+        keyed = keyed[keyed[KEY_COL] >= 0]
+    return keyed
+
+
+def join_dimension(df: pd.DataFrame, dimension: pd.DataFrame,
+                   columns: list[str] | None = None) -> pd.DataFrame:
+    """Left-join dimension ``columns`` (default: all attributes) onto ``df`` by ASSET_KEY."""
+    columns = columns or [col for col in DIMENSION_COLS if col != KEY_COL]
+    attrs = dimension.set_index(KEY_COL)[columns]
+    return df.join(attrs, on=KEY_COL)
+
+
+# ── Storage ───────────────────────────────────────────────────────────────────
+
+def dimension_path(site: str, root: str | Path = '.') -> Path:
+    """A site's dimension pickle, ``data/asset_dimension.<SITEID>.pkl`` under ``root``."""
+    return Path(root) / DIMENSION_PATH.format(site=site)
+
+
+def save_dimension(dimension: pd.DataFrame, site: str, root: str | Path = '.') -> Path:
+    """Atomically replace a site's dimension pickle."""
+    path = atomic_to_pickle(dimension, dimension_path(site, root))
+    print(f"✓ Asset dimension saved: {path} ({len(dimension):,} assets)")
+    return path
+
+
+def load_dimension(site: str, root: str | Path = '.') -> pd.DataFrame | None:
+    """A site's dimension, or None if no refresh has written it yet."""
+    path = dimension_path(site, root)
+    return pd.read_pickle(path) if path.exists() else None
@@ -0,0 +1,204 @@
+"""
+ACM Extraction Stage
+====================
+Runs the pipeline's Maximo extracts concurrently.
+
+The extract queries in ``query/`` are independent reads, so instead of running
+them one after another they are submitted to a bounded thread pool sharing
+one pooled ``MaximoClient``. The database does the work; the threads mostly
+wait on the network, so wall-clock time drops to roughly the slowest query.
+
+    frames, report = run_extracts(maximo, site='HMA')
+    asset_dim = frames['asset_dim']
+
+Every query takes the site as its first parameter (``SITEID = ?``).
+
+Asset attributes and rank come from one shared asset-dimension extract
+(``asset_dim``, see acm/dimension.py) rather than separate class and rank
+queries.
+
+With an ``IncrementalStore`` each extract is a delta refresh of its stored
+copy instead of a full pull.
+
+Meters are pulled already aggregated to one row per asset (meter count, latest
+reading, null-reading count); the per-meter rows are only extracted when
+drill-down is requested:
+
+    frames, report = run_extracts(maximo, extract_plan(drill_down=True))
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from acm.fetch import convert_chunk
+from acm.incremental import IncrementalStore
+from acm.maximo import MaximoClient
+from acm.schema import schema_for
+
+
+# ── Extract definitions ───────────────────────────────────────────────────────
+
+# Frame name → SQL file, its ROWSTAMP delta twin and how many watermark
+# placeholders follow its SITEID, row key and the columns a reconcile
+# re-checks (for incremental refresh, see acm/incremental.py).
+# Column types come from the query file's schema (acm/schema.py) and are
+# applied while fetching
+EXTRACTS = {
+    'asset_dim': {
+        'sql': 'query/asset-dimension.sql',
+        'delta_sql': 'query/delta/asset-dimension.sql',
+        'watermarks': 3,
+        'keys': ['ASSET_KEY'],
+        'check': ['RANK'],          # a deleted ASSETSPEC row moves no ROWSTAMP
+    },
+    'has_mon_r': {
+        'sql': 'query/has_mon-routes.sql',
+        'delta_sql': 'query/delta/has_mon-routes.sql',
+        'watermarks': 4,
+        'keys': ['ROUTE', 'ASSETNUM'],
+    },
+    'has_mon_m': {
+        'sql': 'query/has_mon-meters.sql',
+        'delta_sql': 'query/delta/has_mon-meters.sql',
+        'watermarks': 4,
+        'keys': ['ASSETNUM', 'METERNAME'],
+    },
+    'has_mon_m_agg': {
+        'sql': 'query/has_mon-meters-agg.sql',
+        'delta_sql': 'query/delta/has_mon-meters-agg.sql',
+        'watermarks': 1,
+        'keys': ['ASSETNUM'],
+        'check': ['METER_COUNT'],   # a deleted meter moves no surviving ROWSTAMP
+    },
+}
+
+# Per-meter rows — only extracted for drill-down (replaces the aggregate)
+DRILL_DOWN_EXTRACTS = {'has_mon_m_agg': 'has_mon_m'}
+
+# Per-asset meter summary, same columns as has_mon-meters-agg.sql
+METER_AGG_COLUMNS = ['ASSETNUM', 'METER_COUNT', 'MAX_LASTREADING_DATE',
+                     'NULL_READING_COUNT', 'ASSET_DESC', 'CLASS', 'DEPT']
+
+DEFAULT_SITE = 'HMA'
+
+DEFAULT_MAX_WORKERS = 4
+
+
+# ── Plans ─────────────────────────────────────────────────────────────────────
+
+def extract_plan(drill_down: bool = False) -> dict[str, dict]:
+    """
+    The extracts a pipeline run needs.
+
+    By default meters come pre-aggregated per asset (``has_mon_m_agg``); with
+    ``drill_down`` the per-meter ``has_mon_m`` is pulled instead and
+    aggregated locally with ``aggregate_meters``.
+    """
+    skip = set(DRILL_DOWN_EXTRACTS) if drill_down else set(DRILL_DOWN_EXTRACTS.values())
+    return {name: spec for name, spec in EXTRACTS.items() if name not in skip}
+
+
+def aggregate_meters(has_mon_m: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per-meter rows → one row per asset, matching the server-side aggregate
+    (METER_AGG_COLUMNS). Used on the drill-down path only.
+    """
+    meters = has_mon_m.assign(NULL_READING=has_mon_m['LASTREADING_DATE'].isna())
+    grouped = meters.groupby('ASSETNUM', observed=True, sort=False)
+    agg = grouped.agg(
+        METER_COUNT=('METERNAME', 'count'),
+        MAX_LASTREADING_DATE=('LASTREADING_DATE', 'max'),
+        NULL_READING_COUNT=('NULL_READING', 'sum'),
+        ASSET_DESC=('ASSET_DESC', 'first'),
+        CLASS=('CLASS', 'first'),
+        DEPT=('DEPT', 'first'),
+    ).reset_index()
+    return convert_chunk(agg[METER_AGG_COLUMNS], schema_for(EXTRACTS['has_mon_m_agg']['sql']))
+
+
+# ── Extraction ────────────────────────────────────────────────────────────────
+
+def run_extracts(client: MaximoClient, extracts: dict[str, dict] | None = None,
+                 max_workers: int = DEFAULT_MAX_WORKERS,
+                 root: str | Path = '.',
+                 incremental: IncrementalStore | None = None,
+                 site: str = DEFAULT_SITE
+                 ) -> tuple[dict[str, pd.DataFrame], pd.DataFrame]:
+    """
+    Run every extract concurrently on a bounded thread pool.
+
+    Parameters
+    ----------
+    client : MaximoClient
+        Shared pooled client; the pool size also bounds the worker count.
+    extracts : dict, optional
+        Name → {'sql': path, ...}. Defaults to ``extract_plan()``.
+    max_workers : int
+        Maximum queries in flight at once.
+    root : str or Path
+        Directory the SQL paths are relative to (the project root).
+    incremental : IncrementalStore, optional
+        Refresh each stored extract with a delta pull instead of a full pull.
+        Its store must belong to ``site``.
+    site : str
+        Maximo SITEID bound to every query.
+
+    Returns
+    -------
+    (frames, report)
+        frames — name → DataFrame
+        report — one row per extract: name, sql, rows, seconds, raw_mb
+                 (as fetched; only the delta rows when incremental) and
+                 typed_mb (the returned frame); with
+                 ``report.attrs['wall_seconds']`` and ``['summed_seconds']``
+    """
+    extracts = extract_plan() if extracts is None else extracts
+    root = Path(root)
+
+    def run_one(name: str, spec: dict) -> tuple[pd.DataFrame, float, int]:
+        start = time.perf_counter()
+        ran_before = len(client.thread_metrics())
+        if incremental is not None:
+            df = incremental.refresh(name, spec, params=(site,))
+        else:
+            df = client.run_query_from_file(root / spec['sql'], (site,))
+        raw_bytes = sum(m.raw_bytes for m in client.thread_metrics()[ran_before:])
+        return df, time.perf_counter() - start, raw_bytes
+
+    workers = max(1, min(max_workers, client.pool_size, len(extracts)))
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='extract') as pool:
+        futures = {name: pool.submit(run_one, name, spec) for name, spec in extracts.items()}
+        results = {name: future.result() for name, future in futures.items()}
+    wall_seconds = time.perf_counter() - wall_start
+
+    frames = {name: df for name, (df, _, _) in results.items()}
+    report = pd.DataFrame({
+        'name': list(results),
+        'sql': [extracts[name]['sql'] for name in results],
+        'rows': [len(df) for df, _, _ in results.values()],
+        'seconds': [seconds for _, seconds, _ in results.values()],
+        'raw_mb': [raw / 1024**2 for _, _, raw in results.values()],
+        'typed_mb': [df.memory_usage(deep=True, index=False).sum() / 1024**2
+                     for df, _, _ in results.values()],
+    })
+    report.attrs['wall_seconds'] = wall_seconds
+    report.attrs['summed_seconds'] = float(report['seconds'].sum())
+    return frames, report
+
+
+def format_extract_report(report: pd.DataFrame) -> str:
+    """One line per extract (rows, time, memory as fetched → typed) plus totals."""
+    wall = report.attrs.get('wall_seconds', float('nan'))
+    summed = report.attrs.get('summed_seconds', float(report['seconds'].sum()))
+    lines = [f"  {row.name:<14} {row.rows:>10,} rows  {row.seconds:7.2f}s  "
+             f"{row.raw_mb:8.2f} → {row.typed_mb:7.2f} MB"
+             for row in report.itertuples(index=False)]
+    speedup = f" ({summed / wall:.1f}× vs sequential)" if wall > 0 else ''
+    lines.append(f"✓ {len(report)} extracts in {wall:.2f}s wall-clock, "
+                 f"{summed:.2f}s summed query time{speedup}; "
+                 f"memory {report['raw_mb'].sum():.2f} → {report['typed_mb'].sum():.2f} MB")
+    return '\n'.join(lines)
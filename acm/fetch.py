@@ -0,0 +1,210 @@
+"""
+ACM Streaming Fetch
+===================
+Chunked cursor fetch into typed columnar batches.
+
+``pd.read_sql`` (and ``fetchall``) materialize the whole result as Python
+tuples and object columns before any dtype conversion runs, so peak memory is
+several times the final frame. Here rows are pulled with ``cursor.fetchmany``
+and each chunk is converted by its schema (see ``acm.schema``) as soon as it
+arrives, in one pass:
+
+    'category'        → per-chunk Categorical, merged with union_categoricals
+                        (fixed dictionary if the spec declares categories)
+    'datetime64[ns]'  → pd.to_datetime
+    anything else     → Series.astype
+
+Nullability is checked on the way. The raw (object) size of every chunk is
+measured before conversion, so the memory saved can be reported.
+
+Only one chunk of raw rows is alive at a time. Typed chunks are appended to an
+in-memory column buffer, or optionally spilled to Parquet parts in a private
+temporary directory while the cursor is open (so the typed chunks are not
+held in memory during a long fetch), then assembled into the frame through
+Arrow and deleted.
+"""
+
+import tempfile
+from collections.abc import Callable
+from pathlib import Path
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from acm.schema import ColumnSpec, SchemaViolation, as_spec
+
+
+# ── Constants ─────────────────────────────────────────────────────────────────
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+# Column → ColumnSpec, or a bare dtype string
+Schema = dict[str, 'str | ColumnSpec']
+
+
+# ── Conversion ────────────────────────────────────────────────────────────────
+
+def convert_chunk(chunk: pd.DataFrame, schema: Schema | None) -> pd.DataFrame:
+    """
+    Convert the columns of one chunk to their schema types (others untouched).
+    Raises SchemaViolation (a ValueError) on nulls in a non-nullable column or
+    values outside a fixed categorical dictionary.
+    """
+    for col, spec in (schema or {}).items():
+        if col not in chunk.columns:
+            continue
+        spec = as_spec(spec)
+        values = chunk[col]
+        missing = values.isna()
+        if not spec.nullable and missing.any():
+            raise SchemaViolation(f"{col}: {missing.sum():,} null value(s) in a non-nullable column")
+        if spec.dtype == 'category' and spec.categories is not None:
+            typed = pd.Categorical(values, categories=spec.categories, ordered=spec.ordered)
+            unknown = pd.isna(typed) & ~missing.to_numpy()
+            if unknown.any():
+                found = sorted(values[unknown].astype(str).unique())
+                raise SchemaViolation(f"{col}: values outside {list(spec.categories)}: {found[:5]}")
+            chunk[col] = typed
+        elif spec.dtype == 'category':
+            chunk[col] = values.astype('category')
+        elif spec.dtype.startswith('datetime64'):
+            chunk[col] = pd.to_datetime(values).astype(spec.dtype)
+        else:
+            chunk[col] = values.astype(spec.dtype)
+    return chunk
+
+
+# ── Column buffer ─────────────────────────────────────────────────────────────
+
+class ColumnBuffer:
+    """
+    Typed chunks held column by column, combined once at the end.
+
+    Categorical columns are merged with ``union_categoricals`` so chunks with
+    different category sets combine without a round trip through object dtype.
+    """
+
+    def __init__(self, columns: list[str], schema: Schema | None = None):
+        self.columns = list(columns)
+        self.schema = schema or {}
+        self._pieces = {col: [] for col in self.columns}
+        self.rows = 0
+
+    def append(self, chunk: pd.DataFrame):
+        for col in self.columns:
+            self._pieces[col].append(chunk[col])
+        self.rows += len(chunk)
+
+    def to_frame(self) -> pd.DataFrame:
+        if self.rows == 0:
+            return convert_chunk(pd.DataFrame(columns=self.columns), self.schema)
+        data = {}
+        for col in self.columns:
+            pieces = self._pieces[col]
+            if all(isinstance(p.dtype, pd.CategoricalDtype) for p in pieces):
+                data[col] = _union_categoricals(pieces)
+            else:
+                data[col] = pd.concat(pieces, ignore_index=True)
+        return pd.DataFrame(data, columns=self.columns)
+
+
+def _union_categoricals(pieces: list[pd.Series]) -> pd.Categorical:
+    """union_categoricals, tolerating all-null chunks (empty categories of another dtype)."""
+    typed = [p for p in pieces if len(p.cat.categories)]
+    if not typed:
+        return pd.Categorical(pd.concat(pieces, ignore_index=True))
+    empty = pd.Index([], dtype=typed[0].cat.categories.dtype)
+    return union_categoricals([
+        p if len(p.cat.categories) else p.cat.set_categories(empty) for p in pieces
+    ])
+
+
+# ── Fetch ─────────────────────────────────────────────────────────────────────
+
+def fetch_frame(cursor, schema: Schema | None = None,
+                chunk_size: int = DEFAULT_CHUNK_SIZE,
+                spill_dir: str | Path | None = None,
+                progress: Callable[[int], None] | None = None) -> tuple[pd.DataFrame, int]:
+    """
+    Stream an executed cursor into a DataFrame typed by ``schema``.
+
+    Parameters
+    ----------
+    cursor : DB-API cursor
+        Already executed.
+    schema : dict, optional
+        Column → ColumnSpec or dtype string ('category', 'datetime64[ns]', ...).
+    chunk_size : int
+        Rows per ``fetchmany`` call.
+    spill_dir : str or Path, optional
+        If given, each typed chunk is written as a Parquet part (requires
+        pyarrow) to a temporary directory created under ``spill_dir`` for this
+        fetch alone, instead of being held in memory. After the last fetch
+        the parts are read as one Arrow dataset, converted to the frame
+        column by column, and the directory is removed.
+    progress : callable, optional
+        Called with the running row count after each chunk.
+
+    Returns
+    -------
+    (frame, raw_bytes)
+        raw_bytes — deep memory of the chunks as fetched, before conversion
+    """
+    if spill_dir is None:
+        return _fetch_chunks(cursor, schema, chunk_size, None, progress)
+    spill_dir = Path(spill_dir)
+    spill_dir.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix='fetch-', dir=spill_dir) as parts_dir:
+        return _fetch_chunks(cursor, schema, chunk_size, Path(parts_dir), progress)
+
+
+def _fetch_chunks(cursor, schema: Schema | None, chunk_size: int,
+                  parts_dir: Path | None,
+                  progress: Callable[[int], None] | None) -> tuple[pd.DataFrame, int]:
+    columns = [col[0] for col in cursor.description]
+    buffer = ColumnBuffer(columns, schema)
+    parts = []
+    raw_bytes = 0
+    fetched = 0
+
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        chunk = pd.DataFrame.from_records(rows, columns=columns)
+        del rows
+        raw_bytes += int(chunk.memory_usage(deep=True, index=False).sum())
+        chunk = convert_chunk(chunk, schema)
+        fetched += len(chunk)
+        if progress is not None:
+            progress(fetched)
+        if parts_dir is None:
+            buffer.append(chunk)
+        else:
+            part = parts_dir / f'part-{len(parts):05d}.parquet'
+            chunk.to_parquet(part, index=False)
+            parts.append(part)
+        del chunk
+
+    if not parts:
+        return buffer.to_frame(), raw_bytes
+    return _assemble_parts(parts, columns, schema), raw_bytes
+
+
+def _assemble_parts(parts: list[Path], columns: list[str],
+                    schema: Schema | None) -> pd.DataFrame:
+    """
+    Spilled parts → one frame. The parts are concatenated as Arrow tables
+    (no per-chunk pandas copies) and converted with ``self_destruct`` so each
+    Arrow column is released as soon as its pandas column exists.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # all-null chunks store null-typed columns; permissive promotion unifies them
+    table = pa.concat_tables([pq.read_table(part) for part in parts],
+                             promote_options='permissive')
+    frame = table.select(columns).to_pandas(split_blocks=True, self_destruct=True)
+    del table
+    # re-apply the schema: dictionaries and timestamp units as declared
+    return convert_chunk(frame, schema)
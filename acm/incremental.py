@@ -0,0 +1,275 @@
+"""
+ACM Incremental Extraction
+==========================
+Delta refresh of the Maximo extracts using ROWSTAMP watermarks.
+
+Each extract has a delta twin in ``query/delta/`` that returns the same
+columns plus ``ROW_STAMP`` (the greatest ROWSTAMP of the joined rows) and only
+the rows changed since the stored watermark:
+
+    first refresh   watermark = -1  → every row (the full extract)
+    later refreshes watermark = max ROW_STAMP stored → changed rows only
+
+Changed rows replace the stored rows with the same key (ASSETNUM, METERNAME,
+ROUTE …). Deletes — and rows that fell out of the filter, e.g. an asset
+leaving A-ACTIVE — never show up in a delta, so every ``reconcile_every`` the
+current key set is pulled (keys only, via a generic wrapper around the delta
+query) and stored rows whose key is gone are dropped.
+
+Deleting a *joined* row changes a stored row without advancing any ROWSTAMP
+that survives the join — an ASSETSPEC rank row removed from an asset, one
+meter removed from an asset that keeps others. An extract whose spec lists
+``check`` columns has those pulled alongside the keys at reconcile time; keys
+whose check values differ from the stored ones (or that are missing from the
+store) are re-pulled in full, by key, from the delta query at watermark -1.
+Re-pulled rows do not move the watermark.
+
+Leading query parameters (the SITEID) are bound before the watermarks. Each
+spec states how many watermark placeholders its delta query has
+(``watermarks``) — counting ``?`` in the SQL text would also count any in a
+comment or string literal. Use one store directory per site so each site
+keeps its own watermarks.
+
+Per extract the store keeps ``<name>.pkl`` (typed frame incl. ROW_STAMP) and
+``<name>.state.json`` (watermark, last full pull, last reconcile), both
+replaced atomically.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+from acm.fetch import ColumnBuffer, Schema
+from acm.maximo import MaximoClient
+from acm.schema import ColumnSpec, schema_for
+
+
+# ── Constants ─────────────────────────────────────────────────────────────────
+
+WATERMARK_COL = 'ROW_STAMP'
+
+# Key-only pull used to reconcile deletes: same filter as the delta query at
+# watermark -1, but only the key columns cross the wire
+KEY_WRAP_SQL = 'SELECT DISTINCT {keys} FROM ({sql}) K'
+
+# Full rows for a set of keys (reconcile re-pulls), same filter at watermark -1
+ROWS_WRAP_SQL = 'SELECT * FROM ({sql}) K WHERE {cond}'
+
+# Keys per re-pull query (bound parameters)
+REPULL_BATCH = 500
+
+DEFAULT_RECONCILE_EVERY = timedelta(hours=24)
+
+
+def delta_schema(sql_path: str | Path) -> Schema:
+    """Base query's schema plus the non-nullable ROW_STAMP watermark."""
+    return (schema_for(sql_path) or {}) | {WATERMARK_COL: ColumnSpec('int64', nullable=False)}
+
+
+# ── Store ─────────────────────────────────────────────────────────────────────
+
+class IncrementalStore:
+    """
+    Locally stored extracts kept current with delta pulls.
+
+    Parameters
+    ----------
+    client : MaximoClient
+        Pooled client used for delta and key pulls.
+    store_dir : str or Path
+        Where the stored extracts and their state files live.
+    reconcile_every : timedelta
+        How often deletes are reconciled against the current key set.
+    root : str or Path
+        Directory the SQL paths are relative to (the project root).
+    """
+
+    def __init__(self, client: MaximoClient, store_dir: str | Path = 'data/extracts',
+                 reconcile_every: timedelta = DEFAULT_RECONCILE_EVERY,
+                 root: str | Path = '.'):
+        self.client = client
+        self.store_dir = Path(store_dir)
+        self.reconcile_every = reconcile_every
+        self.root = Path(root)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+
+    # ── State ─────────────────────────────────────────────────────────────────
+
+    def _paths(self, name: str) -> tuple[Path, Path]:
+        return self.store_dir / f'{name}.pkl', self.store_dir / f'{name}.state.json'
+
+    def load_state(self, name: str) -> dict:
+        """Stored watermark and timestamps for an extract ({} if never pulled)."""
+        _, state_path = self._paths(name)
+        if not state_path.exists():
+            return {}
+        return json.loads(state_path.read_text())
+
+    def _save(self, name: str, df: pd.DataFrame, state: dict):
+        frame_path, state_path = self._paths(name)
+        tmp = frame_path.with_suffix('.pkl.tmp')
+        df.to_pickle(tmp)
+        os.replace(tmp, frame_path)
+        tmp = state_path.with_suffix('.json.tmp')
+        tmp.write_text(json.dumps(state, indent=2))
+        os.replace(tmp, state_path)
+
+    # ── Refresh ───────────────────────────────────────────────────────────────
+
+    def refresh(self, name: str, spec: dict, params: tuple = (),
+                full: bool = False) -> pd.DataFrame:
+        """
+        Bring one stored extract up to date and return it (without ROW_STAMP).
+
+        Parameters
+        ----------
+        name : str
+            Extract name (file stem in the store).
+        spec : dict
+            Extract definition with 'sql', 'delta_sql', 'keys' and
+            'watermarks' (see ``acm.extract.EXTRACTS``); typed by the base
+            query's schema.
+        params : tuple
+            Leading query parameters (e.g. the SITEID), bound before the
+            ``spec['watermarks']`` watermark placeholders.
+        full : bool
+            Ignore the stored watermark and re-pull everything.
+        """
+        frame_path, _ = self._paths(name)
+        state = {} if full else self.load_state(name)
+        stored = pd.read_pickle(frame_path) if state and frame_path.exists() else None
+        if stored is None:
+            state = {}
+
+        now = datetime.now()
+        watermark = state.get('watermark', -1)
+        delta_sql = self.client.read_sql_file(self.root / spec['delta_sql'])
+        schema = delta_schema(spec['sql'])
+        bind = (tuple(params), spec['watermarks'])
+
+        delta = self._pull(delta_sql, bind, watermark, name, schema)
+        if stored is None:
+            merged = delta
+            state['full_at'] = state['reconciled_at'] = now.isoformat()
+        else:
+            merged = merge_delta(stored, delta, spec['keys'], schema)
+            reconciled_at = datetime.fromisoformat(state.get('reconciled_at', state['full_at']))
+            if now - reconciled_at >= self.reconcile_every:
+                checks = spec.get('check', [])
+                current = self._pull_keys(delta_sql, bind, spec['keys'] + checks, name)
+                merged = drop_missing_keys(merged, current, spec['keys'])
+                if checks:
+                    stale = stale_keys(merged, current, spec['keys'], checks)
+                    repulled = self._pull_rows(delta_sql, bind, stale, name, schema)
+                    merged = merge_delta(merged, repulled, spec['keys'], schema)
+                    state['repulled_rows'] = len(repulled)
+                state['reconciled_at'] = now.isoformat()
+
+        if len(delta):
+            watermark = max(watermark, int(delta[WATERMARK_COL].max()))
+        state.update(watermark=watermark, refreshed_at=now.isoformat(),
+                     delta_rows=len(delta), rows=len(merged))
+        self._save(name, merged, state)
+        return merged.drop(columns=WATERMARK_COL)
+
+    def _pull(self, delta_sql: str, bind: tuple, watermark: int, name: str,
+              schema: Schema | None) -> pd.DataFrame:
+        """Rows changed since ``watermark``."""
+        return self.client.run_query(delta_sql, _bind(bind, watermark),
+                                     name=f'{name} (delta)', schema=schema)
+
+    def _pull_keys(self, delta_sql: str, bind: tuple, keys: list[str],
+                   name: str) -> pd.DataFrame:
+        """Current key set (plus any check columns), from the delta query at watermark -1."""
+        key_sql = KEY_WRAP_SQL.format(keys=', '.join(f'K.{k}' for k in keys), sql=delta_sql)
+        return self.client.run_query(key_sql, _bind(bind, -1),
+                                     name=f'{name} (keys)')
+
+    def _pull_rows(self, delta_sql: str, bind: tuple, keys: pd.DataFrame, name: str,
+                   schema: Schema | None) -> pd.DataFrame:
+        """Current rows for ``keys`` (delta query at watermark -1), in batches of REPULL_BATCH."""
+        cols = list(keys.columns)
+        values = list(keys.astype(object).itertuples(index=False, name=None))
+        if len(cols) == 1:
+            match = 'K.{0} IN ({{marks}})'.format(cols[0])
+        else:
+            match = '({})'.format(' AND '.join(f'K.{k} = ?' for k in cols))
+        frames = []
+        for start in range(0, len(values), REPULL_BATCH):
+            batch = values[start:start + REPULL_BATCH]
+            if len(cols) == 1:
+                cond = match.format(marks=', '.join('?' * len(batch)))
+            else:
+                cond = ' OR '.join([match] * len(batch))
+            sql = ROWS_WRAP_SQL.format(sql=delta_sql, cond=cond)
+            bound = _bind(bind, -1) + tuple(v for row in batch for v in row)
+            frames.append(self.client.run_query(sql, bound, name=f'{name} (re-pull)',
+                                                schema=schema))
+        if not frames:
+            return pd.DataFrame()
+        buffer = ColumnBuffer(list(frames[0].columns), schema)
+        for frame in frames:
+            buffer.append(frame)
+        return buffer.to_frame()
+
+
+def _bind(bind: tuple, watermark: int) -> tuple:
+    """
+    Query parameters for a delta query: ``bind`` is (leading parameters,
+    number of watermark placeholders), as set up by ``refresh``.
+    """
+    params, watermarks = bind
+    return params + (watermark,) * watermarks
+
+
+# ── Merge ─────────────────────────────────────────────────────────────────────
+
+def _key_index(df: pd.DataFrame, keys: list[str]) -> pd.MultiIndex:
+    return pd.MultiIndex.from_arrays([df[k].astype(object) for k in keys], names=keys)
+
+
+def merge_delta(stored: pd.DataFrame, delta: pd.DataFrame, keys: list[str],
+                schema: Schema | None = None) -> pd.DataFrame:
+    """
+    Replace stored rows whose key appears in ``delta`` and append the new ones.
+    Duplicate keys within the delta collapse to the last row.
+    """
+    if delta.empty:
+        return stored
+    delta = delta.drop_duplicates(keys, keep='last')
+    kept = stored[~_key_index(stored, keys).isin(_key_index(delta, keys))]
+
+    buffer = ColumnBuffer(list(stored.columns), schema)
+    buffer.append(kept.reset_index(drop=True))
+    buffer.append(delta[stored.columns].reset_index(drop=True))
+    return buffer.to_frame()
+
+
+def _check_signature(df: pd.DataFrame, checks: list[str]) -> pd.Series:
+    """Check columns joined into one string per row (nulls as '')."""
+    signature = pd.Series('', index=df.index)
+    for col in checks:
+        values = df[col].astype(object)
+        signature = signature + '\x1f' + values.where(values.notna(), '').astype(str)
+    return signature
+
+
+def stale_keys(stored: pd.DataFrame, current: pd.DataFrame, keys: list[str],
+               checks: list[str]) -> pd.DataFrame:
+    """Keys of ``current`` whose check columns differ from ``stored`` (or that it lacks)."""
+    stored_sig = pd.Series(_check_signature(stored, checks).to_numpy(),
+                           index=_key_index(stored, keys))
+    stored_sig = stored_sig[~stored_sig.index.duplicated(keep='last')]
+    current_sig = _check_signature(current, checks).to_numpy()
+    aligned = stored_sig.reindex(_key_index(current, keys)).to_numpy()
+    return current.loc[aligned != current_sig, keys].drop_duplicates().reset_index(drop=True)
+
+
+def drop_missing_keys(stored: pd.DataFrame, current_keys: pd.DataFrame,
+                      keys: list[str]) -> pd.DataFrame:
+    """Drop stored rows whose key is no longer returned by the source."""
+    alive = _key_index(stored, keys).isin(_key_index(current_keys, keys))
+    return stored[alive].reset_index(drop=True)
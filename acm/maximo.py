@@ -0,0 +1,287 @@
+"""
+ACM Maximo Client
+=================
+One pooled, reusable connection layer for every Maximo extract.
+
+Replaces the ``run_query_from_file`` copies that opened a fresh ODBC
+connection per query. Connection setup over the VPN is a measurable share of
+each extract, so connections are opened lazily, kept in a small pool and
+handed back after each query:
+
+    maximo = MaximoClient.from_env()
+    asset_dim = maximo.run_query_from_file('query/asset-dimension.sql', ('HMA',))
+    print(maximo.metrics_frame())
+
+Each pooled connection keeps one cursor. pyodbc re-uses the prepared
+statement when a cursor executes the same SQL text again, so repeat runs of a
+query (refreshes, per-site parameters) skip the server-side prepare. SQL files
+are read once and cached until they change on disk.
+
+Results are streamed with ``fetchmany`` and typed chunk by chunk (see
+``acm.fetch``); query files are typed by their registered schema (see
+``acm.schema``). Every query records its timing, row count and memory before
+and after typing (see ``QueryMetrics``).
+"""
+
+import os
+import queue
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from acm.fetch import DEFAULT_CHUNK_SIZE, Schema, fetch_frame
+from acm.schema import schema_for
+
+
+# ── Constants ─────────────────────────────────────────────────────────────────
+
+DEFAULT_POOL_SIZE = 4
+
+
+# ── Metrics ───────────────────────────────────────────────────────────────────
+
+@dataclass
+class QueryMetrics:
+    """Timing and size of one query run."""
+    name: str
+    started: datetime
+    connect_seconds: float      # 0 when a pooled connection was re-used
+    execute_seconds: float
+    fetch_seconds: float
+    rows: int
+    raw_bytes: int = 0          # as fetched (object columns)
+    typed_bytes: int = 0        # after the schema was applied
+
+    @property
+    def total_seconds(self) -> float:
+        return self.connect_seconds + self.execute_seconds + self.fetch_seconds
+
+    def __str__(self) -> str:
+        connect = f", connect {self.connect_seconds:.2f}s" if self.connect_seconds else ''
+        memory = (f"; memory {self.raw_bytes / 1024**2:.2f} → {self.typed_bytes / 1024**2:.2f} MB"
+                  if self.raw_bytes else '')
+        return (f"{self.name}: {self.rows:,} rows in {self.total_seconds:.2f}s "
+                f"(execute {self.execute_seconds:.2f}s, fetch {self.fetch_seconds:.2f}s{connect})"
+                f"{memory}")
+
+
+# ── Client ────────────────────────────────────────────────────────────────────
+
+class MaximoClient:
+    """
+    Pooled Maximo ODBC client.
+
+    Parameters
+    ----------
+    dsn, user, password : str
+        ODBC data source and credentials (see ``from_env``).
+    pool_size : int
+        Maximum number of open connections; callers beyond this wait for one
+        to be returned.
+    """
+
+    def __init__(self, dsn: str, user: str, password: str,
+                 pool_size: int = DEFAULT_POOL_SIZE):
+        self.dsn = dsn
+        self.user = user
+        self._password = password
+        self.pool_size = pool_size
+
+        self._idle = queue.LifoQueue()              # (connection, cursor)
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self._lock = threading.Lock()
+        self._thread = threading.local()            # .metrics: this thread's runs
+        self._sql_cache = {}                        # path → (mtime, sql)
+        self.metrics: list[QueryMetrics] = []
+
+    @classmethod
+    def from_env(cls, pool_size: int = DEFAULT_POOL_SIZE) -> 'MaximoClient':
+        """
+        Build a client from MAXIMO_DSN / MAXIMO_USER / MAXIMO_PASS (.env is searched
+        upward). If MAXIMO_STANDIN_DB is set, a ``StandinClient`` on that file is
+        returned instead (offline runs, see ``acm.standin``).
+        """
+        from dotenv import load_dotenv, find_dotenv
+        load_dotenv(find_dotenv())
+        standin_db = os.getenv('MAXIMO_STANDIN_DB')
+        if standin_db:
+            from acm.standin import StandinClient
+            return StandinClient(standin_db, pool_size=pool_size)
+        return cls(os.getenv('MAXIMO_DSN'), os.getenv('MAXIMO_USER'),
+                   os.getenv('MAXIMO_PASS'), pool_size=pool_size)
+
+    # ── Pool ──────────────────────────────────────────────────────────────────
+
+    def _connect(self):
+        """Open a new connection and its cursor."""
+        import pyodbc
+        conn = pyodbc.connect(f"DSN={self.dsn};UID={self.user};PWD={self._password}")
+        return conn, conn.cursor()
+
+    def _acquire(self) -> tuple[tuple, float]:
+        """Take an idle connection (or open one). Returns ((conn, cursor), connect_seconds)."""
+        self._slots.acquire()
+        try:
+            return self._idle.get_nowait(), 0.0
+        except queue.Empty:
+            pass
+        try:
+            start = time.perf_counter()
+            pooled = self._connect()
+            return pooled, time.perf_counter() - start
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _release(self, pooled: tuple, healthy: bool = True):
+        """Return a connection to the pool, or close it if it failed mid-query."""
+        if healthy:
+            self._idle.put(pooled)
+        else:
+            try:
+                pooled[0].close()
+            except Exception:
+                pass
+        self._slots.release()
+
+    def close(self):
+        """Close every idle pooled connection."""
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ── Queries ───────────────────────────────────────────────────────────────
+
+    def read_sql_file(self, sql_path: str | Path) -> str:
+        """SQL text of a file, cached until the file's mtime changes."""
+        path = Path(sql_path)
+        mtime = path.stat().st_mtime
+        with self._lock:
+            cached = self._sql_cache.get(path)
+            if cached is None or cached[0] != mtime:
+                cached = self._sql_cache[path] = (mtime, path.read_text())
+        return cached[1]
+
+    def run_query(self, sql: str, params: tuple = (), name: str = 'query',
+                  schema: Schema | None = None,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE,
+                  spill_dir: str | Path | None = None,
+                  progress: Callable[[int], None] | None = None) -> pd.DataFrame:
+        """
+        Execute ``sql`` on a pooled connection and return all rows as a DataFrame.
+
+        Parameters
+        ----------
+        sql : str
+            Query text; use ``?`` placeholders for ``params``.
+        params : tuple
+            Positional parameters bound to the placeholders.
+        name : str
+            Label for the recorded metrics.
+        schema : dict, optional
+            Column → ColumnSpec or dtype string, applied to each fetched chunk
+            (e.g. ``SCHEMAS['has_mon-meters']`` or {'ASSETNUM': 'category'}).
+        chunk_size : int
+            Rows per ``fetchmany`` call.
+        spill_dir : str or Path, optional
+            Spill typed chunks to Parquet parts under this directory while
+            fetching (a temporary directory per fetch, removed afterwards).
+        progress : callable, optional
+            Called with the running row count after each fetched chunk.
+        """
+        started = datetime.now()
+        pooled, connect_seconds = self._acquire()
+        healthy = False
+        try:
+            cursor = pooled[1]
+            start = time.perf_counter()
+            if params:
+                cursor.execute(sql, params)
+            else:
+                cursor.execute(sql)
+            execute_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            df, raw_bytes = fetch_frame(cursor, schema, chunk_size, spill_dir, progress)
+            fetch_seconds = time.perf_counter() - start
+            healthy = True
+        finally:
+            self._release(pooled, healthy)
+
+        typed_bytes = int(df.memory_usage(deep=True, index=False).sum())
+        self._record(QueryMetrics(name, started, connect_seconds, execute_seconds,
+                                  fetch_seconds, len(df), raw_bytes, typed_bytes))
+        return df
+
+    def run_query_from_file(self, sql_path: str | Path, params: tuple = (),
+                            **fetch_options) -> pd.DataFrame:
+        """
+        Execute a .sql file; metrics are labelled with the file stem.
+        The file's registered schema is applied unless ``schema`` is passed.
+        ``fetch_options`` (schema, chunk_size, spill_dir, progress) as for ``run_query``.
+        """
+        fetch_options.setdefault('schema', schema_for(sql_path))
+        return self.run_query(self.read_sql_file(sql_path), params,
+                              name=Path(sql_path).stem, **fetch_options)
+
+    # ── Metrics ───────────────────────────────────────────────────────────────
+
+    def _record(self, metrics: QueryMetrics):
+        with self._lock:
+            self.metrics.append(metrics)
+        if not hasattr(self._thread, 'metrics'):
+            self._thread.metrics = []
+        self._thread.metrics.append(metrics)
+
+    @property
+    def last_metrics(self) -> QueryMetrics | None:
+        """Metrics of the most recently finished query."""
+        with self._lock:
+            return self.metrics[-1] if self.metrics else None
+
+    def thread_metrics(self) -> list[QueryMetrics]:
+        """Metrics of the queries run by the calling thread, oldest first."""
+        return list(getattr(self._thread, 'metrics', []))
+
+    def metrics_frame(self) -> pd.DataFrame:
+        """All recorded query metrics, one row per query run."""
+        with self._lock:
+            rows = [asdict(m) | {'total_seconds': m.total_seconds} for m in self.metrics]
+        return pd.DataFrame(rows, columns=['name', 'started', 'connect_seconds', 'execute_seconds',
+                                           'fetch_seconds', 'rows', 'raw_bytes', 'typed_bytes',
+                                           'total_seconds'])
+
+
+# ── Default client ────────────────────────────────────────────────────────────
+
+_default_client = None
+_default_lock = threading.Lock()
+
+
+def get_client() -> MaximoClient:
+    """Process-wide client built from the environment on first use."""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = MaximoClient.from_env()
+        return _default_client
+
+
+def run_query_from_file(sql_path: str | Path, params: tuple = (),
+                        **fetch_options) -> pd.DataFrame:
+    """Drop-in for the old per-script helper, on the shared pooled client."""
+    return get_client().run_query_from_file(sql_path, params, **fetch_options)
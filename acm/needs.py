@@ -0,0 +1,154 @@
+"""
+ACM Needs Engine
+================
+Asset-level technology needs from the components each asset carries.
+
+Component → technology rules are compiled once into a priority-coded uint8
+array (components × techs) where the code *is* the priority:
+
+    code   rating
+    ----   ------
+     0      N  — not applicable
+     1      S  — Secondary application
+     2      P  — Primary application
+
+An extra all-N row at the end catches components missing from the rules.
+Needs for every asset are then one explode of the component lists, one
+positional lookup into the array and one row-wise max — highest priority wins
+when several components drive the same technology (P > S > N).
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+# ── Constants ─────────────────────────────────────────────────────────────────
+
+# Rating label for each priority code
+RATINGS = ['N', 'S', 'P']
+
+CODE_N, CODE_S, CODE_P = range(len(RATINGS))
+
+# application_type (config junction) → rating code
+_APPLICATION_CODES = {'Primary': CODE_P, 'Secondary': CODE_S}
+
+
+# ── Rule compilation ──────────────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class CompiledRules:
+    """
+    Component → technology ratings, compiled for vectorized lookup.
+
+    components : Index of component names (row i of ``ratings``)
+    tech_cols  : technology codes (column j of ``ratings``)
+    ratings    : uint8 array (len(components) + 1 × len(tech_cols)); the last
+                 row is all N for components not in the rules
+    """
+    components: pd.Index
+    tech_cols: list[str]
+    ratings: np.ndarray
+
+    def lookup(self, component_names) -> np.ndarray:
+        """Rating rows for an array of component names (unknown / NaN → all N)."""
+        rows = self.components.get_indexer(component_names)
+        rows[rows < 0] = len(self.components)
+        return self.ratings[rows]
+
+
+def compile_rules(rules_df: pd.DataFrame, tech_cols: list[str],
+                  component_col: str = 'Component Type') -> CompiledRules:
+    """
+    Compile a wide rules table (one row per component, one P/S/N column per tech).
+
+    The first row wins if a component is listed more than once. Tech columns
+    missing from ``rules_df`` and blank ratings compile to N.
+    """
+    rules = rules_df.drop_duplicates(component_col, keep='first')
+    lookup = {label: code for code, label in enumerate(RATINGS)}
+
+    ratings = np.zeros((len(rules) + 1, len(tech_cols)), dtype=np.uint8)
+    for j, tech in enumerate(tech_cols):
+        if tech in rules.columns:
+            ratings[:-1, j] = rules[tech].map(lookup).fillna(CODE_N).to_numpy(dtype=np.uint8)
+
+    return CompiledRules(pd.Index(rules[component_col]), list(tech_cols), ratings)
+
+
+def compile_config_rules(component_technology: pd.DataFrame,
+                         tech_cols: list[str]) -> CompiledRules:
+    """
+    Compile the normalized config junction (component_name, technology_code,
+    application_type), e.g. ``ACMConfig.component_technology``.
+
+    If a component↔tech pair appears more than once the highest priority wins.
+    Technology codes not in ``tech_cols`` are ignored.
+    """
+    ct = component_technology[component_technology['technology_code'].isin(tech_cols)]
+    components = pd.Index(ct['component_name'].unique())
+
+    ratings = np.zeros((len(components) + 1, len(tech_cols)), dtype=np.uint8)
+    rows = components.get_indexer(ct['component_name'])
+    cols = pd.Index(tech_cols).get_indexer(ct['technology_code'])
+    codes = ct['application_type'].map(_APPLICATION_CODES).fillna(CODE_N).to_numpy(dtype=np.uint8)
+    np.maximum.at(ratings, (rows, cols), codes)
+
+    return CompiledRules(components, list(tech_cols), ratings)
+
+
+# ── Needs ─────────────────────────────────────────────────────────────────────
+
+def asset_need_codes(component_lists: pd.Series, rules: CompiledRules,
+                     include_secondary: bool = True) -> np.ndarray:
+    """
+    Priority-coded needs matrix (assets × techs) for a Series of component lists.
+
+    Parameters
+    ----------
+    component_lists : Series
+        One list of component names per asset (empty list / NaN → no components).
+    rules : CompiledRules
+        From ``compile_rules`` or ``compile_config_rules``.
+    include_secondary : bool
+        If False, Secondary ratings are dropped to N (keep Primary only).
+
+    Returns
+    -------
+    ndarray of uint8, values in 0..2 (see RATINGS)
+    """
+    n_assets = len(component_lists)
+    if n_assets == 0:
+        return np.zeros((0, len(rules.tech_cols)), dtype=np.uint8)
+
+    # explode keeps one row per asset even for empty lists (as NaN → all-N row),
+    # so each asset is a contiguous, non-empty run in asset order
+    exploded = pd.Series(component_lists.to_numpy(), index=np.arange(n_assets)).explode()
+    asset_pos = exploded.index.to_numpy()
+    starts = np.flatnonzero(np.r_[True, asset_pos[1:] != asset_pos[:-1]])
+
+    codes = np.maximum.reduceat(rules.lookup(exploded.to_numpy()), starts, axis=0)
+    if not include_secondary:
+        codes[codes == CODE_S] = CODE_N
+    return codes
+
+
+def asset_tech_needs(component_lists: pd.Series, rules: CompiledRules,
+                     include_secondary: bool = True) -> pd.DataFrame:
+    """
+    Technology needs for every asset at once.
+
+    Returns
+    -------
+    DataFrame indexed like ``component_lists`` with one categorical column per
+    technology code (categories: N, S, P).
+    """
+    codes = asset_need_codes(component_lists, rules, include_secondary)
+    return pd.DataFrame(
+        {
+            tech: pd.Categorical.from_codes(codes[:, j], categories=RATINGS)
+            for j, tech in enumerate(rules.tech_cols)
+        },
+        index=component_lists.index,
+    )
@@ -0,0 +1,280 @@
+"""
+ACM Site Pipeline
+=================
+The Phase I–V coverage pipeline for one Maximo site, and the multi-site runner.
+
+Every query takes the SITEID as a parameter, so a site run is the same chain
+the main document walks through cell by cell, with the site bound:
+
+    extraction → NEEDS (class × tech matrix) → HAS (routes + meters)
+               → merge → judgment → coverage report
+
+The functions below are the steps; acm/stages.py wires them into cached
+stages, and ``run_site`` drives that StageRunner rather than chaining them
+itself, so every entry point computes the same report.
+
+Assets come from the shared asset dimension (acm/dimension.py); HAS rows are
+joined to it by the integer ASSET_KEY, and the report keeps ASSET_KEY so
+consumers can join rank and attributes back from the dimension.
+
+Sites are independent, so ``run_sites`` runs them in separate worker
+processes — each with its own Maximo connection pool — and combines the
+per-site coverage reports into one frame that ``write_partitioned`` stores as
+the ``coverage_report`` artifact, partitioned by SITEID (acm/artifacts.py):
+
+    reports = run_sites(['HMA', 'ELP', 'AAP'], max_workers=3)
+    write_partitioned(reports)
+    # data/artifacts/coverage_report/SITEID=HMA/ASSET_DEPT=…/….parquet, SITEID=ELP/…
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from acm.artifacts import ArtifactStore
+from acm.coverage import judge_coverage, judge_column, overall_status
+from acm.dimension import KEY_COL, attach_asset_key
+from acm.extract import DEFAULT_SITE
+from acm.fetch import ColumnBuffer
+from acm.maximo import MaximoClient
+from acm.recency import classify_recency
+from acm.routes import parse_route_codes, build_route_coverage
+
+
+# ── Constants ─────────────────────────────────────────────────────────────────
+
+DEFAULT_CONFIG_DIR = 'data/st_tbl/normalized_config'
+
+# Technologies whose HAS comes from meters, not routes
+METER_TECHS = ['GM']
+
+SITE_COL = 'SITEID'
+
+# Coverage report column groups, in export order
+ASSET_INFO_COLS = ['ASSET_KEY', 'ASSETNUM', 'ASSET_DESC', 'ASSET_CLASS', 'ASSET_DEPT']
+METADATA_COLS = ['ROUTE_COUNT', 'METER_COUNT', 'MAX_LASTREADING_DATE']
+
+
+# ── Stages ────────────────────────────────────────────────────────────────────
+
+def site_needs(asset_dim: pd.DataFrame, class_tech_matrix: pd.DataFrame) -> pd.DataFrame:
+    """Dimension assets with their class's NEEDS_* / USE_* flags ('N' for classes not in config)."""
+    assets = asset_dim.merge(class_tech_matrix, on='ASSET_CLASS', how='left')
+    flag_cols = [col for col in class_tech_matrix.columns if col != 'ASSET_CLASS']
+    assets[flag_cols] = assets[flag_cols].fillna('N')
+    return assets
+
+
+def route_has(has_mon_r: pd.DataFrame, tech_cols: list[str]) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Asset-level route HAS flags for every non-meter technology.
+
+    Returns
+    -------
+    (asset_route_coverage, route_rejects)
+    """
+    route_codes, route_rejects = parse_route_codes(has_mon_r)
+    route_techs = [tech for tech in tech_cols if tech not in METER_TECHS]
+    coverage = build_route_coverage(has_mon_r.join(route_codes), route_techs)
+    return coverage, route_rejects
+
+
+def meter_has(has_mon_m_agg: pd.DataFrame, as_of: datetime | None = None) -> pd.DataFrame:
+    """Per-asset meter summary with READING_AGE_DAYS, READING_WITHIN_1YR and HAS_GM."""
+    gm_recency = classify_recency(has_mon_m_agg['MAX_LASTREADING_DATE'], 'GM', as_of=as_of)
+    recent = np.where(gm_recency['RECENT'], 'Y', 'N')
+    return has_mon_m_agg.assign(READING_AGE_DAYS=gm_recency['AGE_DAYS'],
+                                READING_WITHIN_1YR=recent, HAS_GM=recent)
+
+
+def merge_has(asset_needs: pd.DataFrame, route_coverage: pd.DataFrame,
+              meter_coverage: pd.DataFrame) -> pd.DataFrame:
+    """
+    Every asset with its route and meter HAS flags ('N' where not monitored).
+
+    Route and meter rows are keyed to the dimension's integer ASSET_KEY
+    (``asset_needs`` is the dimension plus flags) and joined on it; rows for
+    assets outside the dimension are dropped.
+    """
+    route_slim = attach_asset_key(route_coverage, asset_needs).drop(
+        columns=['ASSETNUM', 'ASSET_DESC', 'CLASS', 'DEPT'])
+    meter_slim = attach_asset_key(meter_coverage, asset_needs)[
+        [KEY_COL, 'HAS_GM', 'METER_COUNT', 'MAX_LASTREADING_DATE']]
+    has_monitoring = asset_needs.merge(
+        route_slim.merge(meter_slim, on=KEY_COL, how='outer'),
+        on=KEY_COL, how='left',
+    )
+    has_cols = [col for col in has_monitoring.columns if col.startswith('HAS_')]
+    has_monitoring[has_cols] = has_monitoring[has_cols].fillna('N')
+    return has_monitoring
+
+
+class ReportValidationError(ValueError):
+    """A coverage report failed ``validate_report`` and must not be published."""
+
+
+def validate_report(report: pd.DataFrame, tech_cols: list[str]) -> list[str]:
+    """
+    Problems that make a coverage report unfit to publish (empty list = valid):
+    no rows, duplicated assets (a fan-out in the merges), missing judgment
+    columns, NEEDS / HAS flags other than Y / N, assets without a status.
+    """
+    if report.empty:
+        return ["coverage report has no rows"]
+    problems = []
+    dupes = int(report['ASSETNUM'].duplicated().sum())
+    if dupes:
+        problems.append(f"{dupes:,} duplicated ASSETNUM rows")
+    missing = [judge_column(tech) for tech in tech_cols if judge_column(tech) not in report.columns]
+    if missing:
+        problems.append(f"missing judgment columns {missing}")
+    for col in [col for col in report.columns if col.startswith(('NEEDS_', 'HAS_'))]:
+        bad = int((~report[col].isin(['Y', 'N'])).sum())
+        if bad:
+            problems.append(f"{bad:,} {col} values other than Y / N")
+    if 'overall_status' in report.columns and report['overall_status'].isna().any():
+        problems.append(f"{int(report['overall_status'].isna().sum()):,} assets without overall_status")
+    return problems
+
+
+def check_report(report: pd.DataFrame, tech_cols: list[str], site: str):
+    """Raise ReportValidationError listing ``validate_report``'s problems, if any."""
+    problems = validate_report(report, tech_cols)
+    if problems:
+        raise ReportValidationError(
+            f"{site} coverage report failed validation: {'; '.join(problems)}")
+
+
+def coverage_report(has_monitoring: pd.DataFrame, tech_cols: list[str]) -> pd.DataFrame:
+    """
+    Judge NEEDS vs HAS and select the export columns (asset info, NEEDS, HAS,
+    judgments + overall_status, USE, metadata), sorted by class and asset.
+    """
+    report = has_monitoring.join(judge_coverage(has_monitoring, tech_cols))
+    report['overall_status'] = overall_status(report, tech_cols)
+
+    def prefixed(prefix):
+        return [col for col in report.columns if col.startswith(prefix)]
+
+    export_cols = (ASSET_INFO_COLS + prefixed('NEEDS_') + prefixed('HAS_')
+                   + [judge_column(tech) for tech in tech_cols] + ['overall_status']
+                   + prefixed('USE_') + METADATA_COLS)
+    export_cols = [col for col in export_cols if col in report.columns]
+    return report[export_cols].sort_values(['ASSET_CLASS', 'ASSETNUM'])
+
+
+# ── One site ──────────────────────────────────────────────────────────────────
+
+def run_site(site: str = DEFAULT_SITE, root: str | Path = '.',
+             config_dir: str | Path = DEFAULT_CONFIG_DIR,
+             client: MaximoClient | None = None, incremental: bool = False,
+             drill_down: bool = False, from_cache: bool = False) -> pd.DataFrame:
+    """
+    Run extraction through judgment for one site.
+
+    Drives the site's StageRunner (acm/stages.py) up to ``judge``, so the
+    stages, their cache and the reading-age cut-off (start of today) are the
+    same as ``python -m acm run``; nothing is exported.
+
+    Parameters
+    ----------
+    site : str
+        Maximo SITEID bound to every query.
+    root : str or Path
+        Project root (SQL files, config and the extract store are below it).
+    config_dir : str or Path
+        Normalized ACM config, relative to ``root``.
+    client : MaximoClient, optional
+        Pooled client; by default one is built from the environment and
+        closed when the site is done.
+    incremental : bool
+        Refresh the site's stored extracts in ``data/extracts/<site>/`` with
+        delta pulls instead of full pulls.
+    drill_down : bool
+        Pull per-meter rows instead of the server-side meter aggregate.
+    from_cache : bool
+        Reuse the cached extract instead of querying Maximo.
+
+    Returns
+    -------
+    Coverage report with SITEID as its first column.
+    """
+    from acm.stages import StageRunner   # acm.stages builds on this module
+
+    runner = StageRunner(site=site, root=root, config_dir=config_dir, client=client,
+                         incremental=incremental, drill_down=drill_down,
+                         from_cache=from_cache)
+    runner.run(['judge'])
+    report = runner.frame('coverage_report').copy()
+    report.insert(0, SITE_COL, site)
+    return report
+
+
+def _run_site_timed(site: str, options: dict) -> tuple[pd.DataFrame, float]:
+    """Worker-process entry point: one site's report and its wall-clock time."""
+    start = time.perf_counter()
+    return run_site(site, **options), time.perf_counter() - start
+
+
+# ── Many sites ────────────────────────────────────────────────────────────────
+
+def run_sites(sites: list[str], max_workers: int | None = None,
+              **site_options) -> pd.DataFrame:
+    """
+    Run ``run_site`` for every site in parallel worker processes and combine
+    the reports.
+
+    Parameters
+    ----------
+    sites : list of str
+        Maximo SITEIDs.
+    max_workers : int, optional
+        Worker processes (default: one per site, capped at the CPU count).
+    site_options
+        Passed to ``run_site`` (root, config_dir, incremental, drill_down,
+        from_cache).
+
+    Returns
+    -------
+    All sites' coverage reports stacked in ``sites`` order; categorical
+    columns are merged across sites (SITEID is categorical too).
+    """
+    sites = list(dict.fromkeys(sites))
+    if not sites:
+        raise ValueError("run_sites needs at least one site")
+    if 'client' in site_options:
+        raise ValueError("Clients cannot be shared across processes; "
+                         "each site worker builds its own from the environment")
+
+    workers = max_workers or min(len(sites), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {site: pool.submit(_run_site_timed, site, site_options) for site in sites}
+        results = {site: future.result() for site, future in futures.items()}
+
+    for site, (report, seconds) in results.items():
+        print(f"✓ {site}: {len(report):,} assets in {seconds:.1f}s")
+
+    reports = [report.astype({SITE_COL: 'category'}) for report, _ in results.values()]
+    buffer = ColumnBuffer(list(reports[0].columns))
+    for report in reports:
+        buffer.append(report[buffer.columns])
+    return buffer.to_frame()
+
+
+def write_partitioned(report: pd.DataFrame, store: ArtifactStore | None = None,
+                      name: str = 'coverage_report') -> Path:
+    """
+    Store a combined coverage report in the artifact store, one SITEID
+    partition per site (each further partitioned by ASSET_DEPT), and publish
+    each site's memory-mapped copy for the dashboard. Partitions being
+    written are replaced; other sites' partitions are left alone.
+    """
+    store = store or ArtifactStore()
+    for site, site_report in report.groupby(SITE_COL, observed=True, sort=False):
+        store.write(name, site_report, site=site, mapped=True)
+    return store.path(name)
@@ -0,0 +1,111 @@
+"""
+ACM Reading Recency
+===================
+Meter reading age and HAS classification against per-technology thresholds.
+
+A meter only counts as monitoring if it has been read recently. How recent
+depends on the technology (or meter type) — a stale reading in one technology
+must not disqualify coverage in another — so thresholds are looked up per row
+from a small table instead of a single global cut-off.
+
+Ages are computed once as a float64 array of days (NaN = never read) and the
+same array feeds both the HAS flag and the age histogram.
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+
+# ── Constants ─────────────────────────────────────────────────────────────────
+
+# Maximum reading age (days) to count as HAS, keyed by technology code or
+# METERTYPE. Keys not listed fall back to DEFAULT_MAX_AGE_DAYS.
+READING_MAX_AGE_DAYS = {
+    'GM': 365,
+}
+
+DEFAULT_MAX_AGE_DAYS = 365
+
+# Age histogram bin edges (days, right-inclusive) and labels
+AGE_BIN_EDGES = [30, 90, 180, 365, 730]
+AGE_BIN_LABELS = ['≤30d', '31–90d', '91–180d', '181–365d', '1–2y', '>2y']
+NO_READING = 'No reading'
+
+
+# ── Age ───────────────────────────────────────────────────────────────────────
+
+def reading_age_days(dates: pd.Series, as_of: datetime | None = None) -> np.ndarray:
+    """
+    Age of each reading in (fractional) days as of ``as_of`` (default: now).
+
+    Returns
+    -------
+    ndarray of float64, NaN where the date is missing
+    """
+    as_of = np.datetime64(as_of or datetime.now(), 'ns')
+    stamps = pd.to_datetime(dates).to_numpy(dtype='datetime64[ns]')
+    return (as_of - stamps) / np.timedelta64(1, 'D')
+
+
+def max_age_days(keys: str | pd.Series, thresholds: dict[str, int] | None = None,
+                 default: int = DEFAULT_MAX_AGE_DAYS) -> float | np.ndarray:
+    """
+    Threshold (days) for a technology code, or per row for a Series of keys
+    (e.g. METERTYPE).
+    """
+    thresholds = READING_MAX_AGE_DAYS if thresholds is None else thresholds
+    if isinstance(keys, str):
+        return float(thresholds.get(keys, default))
+    return (
+        keys.astype(object).map(thresholds).fillna(default).to_numpy(dtype=np.float64)
+    )
+
+
+# ── Classification ────────────────────────────────────────────────────────────
+
+def classify_recency(dates: pd.Series, keys: str | pd.Series,
+                     thresholds: dict[str, int] | None = None,
+                     as_of: datetime | None = None) -> pd.DataFrame:
+    """
+    Reading age and recency flag for every row at once.
+
+    Parameters
+    ----------
+    dates : Series
+        Last reading dates (e.g. MAX_LASTREADING_DATE per asset).
+    keys : str or Series
+        Technology code for the whole column (e.g. 'GM'), or one threshold
+        key per row (e.g. METERTYPE).
+    thresholds : dict, optional
+        Overrides READING_MAX_AGE_DAYS.
+    as_of : datetime, optional
+        Reference time (default: now).
+
+    Returns
+    -------
+    DataFrame indexed like ``dates`` with columns:
+        AGE_DAYS — float days since the reading (NaN = never read)
+        RECENT   — bool, AGE_DAYS within the threshold (False if never read)
+    """
+    age = reading_age_days(dates, as_of)
+    limit = max_age_days(keys, thresholds)
+    with np.errstate(invalid='ignore'):
+        recent = age <= limit
+    return pd.DataFrame({'AGE_DAYS': age, 'RECENT': recent}, index=dates.index)
+
+
+def age_histogram(age_days: np.ndarray) -> pd.Series:
+    """
+    Count of readings per age bin (AGE_BIN_LABELS, then NO_READING for NaN).
+    """
+    age_days = np.asarray(age_days, dtype=np.float64)
+    missing = np.isnan(age_days)
+    bins = np.searchsorted(AGE_BIN_EDGES, age_days[~missing], side='left')
+    counts = np.bincount(bins, minlength=len(AGE_BIN_LABELS))
+    return pd.Series(
+        np.append(counts, missing.sum()),
+        index=AGE_BIN_LABELS + [NO_READING],
+        name='count',
+    )
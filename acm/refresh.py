@@ -0,0 +1,141 @@
+"""
+ACM Background Refresh
+======================
+Single-flight background jobs for the Streamlit apps' "Refresh from Maximo"
+buttons.
+
+Running the query inside the button handler blocks the session for the
+whole query, and every click — from any user — starts another one. A
+``RefreshJob`` runs the refresh on a background thread instead:
+
+    job = RefreshJob('asset_rank')           # one per app process (st.cache_resource)
+    job.start(refresh_fn)                    # False → already running, share that run
+    job.status()                             # state, message, rows, timings, error
+
+Concurrent ``start`` calls while a run is in flight join it rather than
+starting a duplicate. The refresh function receives the job and reports
+progress through ``job.update``. Results are written with
+``atomic_to_pickle`` so readers only ever see the old file or the complete
+new one.
+"""
+
+import os
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+
+# ── Status ────────────────────────────────────────────────────────────────────
+
+IDLE, RUNNING, DONE, FAILED = 'idle', 'running', 'done', 'failed'
+
+
+@dataclass(frozen=True)
+class JobStatus:
+    """Snapshot of a refresh job."""
+    state: str = IDLE
+    message: str = ''
+    rows: int | None = None
+    started: datetime | None = None
+    finished: datetime | None = None
+    error: str | None = None
+
+    @property
+    def running(self) -> bool:
+        return self.state == RUNNING
+
+    @property
+    def elapsed_seconds(self) -> float | None:
+        if self.started is None:
+            return None
+        return ((self.finished or datetime.now()) - self.started).total_seconds()
+
+
+# ── Job ───────────────────────────────────────────────────────────────────────
+
+class RefreshJob:
+    """
+    A named background refresh that runs at most once at a time.
+
+    Parameters
+    ----------
+    name : str
+        Label for the worker thread and status messages.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._status = JobStatus()
+        self._thread: threading.Thread | None = None
+
+    def start(self, target: Callable[['RefreshJob'], int | None]) -> bool:
+        """
+        Start ``target(job)`` on a background thread unless a run is already
+        in flight. ``target`` may return a row count for the final status.
+
+        Returns
+        -------
+        True if a new run was started, False if the caller joined the running one.
+        """
+        with self._lock:
+            if self._status.running:
+                return False
+            self._status = JobStatus(RUNNING, 'Starting…', started=datetime.now())
+            self._thread = threading.Thread(target=self._run, args=(target,),
+                                            name=f'refresh-{self.name}', daemon=True)
+            self._thread.start()
+        return True
+
+    def _run(self, target: Callable[['RefreshJob'], int | None]):
+        try:
+            rows = target(self)
+        except Exception as exc:
+            self._set(state=FAILED, message='Refresh failed', error=f'{type(exc).__name__}: {exc}',
+                      finished=datetime.now())
+        else:
+            rows = rows if rows is not None else self.status().rows
+            self._set(state=DONE, message='Refresh complete', rows=rows,
+                      finished=datetime.now())
+
+    def _set(self, **changes):
+        with self._lock:
+            self._status = replace(self._status, **changes)
+
+    def update(self, message: str, rows: int | None = None):
+        """Progress report from inside the running refresh."""
+        changes = {'message': message}
+        if rows is not None:
+            changes['rows'] = rows
+        self._set(**changes)
+
+    def status(self) -> JobStatus:
+        """Current status (an immutable snapshot)."""
+        with self._lock:
+            return self._status
+
+    def wait(self, timeout: float | None = None) -> JobStatus:
+        """Block until the current run finishes (scripts and tests)."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return self.status()
+
+
+# ── Atomic writes ─────────────────────────────────────────────────────────────
+
+def atomic_to_pickle(df: pd.DataFrame, path: str | Path) -> Path:
+    """Pickle to a temporary file next to ``path``, then ``os.replace`` it in."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f'.{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+    try:
+        df.to_pickle(tmp)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return path
@@ -0,0 +1,160 @@
+"""
+ACM Route Parsing
+=================
+Department / technology / vendor codes from Maximo route descriptions.
+
+Route descriptions follow the MESD-ACM-001 convention:
+
+    {DEPT}_{TECH}_{VENDOR} - Description
+    e.g. '2PA_UL_UEDMS - Penthouse Route 1'  →  2PA / UL / UEDMS
+
+The route query returns one row per route stop, so the same description
+repeats for every asset on the route. Each distinct ROUTE is parsed once with
+a single ``str.extract`` and the codes are broadcast back to the stops through
+the ROUTE category codes.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+
+# ── Constants ─────────────────────────────────────────────────────────────────
+
+# Named groups become the output columns. ROUTE_DEPT (not DEPT) so it does not
+# clash with the asset's own DEPT from LEFT(A.LOCATION, 3)
+ROUTE_PATTERN = re.compile(
+    r'^(?P<ROUTE_DEPT>[A-Z0-9]+)_(?P<TECH>[A-Z0-9]+)_(?P<VENDOR>[A-Z0-9]+)\s*-'
+)
+
+ROUTE_CODE_COLS = list(ROUTE_PATTERN.groupindex)
+
+
+# ── Parsing ───────────────────────────────────────────────────────────────────
+
+def parse_route_codes(routes: pd.DataFrame, route_col: str = 'ROUTE',
+                      desc_col: str = 'ROUTE_DESC') -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Parse ROUTE_DEPT, TECH and VENDOR from the route descriptions.
+
+    Parameters
+    ----------
+    routes : DataFrame
+        Route-stop rows with a route key and its description. The key is
+        expected to be categorical (as loaded in Phase II); other dtypes are
+        factorized first.
+    route_col, desc_col : str
+        Route key and description columns.
+
+    Returns
+    -------
+    (codes, rejects)
+        codes   — DataFrame indexed like ``routes`` with categorical
+                  ROUTE_DEPT, TECH and VENDOR columns (NaN where the
+                  description does not match ROUTE_PATTERN)
+        rejects — DataFrame of the distinct non-conforming routes, with
+                  columns ``route_col`` and ``desc_col``
+    """
+    keys = routes[route_col]
+    if isinstance(keys.dtype, pd.CategoricalDtype):
+        row_codes = keys.cat.codes.to_numpy()
+    else:
+        row_codes, _ = pd.factorize(keys)
+
+    # One description per route: the first stop that carries each route code
+    route_ids, first_rows = np.unique(row_codes, return_index=True)
+    present = route_ids >= 0
+    route_ids, first_rows = route_ids[present], first_rows[present]
+    descs = routes[desc_col].iloc[first_rows].astype('string').reset_index(drop=True)
+    parsed = descs.str.extract(ROUTE_PATTERN)
+
+    # Broadcast: route code → row of ``parsed`` (-1 for missing routes)
+    route_row = np.full(route_ids.max(initial=-1) + 2, -1)
+    route_row[route_ids] = np.arange(len(route_ids))
+    stop_rows = route_row[row_codes]          # row_codes == -1 hits the trailing -1
+
+    codes = pd.DataFrame(index=routes.index)
+    for col in ROUTE_CODE_COLS:
+        value_codes, categories = pd.factorize(parsed[col], sort=True)
+        value_codes = np.append(value_codes, -1)   # slot for stops with no route
+        codes[col] = pd.Categorical.from_codes(value_codes[stop_rows], categories=categories)
+
+    unmatched = parsed[ROUTE_CODE_COLS[0]].isna().to_numpy()
+    rejects = pd.DataFrame({
+        route_col: routes[route_col].iloc[first_rows[unmatched]].to_numpy(),
+        desc_col: descs[unmatched].to_numpy(dtype=object),
+    })
+    return codes, rejects
+
+
+# ── HAS flags ─────────────────────────────────────────────────────────────────
+
+def tech_flag_matrix(asset_codes: np.ndarray, techs: pd.Series, n_assets: int,
+                     tech_cols: list[str]) -> np.ndarray:
+    """
+    Boolean HAS matrix (assets × techs) from (asset, tech) pairs.
+
+    Parameters
+    ----------
+    asset_codes : ndarray of int
+        Asset position (0..n_assets-1) of each pair; negative = no asset.
+    techs : Series
+        Technology code of each pair; NaN or codes not in ``tech_cols`` are ignored.
+    n_assets : int
+        Number of rows in the output.
+    tech_cols : list[str]
+        Technology codes, one output column each.
+    """
+    tech_pos = pd.Index(tech_cols).get_indexer(techs)
+    valid = (asset_codes >= 0) & (tech_pos >= 0)
+    flags = np.zeros((n_assets, len(tech_cols)), dtype=bool)
+    flags[asset_codes[valid], tech_pos[valid]] = True
+    return flags
+
+
+def build_route_coverage(routes: pd.DataFrame, tech_cols: list[str],
+                         asset_col: str = 'ASSETNUM',
+                         detail_cols: tuple[str, ...] = ('ASSET_DESC', 'CLASS', 'DEPT')
+                         ) -> pd.DataFrame:
+    """
+    One row per asset with Y/N HAS_<tech> flags for the route technologies.
+
+    Scatters the parsed (asset, TECH) pairs straight into a boolean matrix
+    indexed by the asset codes — no per-asset technology lists.
+
+    Parameters
+    ----------
+    routes : DataFrame
+        Route-stop rows with ``asset_col``, ``detail_cols`` and a parsed TECH
+        column (see ``parse_route_codes``).
+    tech_cols : list[str]
+        Technologies to flag (route-based ones; GM comes from meters).
+
+    Returns
+    -------
+    DataFrame with columns: ASSETNUM, *detail_cols, HAS_<tech>...
+    Every asset on a route is included; assets whose routes carry none of the
+    technologies get all 'N'.
+    """
+    keys = routes[asset_col]
+    if isinstance(keys.dtype, pd.CategoricalDtype):
+        asset_codes = keys.cat.codes.to_numpy()
+        n_assets = len(keys.cat.categories)
+        asset_values = pd.Categorical.from_codes(np.arange(n_assets), dtype=keys.dtype)
+    else:
+        asset_codes, asset_values = pd.factorize(keys, sort=True)
+        n_assets = len(asset_values)
+
+    # First non-null detail per asset, in asset-code order
+    coverage = (
+        routes.groupby(asset_codes, sort=True)[list(detail_cols)].first()
+        .reindex(range(n_assets))
+        .reset_index(drop=True)
+    )
+    coverage.insert(0, asset_col, asset_values)
+
+    flags = tech_flag_matrix(asset_codes, routes['TECH'], n_assets, tech_cols)
+    for j, tech in enumerate(tech_cols):
+        coverage[f'HAS_{tech}'] = np.where(flags[:, j], 'Y', 'N')
+    return coverage
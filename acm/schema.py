@@ -0,0 +1,129 @@
+"""
+ACM Extract Schemas
+===================
+Declared column types for every query in ``query/``, keyed by query file.
+
+Each column of a query result gets a ``ColumnSpec``: its dtype, an optional
+fixed categorical dictionary (Maximo domains such as METERTYPE or the rank
+tiers) and whether nulls are allowed. The fetch layer (``acm.fetch``) applies
+the schema to every chunk as it arrives, so every consumer — the pipeline,
+the Asset Rank page, the notebooks — gets the same minimal-memory frame
+without converting columns by hand.
+
+Schemas are looked up by the query file's stem, so a delta twin in
+``query/delta/`` shares its base query's schema:
+
+    schema_for('query/has_mon-meters.sql')   → SCHEMAS['has_mon-meters']
+
+Columns not declared are left as fetched.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+
+
+# ── Errors ────────────────────────────────────────────────────────────────────
+
+class SchemaViolation(ValueError):
+    """Fetched data breaks its declared schema (nulls in a non-nullable
+    column, values outside a fixed categorical dictionary)."""
+
+
+# ── Column spec ───────────────────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    """
+    Target type of one result column.
+
+    dtype       'category', 'datetime64[ns]', 'int32', 'string', ...
+    categories  fixed categorical dictionary (values outside it are an error);
+                None lets the categories follow the data
+    ordered     categorical order is meaningful (rank tiers sort S, A, B, C)
+    nullable    False → a null in this column is an error
+    """
+    dtype: str
+    categories: tuple[str, ...] | None = None
+    ordered: bool = False
+    nullable: bool = True
+
+
+def as_spec(spec: 'str | ColumnSpec') -> ColumnSpec:
+    """A bare dtype string is a nullable column of that dtype."""
+    return spec if isinstance(spec, ColumnSpec) else ColumnSpec(str(spec))
+
+
+# ── Domains ───────────────────────────────────────────────────────────────────
+
+METERTYPES = ('CHARACTERISTIC', 'CONTINUOUS', 'GAUGE')
+RANKS = ('S', 'A', 'B', 'C')
+
+_KEY = ColumnSpec('category', nullable=False)
+_CAT = ColumnSpec('category')
+_COUNT = ColumnSpec('int32', nullable=False)
+
+
+# ── Registry ──────────────────────────────────────────────────────────────────
+
+SCHEMAS: dict[str, dict[str, ColumnSpec]] = {
+    'asset-dimension': {
+        'ASSET_KEY': ColumnSpec('int64', nullable=False),
+        'ASSETNUM': _KEY,
+        'ASSET_DESC': _CAT,
+        'ASSET_CLASS': _CAT,
+        'ASSET_DEPT': _CAT,
+        'RANK': ColumnSpec('category', categories=RANKS, ordered=True),
+    },
+    'asset-classes': {
+        'ASSETNUM': _KEY,
+        'ASSET_DESC': _CAT,
+        'ASSET_CLASS': _CAT,
+        'ASSET_DEPT': _CAT,
+    },
+    'has_mon-routes': {
+        'ROUTE': _KEY,
+        'ROUTE_DESC': _CAT,
+        'ASSETNUM': _KEY,
+        'ASSET_DESC': _CAT,
+        'CLASS': _CAT,
+        'DEPT': _CAT,
+    },
+    'has_mon-meters': {
+        'ASSETNUM': _KEY,
+        'ASSET_DESC': _CAT,
+        'METERNAME': _KEY,
+        'METERDESCRIPTION': _CAT,
+        'METERTYPE': ColumnSpec('category', categories=METERTYPES),
+        'AVGCALCMETHOD': _CAT,
+        'ROLLDOWNSOURCE': _CAT,
+        'REMARKS': ColumnSpec('string'),
+        'POINTNUM': _CAT,
+        'LASTREADING': ColumnSpec('string'),
+        'LASTREADING_DATE': ColumnSpec('datetime64[ns]'),
+        'CHANGEBY': _CAT,
+        'LASTREADINGINSPCTR': _CAT,
+        'CLASS': _CAT,
+        'DEPT': _CAT,
+    },
+    'has_mon-meters-agg': {
+        'ASSETNUM': _KEY,
+        'METER_COUNT': _COUNT,
+        'MAX_LASTREADING_DATE': ColumnSpec('datetime64[ns]'),
+        'NULL_READING_COUNT': _COUNT,
+        'ASSET_DESC': _CAT,
+        'CLASS': _CAT,
+        'DEPT': _CAT,
+    },
+    'asset_rank': {
+        'ASSETNUM': _KEY,
+        'RANK': ColumnSpec('category', categories=RANKS, ordered=True, nullable=False),
+        'ASSET_DESC': _CAT,
+        'ASSET_CLASS': _CAT,
+        'ASSET_DEPT': _CAT,
+    },
+}
+
+
+def schema_for(sql_path: str | Path) -> dict[str, ColumnSpec] | None:
+    """Schema of a query file (by stem), or None if it has none."""
+    return SCHEMAS.get(Path(sql_path).stem)
@@ -0,0 +1,501 @@
+"""
+ACM Stage Runner
+================
+The Phase I–V pipeline as a graph of cached stages, runnable without Quarto.
+
+    extract ─┬─ needs ─────────┐
+             ├─ routes (HAS) ──┼─ merge ── judge ── export
+             └─ meters (HAS) ──┘
+
+Each stage reads named frames produced by the stages before it and returns
+named frames. Its cache key hashes the content of those input frames, the
+stage's parameters (site, technology list, reading cut-off date, config
+files) and the source of the modules it runs. A stage whose key matches its
+last run is skipped and its frames are loaded from the cache only if a
+later stage needs them — editing the class_component config table re-runs
+needs → merge → judge → export and nothing else.
+
+Maximo's data cannot be hashed without querying it, so ``extract`` always
+runs unless ``from_cache`` is set; when a fresh extract comes back identical
+every later stage is still skipped. Stages whose inputs are ready run in
+parallel on a thread pool (needs, routes and meters after extract).
+
+    runner = StageRunner(site='HMA', client=maximo)
+    results = runner.run()                     # every stage
+    results = runner.run(['judge'])            # judge and what it depends on
+    print(format_stage_report(results))
+    report = runner.frame('coverage_report')
+
+Cache layout: ``data/stages/<SITEID>/<stage>/manifest.json`` plus one
+Parquet file per frame. ``export`` writes the artifact store
+(acm/artifacts.py), the site's asset dimension and the gap reports in
+``output/<SITEID>/``; it is re-run if any of those files has gone missing.
+``judge`` raises ReportValidationError if the report does not pass
+``validate_report``.
+
+From the command line: ``python -m acm run`` (acm/cli.py).
+"""
+
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from acm.artifacts import DEFAULT_ROOT as ARTIFACT_ROOT, ArtifactStore
+from acm.coverage import critical_gaps, gap_summary_by_class, gap_summary_by_technology
+from acm.dimension import dimension_path, save_dimension
+from acm.extract import (DEFAULT_SITE, aggregate_meters, extract_plan,
+                         format_extract_report, run_extracts)
+from acm.incremental import IncrementalStore
+from acm.maximo import MaximoClient
+from acm.pipeline import (DEFAULT_CONFIG_DIR, check_report, coverage_report,
+                          merge_has, meter_has, route_has, site_needs)
+
+
+# ── Constants ─────────────────────────────────────────────────────────────────
+
+DEFAULT_CACHE_DIR = 'data/stages'
+
+# Gap reports, written per site to output/<SITEID>/
+GAP_REPORT_DIR = 'output'
+
+MANIFEST = 'manifest.json'
+
+
+# ── Stage definitions ─────────────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    One node of the pipeline graph.
+
+    name     stage name (also its cache directory)
+    run      ``run(runner, inputs) -> {frame name: DataFrame}``; ``inputs``
+             holds the frames listed in ``inputs``, by frame name
+    inputs   frames read, as 'stage.frame'
+    code     modules whose source is part of the cache key
+    params   ``params(runner) -> dict`` of JSON-able values in the cache key
+    volatile the output depends on data outside the key (Maximo); the cached
+             run is only reused with ``from_cache``
+    files    ``files(runner) -> [Path]`` written outside the stage cache; the
+             cached run is only reused while they all exist
+    """
+    name: str
+    run: Callable[['StageRunner', dict[str, pd.DataFrame]], dict[str, pd.DataFrame]]
+    inputs: tuple[str, ...] = ()
+    code: tuple[str, ...] = ()
+    params: Callable[['StageRunner'], dict] = lambda runner: {}
+    volatile: bool = False
+    files: Callable[['StageRunner'], list[Path]] = lambda runner: []
+
+    @property
+    def deps(self) -> tuple[str, ...]:
+        """Upstream stage names, in input order."""
+        return tuple(dict.fromkeys(ref.split('.')[0] for ref in self.inputs))
+
+
+def _extract(runner: 'StageRunner', inputs: dict) -> dict[str, pd.DataFrame]:
+    client = runner.client()
+    store = IncrementalStore(client, runner.root / 'data' / 'extracts' / runner.site,
+                             root=runner.root) if runner.incremental else None
+    frames, report = run_extracts(client, extract_plan(runner.drill_down), root=runner.root,
+                                  incremental=store, site=runner.site)
+    print(format_extract_report(report))
+    if runner.drill_down:
+        # Later stages always read the per-asset summary
+        frames['has_mon_m_agg'] = aggregate_meters(frames['has_mon_m'])
+    return frames
+
+
+def _needs(runner: 'StageRunner', inputs: dict) -> dict[str, pd.DataFrame]:
+    return {'asset_needs': site_needs(inputs['asset_dim'], runner.config.get_class_tech_matrix())}
+
+
+def _routes(runner: 'StageRunner', inputs: dict) -> dict[str, pd.DataFrame]:
+    coverage, rejects = route_has(inputs['has_mon_r'], runner.tech_cols)
+    return {'route_coverage': coverage, 'route_rejects': rejects}
+
+
+def _meters(runner: 'StageRunner', inputs: dict) -> dict[str, pd.DataFrame]:
+    return {'meter_coverage': meter_has(inputs['has_mon_m_agg'], as_of=runner.as_of)}
+
+
+def _merge(runner: 'StageRunner', inputs: dict) -> dict[str, pd.DataFrame]:
+    return {'has_monitoring': merge_has(inputs['asset_needs'], inputs['route_coverage'],
+                                        inputs['meter_coverage'])}
+
+
+def _judge(runner: 'StageRunner', inputs: dict) -> dict[str, pd.DataFrame]:
+    report = coverage_report(inputs['has_monitoring'], runner.tech_cols)
+    check_report(report, runner.tech_cols, runner.site)
+    return {'coverage_report': report.reset_index(drop=True)}
+
+
+# Artifact name → the frame the export stage stores under it
+EXPORT_ARTIFACTS = {
+    'asset_class': 'asset_dim',
+    'asset_route_coverage': 'route_coverage',
+    'has_mon_m_agg': 'meter_coverage',
+    'has_monitoring': 'has_monitoring',
+    'coverage_report': 'coverage_report',
+}
+
+# Published memory-mapped for the apps (acm.artifacts)
+MAPPED_ARTIFACTS = {'coverage_report'}
+
+GAP_REPORT_FILES = ['gap_summary_by_technology.csv', 'gap_summary_by_class.csv',
+                    'critical_gaps.csv']
+
+
+def _export(runner: 'StageRunner', inputs: dict) -> dict[str, pd.DataFrame]:
+    store = ArtifactStore(runner.root / ARTIFACT_ROOT)
+    site = runner.site
+    for name, frame in EXPORT_ARTIFACTS.items():
+        store.write(name, inputs[frame], site=site, mapped=name in MAPPED_ARTIFACTS)
+    save_dimension(inputs['asset_dim'], site, runner.root)
+    write_gap_reports(inputs['coverage_report'], runner.tech_cols,
+                      runner.root / GAP_REPORT_DIR / site)
+    return {}
+
+
+def _export_files(runner: 'StageRunner') -> list[Path]:
+    store = ArtifactStore(runner.root / ARTIFACT_ROOT)
+    site = runner.site
+    return ([store.path(name, site) for name in EXPORT_ARTIFACTS]
+            + [store.mapped_path(name, site) for name in MAPPED_ARTIFACTS]
+            + [dimension_path(site, runner.root)]
+            + [runner.root / GAP_REPORT_DIR / site / name for name in GAP_REPORT_FILES])
+
+
+STAGES: dict[str, Stage] = {stage.name: stage for stage in [
+    Stage('extract', _extract,
+          code=('acm.extract', 'acm.fetch', 'acm.schema'),
+          params=lambda runner: {'site': runner.site, 'drill_down': runner.drill_down,
+                                 'sql': runner.sql_hashes()},
+          volatile=True),
+    Stage('needs', _needs, inputs=('extract.asset_dim',),
+          code=('acm.pipeline', 'acm_config'),
+          params=lambda runner: {'config': runner.config_hash()}),
+    Stage('routes', _routes, inputs=('extract.has_mon_r',),
+          code=('acm.pipeline', 'acm.routes'),
+          params=lambda runner: {'tech_cols': runner.tech_cols}),
+    Stage('meters', _meters, inputs=('extract.has_mon_m_agg',),
+          code=('acm.pipeline', 'acm.recency'),
+          params=lambda runner: {'as_of': runner.as_of.isoformat()}),
+    Stage('merge', _merge,
+          inputs=('needs.asset_needs', 'routes.route_coverage', 'meters.meter_coverage'),
+          code=('acm.pipeline', 'acm.dimension')),
+    Stage('judge', _judge, inputs=('merge.has_monitoring',),
+          code=('acm.pipeline', 'acm.coverage'),
+          params=lambda runner: {'tech_cols': runner.tech_cols}),
+    Stage('export', _export,
+          inputs=('extract.asset_dim', 'routes.route_coverage', 'meters.meter_coverage',
+                  'merge.has_monitoring', 'judge.coverage_report'),
+          code=('acm.artifacts', 'acm.dimension', 'acm.coverage'),
+          params=lambda runner: {'site': runner.site, 'tech_cols': runner.tech_cols},
+          files=_export_files),
+]}
+
+
+# ── Hashing ───────────────────────────────────────────────────────────────────
+
+def frame_hash(df: pd.DataFrame) -> str:
+    """Content hash of a frame: column names, dtypes and every value (not the index)."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([[str(col) for col in df.columns],
+                              [str(dtype) for dtype in df.dtypes]]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+def _file_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+
+
+def _module_hash(module: str) -> str:
+    spec = importlib.util.find_spec(module)
+    if spec is None or spec.origin is None:
+        raise ValueError(f"Cannot locate the source of module '{module}'")
+    return _file_hash(Path(spec.origin))
+
+
+# ── Results ───────────────────────────────────────────────────────────────────
+
+@dataclass
+class StageResult:
+    """Outcome of one stage in a run."""
+    name: str
+    key: str
+    hashes: dict[str, str]
+    rows: dict[str, int]
+    cached: bool
+    seconds: float = 0.0
+    run_at: str = field(default_factory=lambda: datetime.now().isoformat(timespec='seconds'))
+
+
+# ── Runner ────────────────────────────────────────────────────────────────────
+
+class StageRunner:
+    """
+    Runs pipeline stages for one site, skipping those whose inputs, parameters
+    and code are unchanged since their cached run.
+
+    Parameters
+    ----------
+    site : str
+        Maximo SITEID.
+    root : str or Path
+        Project root (SQL files, config, caches and artifacts are below it).
+    config_dir : str or Path
+        Normalized ACM config, relative to ``root``.
+    cache_dir : str or Path
+        Stage cache, relative to ``root``; one subdirectory per site.
+    client : MaximoClient, optional
+        Pooled client; by default one is built from the environment when
+        ``extract`` runs, and closed at the end of the run.
+    incremental : bool
+        Extract with delta pulls into ``data/extracts/<site>/``.
+    drill_down : bool
+        Pull per-meter rows instead of the server-side meter aggregate.
+    from_cache : bool
+        Reuse the cached extract instead of querying Maximo.
+    max_workers : int
+        Stages run at once.
+    as_of : datetime, optional
+        Reference time for reading ages (default: start of today, so the
+        meters stage is reused for the rest of the day).
+    """
+
+    def __init__(self, site: str = DEFAULT_SITE, root: str | Path = '.',
+                 config_dir: str | Path = DEFAULT_CONFIG_DIR,
+                 cache_dir: str | Path = DEFAULT_CACHE_DIR,
+                 client: MaximoClient | None = None, incremental: bool = False,
+                 drill_down: bool = False, from_cache: bool = False,
+                 max_workers: int = 3, as_of: datetime | None = None):
+        self.site = site
+        self.root = Path(root)
+        self.config_dir = self.root / config_dir
+        self.cache_dir = self.root / cache_dir / site
+        self.incremental = incremental
+        self.drill_down = drill_down
+        self.from_cache = from_cache
+        self.max_workers = max_workers
+        self.as_of = as_of or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.results: dict[str, StageResult] = {}
+        self._client = client
+        self._own_client = client is None
+        self._config = None
+        self._frames: dict[str, pd.DataFrame] = {}
+        self._frame_stage: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    # ── Inputs ────────────────────────────────────────────────────────────────
+
+    def client(self) -> MaximoClient:
+        """The Maximo client (built from the environment on first use)."""
+        with self._lock:
+            if self._client is None:
+                self._client = MaximoClient.from_env()
+            return self._client
+
+    @property
+    def config(self):
+        """The normalized ACM config (loaded once per runner)."""
+        if self._config is None:
+            from acm_config import ACMConfig     # repo root module, not part of acm
+            self._config = ACMConfig(self.config_dir)
+        return self._config
+
+    @property
+    def tech_cols(self) -> list[str]:
+        return self.config.technology_codes
+
+    def config_hash(self) -> str:
+        """Hash of the config tables NEEDS is derived from (CSV or SQLite storage alike)."""
+        config = self.config
+        tables = [config.components, config.technologies, config.classes,
+                  config.component_technology, config.class_component]
+        return hashlib.sha256(''.join(frame_hash(t) for t in tables).encode()).hexdigest()[:16]
+
+    def sql_hashes(self) -> dict[str, str]:
+        return {name: _file_hash(self.root / spec['sql'])
+                for name, spec in extract_plan(self.drill_down).items()}
+
+    # ── Graph ─────────────────────────────────────────────────────────────────
+
+    def plan(self, targets: list[str] | None = None) -> list[str]:
+        """The targets and every stage they depend on, in dependency order."""
+        targets = list(STAGES) if not targets else list(targets)
+        unknown = [name for name in targets if name not in STAGES]
+        if unknown:
+            raise ValueError(f"Unknown stage(s) {unknown}; stages are {list(STAGES)}")
+        needed = set()
+
+        def visit(name):
+            if name not in needed:
+                needed.add(name)
+                for dep in STAGES[name].deps:
+                    visit(dep)
+
+        for name in targets:
+            visit(name)
+        return [name for name in STAGES if name in needed]
+
+    def run(self, targets: list[str] | None = None, force: bool = False
+            ) -> dict[str, StageResult]:
+        """
+        Run ``targets`` (default: every stage) and whatever they depend on.
+
+        Parameters
+        ----------
+        targets : list of str, optional
+            Stage names.
+        force : bool
+            Ignore the cache and run every planned stage.
+
+        Returns
+        -------
+        Stage name → StageResult, in dependency order.
+        """
+        plan = self.plan(targets)
+        self.config                            # load once, before the workers start
+        pending = list(plan)
+        results: dict[str, StageResult] = {}
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers,
+                                    thread_name_prefix='stage') as pool:
+                running = {}
+                while pending or running:
+                    ready = [name for name in pending
+                             if all(dep in results for dep in STAGES[name].deps)]
+                    for name in ready:
+                        pending.remove(name)
+                        running[pool.submit(self._run_stage, STAGES[name], results, force)] = name
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name = running.pop(future)
+                        results[name] = future.result()
+        finally:
+            if self._own_client and self._client is not None:
+                self._client.close()
+                self._client = None
+        self.results.update(results)
+        return {name: results[name] for name in plan}
+
+    def frame(self, name: str) -> pd.DataFrame:
+        """A stage output by frame name (loaded from the cache if the stage was skipped)."""
+        with self._lock:
+            if name not in self._frames:
+                stage = self._frame_stage.get(name)
+                if stage is None:
+                    raise KeyError(f"No stage in this run produced frame '{name}'")
+                self._frames[name] = pd.read_parquet(self.cache_dir / stage / f'{name}.parquet')
+            return self._frames[name]
+
+    # ── One stage ─────────────────────────────────────────────────────────────
+
+    def _key(self, stage: Stage, results: dict[str, StageResult]) -> str:
+        inputs = {}
+        for ref in stage.inputs:
+            dep, frame = ref.split('.')
+            inputs[ref] = results[dep].hashes[frame]
+        payload = {
+            'stage': stage.name,
+            'inputs': inputs,
+            'params': stage.params(self),
+            'code': {module: _module_hash(module) for module in stage.code},
+            'stage_code': hashlib.sha256(inspect.getsource(stage.run).encode()).hexdigest()[:16],
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()[:16]
+
+    def _cached(self, stage: Stage, key: str) -> dict | None:
+        path = self.cache_dir / stage.name / MANIFEST
+        if not path.exists():
+            return None
+        manifest = json.loads(path.read_text())
+        frames_present = all((path.parent / f'{name}.parquet').exists()
+                             for name in manifest['hashes'])
+        files_present = all(file.exists() for file in stage.files(self))
+        return manifest if manifest['key'] == key and frames_present and files_present else None
+
+    def _run_stage(self, stage: Stage, results: dict[str, StageResult],
+                   force: bool) -> StageResult:
+        key = self._key(stage, results)
+        manifest = None if force or (stage.volatile and not self.from_cache) \
+            else self._cached(stage, key)
+        if manifest is not None:
+            with self._lock:
+                self._frame_stage.update(dict.fromkeys(manifest['hashes'], stage.name))
+            return StageResult(stage.name, key, manifest['hashes'], manifest['rows'],
+                               cached=True, run_at=manifest['run_at'])
+
+        start = time.perf_counter()
+        inputs = {ref.split('.')[1]: self.frame(ref.split('.')[1]) for ref in stage.inputs}
+        outputs = stage.run(self, inputs)
+        result = StageResult(stage.name, key,
+                             hashes={name: frame_hash(df) for name, df in outputs.items()},
+                             rows={name: len(df) for name, df in outputs.items()},
+                             cached=False, seconds=time.perf_counter() - start)
+        self._store(stage, result, outputs)
+        with self._lock:
+            self._frames.update(outputs)
+            self._frame_stage.update(dict.fromkeys(outputs, stage.name))
+        return result
+
+    def _store(self, stage: Stage, result: StageResult, outputs: dict[str, pd.DataFrame]):
+        """Write the frames, then the manifest (a stage is cached once its manifest is in place)."""
+        stage_dir = self.cache_dir / stage.name
+        stage_dir.mkdir(parents=True, exist_ok=True)
+        (stage_dir / MANIFEST).unlink(missing_ok=True)
+        for name, df in outputs.items():
+            tmp = stage_dir / f'.{name}.parquet.tmp'
+            df.to_parquet(tmp, index=False, compression='zstd')
+            os.replace(tmp, stage_dir / f'{name}.parquet')
+        manifest = {'key': result.key, 'hashes': result.hashes, 'rows': result.rows,
+                    'seconds': result.seconds, 'run_at': result.run_at}
+        tmp = stage_dir / f'.{MANIFEST}.tmp'
+        tmp.write_text(json.dumps(manifest, indent=2))
+        os.replace(tmp, stage_dir / MANIFEST)
+
+
+# ── Reports ───────────────────────────────────────────────────────────────────
+
+def write_gap_reports(report: pd.DataFrame, tech_cols: list[str], out_dir: str | Path) -> Path:
+    """Gap summaries by technology and by class, and the critical-gap assets, as CSV."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    judge_cols = [col for col in report.columns if col.endswith('_judge')]
+    info_cols = [col for col in ['ASSET_KEY', 'ASSETNUM', 'ASSET_DESC', 'ASSET_CLASS', 'ASSET_DEPT']
+                 if col in report.columns]
+    gaps = critical_gaps(report, tech_cols)
+    gaps = gaps[info_cols + ['total_gaps', 'missing_technologies'] + judge_cols]
+    by_tech, by_class, critical = GAP_REPORT_FILES
+    gap_summary_by_technology(report, tech_cols).to_csv(out_dir / by_tech, index=False)
+    gap_summary_by_class(report, tech_cols).to_csv(out_dir / by_class, index=False)
+    gaps.sort_values('total_gaps', ascending=False).to_csv(out_dir / critical, index=False)
+    print(f"✓ Gap reports → {out_dir}/ ({len(gaps):,} assets with gaps)")
+    return out_dir
+
+
+
+def format_stage_report(results: dict[str, StageResult]) -> str:
+    """One line per stage (ran or cached, time, output rows) plus totals."""
+    lines = []
+    for result in results.values():
+        rows = ', '.join(f'{name} {count:,}' for name, count in result.rows.items())
+        state = f'{result.seconds:7.2f}s' if not result.cached else f'cached ({result.run_at})'
+        lines.append(f"  {result.name:<8} {state:<30} {rows}")
+    ran = [result for result in results.values() if not result.cached]
+    lines.append(f"✓ {len(results)} stages: {len(ran)} ran, {len(results) - len(ran)} cached; "
+                 f"{sum(result.seconds for result in ran):.2f}s stage time")
+    return '\n'.join(lines)
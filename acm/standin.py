@@ -0,0 +1,359 @@
+"""
+ACM Stand-in Maximo
+===================
+A local SQLite database shaped like the Maximo tables ``query/*.sql`` reads,
+filled with synthetic data, for offline runs and benchmarks.
+
+    python -m acm.standin --assets 100000 --sites HMA ELP --out data/standin/maximo.db
+
+    MAXIMO_STANDIN_DB=data/standin/maximo.db   # in .env or the environment
+    maximo = MaximoClient.from_env()           # → StandinClient on that file
+
+Tables (only the columns the queries use, plus ROWSTAMP for the delta twins):
+
+    ASSET, ASSETMETER, METER, ROUTES, ROUTE_STOP, CLASSSTRUCTURE, ASSETSPEC
+
+Class names come from the normalized config's ``classes.csv``; route
+descriptions follow ``{DEPT}_{TECH}_{VENDOR} - Description`` (a small share
+deliberately does not, like legacy routes in the real system). Scale is set
+per site by the asset count — meters, route stops and rank specs follow from
+it with roughly the proportions of the HMA extracts.
+
+``StandinClient`` attaches the file as schema MAXIMO, registers the
+REGEXP_LIKE and GREATEST functions SQLite lacks and rewrites
+``LEFT(x, n)`` (a keyword in SQLite) to ``SUBSTR(x, 1, n)``, so the query files
+run unchanged.
+"""
+
+import argparse
+import functools
+import re
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from acm.maximo import DEFAULT_POOL_SIZE, MaximoClient
+
+
+# ── Constants ─────────────────────────────────────────────────────────────────
+
+DEFAULT_CLASSES_CSV = 'data/st_tbl/normalized_config/classes.csv'
+
+DEPTS = ['1WE', '2WE', '1PA', '2PA', '1AF', '2AF', '1AS', '2AS', '1PL', '2PL', 'FAC', 'UTL']
+ROUTE_TECHS = ['IR', 'LU', 'VI', 'UL', 'MC', 'ZD', 'CW']
+VENDORS = ['FLIR', 'UEDMS', 'SKF', 'FLUKE', 'ALS', 'INHSE']
+ROUTE_NAMES = ['Penthouse Route', 'Zone Scans', 'Conveyor Drives', 'Press Line',
+               'Robot Cells', 'Oven Fans', 'Compressor House', 'Pump Room']
+
+# Meter definitions: name prefix → METERTYPE (25 definitions each)
+METER_KINDS = {'RUNHRS': 'CONTINUOUS', 'CYCLES': 'CONTINUOUS', 'TEMP': 'GAUGE',
+               'PRESS': 'GAUGE', 'VIB': 'GAUGE', 'AMPS': 'GAUGE', 'FLOW': 'GAUGE',
+               'OILLVL': 'CHARACTERISTIC'}
+METERS_PER_KIND = 25
+
+RANK_ATTRID = 'A8539'
+RANKS = ['S', 'A', 'B', 'C']
+RANK_WEIGHTS = [0.05, 0.15, 0.35, 0.45]
+
+# Per-asset proportions (roughly the HMA extracts)
+ACTIVE_SHARE = 0.92
+MEAN_METERS = 2.9
+NULL_READING_SHARE = 0.25
+READING_AGE_SCALE_DAYS = 240
+ROUTE_STOP_SHARE = 0.3
+ASSETS_PER_ROUTE = 60
+RANKED_SHARE = 0.6
+LEGACY_ROUTE_SHARE = 0.05
+
+BATCH_ASSETS = 250_000
+
+SCHEMA = """
+CREATE TABLE CLASSSTRUCTURE (CLASSSTRUCTUREID INTEGER PRIMARY KEY, DESCRIPTION TEXT,
+                             ROWSTAMP INTEGER);
+CREATE TABLE ASSET (ASSETUID INTEGER UNIQUE, ASSETNUM TEXT, SITEID TEXT, DESCRIPTION TEXT,
+                    LOCATION TEXT, STATUS TEXT, CLASSSTRUCTUREID INTEGER, ROWSTAMP INTEGER,
+                    PRIMARY KEY (ASSETNUM, SITEID));
+CREATE TABLE METER (METERNAME TEXT PRIMARY KEY, DESCRIPTION TEXT, METERTYPE TEXT,
+                    ROWSTAMP INTEGER);
+CREATE TABLE ASSETMETER (ASSETNUM TEXT, SITEID TEXT, METERNAME TEXT, AVGCALCMETHOD TEXT,
+                         ROLLDOWNSOURCE TEXT, REMARKS TEXT, POINTNUM TEXT, LASTREADING TEXT,
+                         LASTREADINGDATE TEXT, CHANGEBY TEXT, LASTREADINGINSPCTR TEXT,
+                         ROWSTAMP INTEGER);
+CREATE TABLE ROUTES (ROUTE TEXT, SITEID TEXT, DESCRIPTION TEXT, ROWSTAMP INTEGER,
+                     PRIMARY KEY (ROUTE, SITEID));
+CREATE TABLE ROUTE_STOP (ROUTE TEXT, ASSETNUM TEXT, SITEID TEXT, ROWSTAMP INTEGER);
+CREATE TABLE ASSETSPEC (ASSETNUM TEXT, SITEID TEXT, ASSETATTRID TEXT, ALNVALUE TEXT,
+                        ROWSTAMP INTEGER);
+"""
+
+INDEXES = """
+CREATE INDEX ASSET_SITE_STATUS ON ASSET (SITEID, STATUS);
+CREATE INDEX ASSETMETER_ASSET ON ASSETMETER (ASSETNUM, SITEID);
+CREATE INDEX ROUTE_STOP_SITE ON ROUTE_STOP (SITEID, ROUTE);
+CREATE INDEX ASSETSPEC_ATTR ON ASSETSPEC (ASSETATTRID, SITEID);
+CREATE INDEX ASSETSPEC_ASSET ON ASSETSPEC (ASSETNUM, SITEID);
+"""
+
+
+# ── Generator ─────────────────────────────────────────────────────────────────
+
+class _Rowstamps:
+    """Monotonic ROWSTAMP source shared by every table, like Maximo's."""
+
+    def __init__(self):
+        self.last = 0
+
+    def take(self, n: int) -> np.ndarray:
+        stamps = np.arange(self.last + 1, self.last + n + 1, dtype=np.int64)
+        self.last += n
+        return stamps
+
+
+def _insert(con: sqlite3.Connection, table: str, columns: dict[str, np.ndarray]):
+    placeholders = ', '.join('?' * len(columns))
+    rows = zip(*(col.tolist() for col in columns.values()))
+    con.executemany(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows)
+
+
+def _labels(prefix: str, numbers: np.ndarray, width: int) -> np.ndarray:
+    return np.array([f'{prefix}{n:0{width}d}' for n in numbers.tolist()], dtype=object)
+
+
+def _reading_dates(rng: np.random.Generator, n: int, as_of: datetime) -> np.ndarray:
+    """Last reading dates as Maximo-style text, NULL for the never-read share."""
+    age = rng.exponential(READING_AGE_SCALE_DAYS * 86_400, n).astype('timedelta64[s]')
+    stamps = np.datetime64(as_of, 's') - age
+    dates = np.char.replace(np.datetime_as_string(stamps, unit='s'), 'T', ' ').astype(object)
+    dates[rng.random(n) < NULL_READING_SHARE] = None
+    return dates
+
+
+def _meter_names() -> tuple[np.ndarray, np.ndarray]:
+    names = [f'{kind}{i:02d}' for kind in METER_KINDS for i in range(METERS_PER_KIND)]
+    types = [METER_KINDS[kind] for kind in METER_KINDS for _ in range(METERS_PER_KIND)]
+    return np.array(names, dtype=object), np.array(types, dtype=object)
+
+
+def _write_assets(con, rng, stamps, site: str, first: int, n: int, n_classes: int,
+                  meter_names: np.ndarray, as_of: datetime, uid_start: int = 0):
+    """One batch of assets with their meters and rank specs."""
+    numbers = np.arange(first, first + n)
+    assetnum = _labels('', numbers + 1_000_000, 7)
+    dept = np.array(DEPTS, dtype=object)[rng.integers(len(DEPTS), size=n)]
+    location = dept + _labels('-', rng.integers(1000, size=n), 3)
+    status = np.where(rng.random(n) < ACTIVE_SHARE, 'A-ACTIVE', 'DECOMMISSIONED').astype(object)
+    _insert(con, 'ASSET', {
+        'ASSETUID': numbers + uid_start + 1,
+        'ASSETNUM': assetnum,
+        'SITEID': np.full(n, site, dtype=object),
+        'DESCRIPTION': 'ASSET ' + assetnum,
+        'LOCATION': location,
+        'STATUS': status,
+        'CLASSSTRUCTUREID': rng.integers(1, n_classes + 1, size=n),
+        'ROWSTAMP': stamps.take(n),
+    })
+
+    # Meters: distinct definitions per asset, consecutive from a random start
+    counts = np.minimum(rng.poisson(MEAN_METERS, n), len(meter_names))
+    owner = np.repeat(np.arange(n), counts)
+    offset = np.arange(len(owner)) - np.repeat(np.cumsum(counts) - counts, counts)
+    start = rng.integers(len(meter_names), size=n)
+    m = len(owner)
+    _insert(con, 'ASSETMETER', {
+        'ASSETNUM': assetnum[owner],
+        'SITEID': np.full(m, site, dtype=object),
+        'METERNAME': meter_names[(start[owner] + offset) % len(meter_names)],
+        'AVGCALCMETHOD': np.full(m, 'ALL', dtype=object),
+        'ROLLDOWNSOURCE': np.full(m, None, dtype=object),
+        'REMARKS': np.full(m, None, dtype=object),
+        'POINTNUM': _labels('PT', offset + 1, 2),
+        'LASTREADING': rng.integers(0, 10_000, size=m).astype(str).astype(object),
+        'LASTREADINGDATE': _reading_dates(rng, m, as_of),
+        'CHANGEBY': np.full(m, 'MAXADMIN', dtype=object),
+        'LASTREADINGINSPCTR': np.full(m, 'MAXADMIN', dtype=object),
+        'ROWSTAMP': stamps.take(m),
+    })
+
+    ranked = np.flatnonzero(rng.random(n) < RANKED_SHARE)
+    r = len(ranked)
+    _insert(con, 'ASSETSPEC', {
+        'ASSETNUM': assetnum[ranked],
+        'SITEID': np.full(r, site, dtype=object),
+        'ASSETATTRID': np.full(r, RANK_ATTRID, dtype=object),
+        'ALNVALUE': rng.choice(np.array(RANKS, dtype=object), size=r, p=RANK_WEIGHTS),
+        'ROWSTAMP': stamps.take(r),
+    })
+
+
+def _write_routes(con, rng, stamps, site: str, n_assets: int):
+    """Routes with DEPT_TECH_VENDOR descriptions and their stops."""
+    n_routes = max(1, n_assets // ASSETS_PER_ROUTE)
+    codes = (np.array(DEPTS, dtype=object)[rng.integers(len(DEPTS), size=n_routes)] + '_'
+             + np.array(ROUTE_TECHS, dtype=object)[rng.integers(len(ROUTE_TECHS), size=n_routes)]
+             + '_' + np.array(VENDORS, dtype=object)[rng.integers(len(VENDORS), size=n_routes)])
+    names = np.array(ROUTE_NAMES, dtype=object)[rng.integers(len(ROUTE_NAMES), size=n_routes)]
+    desc = codes + ' - ' + names + ' ' + _labels('', np.arange(1, n_routes + 1), 1)
+    legacy = rng.random(n_routes) < LEGACY_ROUTE_SHARE
+    desc[legacy] = 'LEGACY ' + names[legacy]
+    route = _labels(f'{site}-R', np.arange(1, n_routes + 1), 5)
+    _insert(con, 'ROUTES', {
+        'ROUTE': route,
+        'SITEID': np.full(n_routes, site, dtype=object),
+        'DESCRIPTION': desc,
+        'ROWSTAMP': stamps.take(n_routes),
+    })
+
+    # Stops: unique (route, asset) pairs
+    n_stops = int(n_assets * ROUTE_STOP_SHARE)
+    pairs = np.unique(rng.integers(n_routes, size=n_stops).astype(np.int64) * n_assets
+                      + rng.integers(n_assets, size=n_stops))
+    s = len(pairs)
+    _insert(con, 'ROUTE_STOP', {
+        'ROUTE': route[pairs // n_assets],
+        'ASSETNUM': _labels('', pairs % n_assets + 1_000_000, 7),
+        'SITEID': np.full(s, site, dtype=object),
+        'ROWSTAMP': stamps.take(s),
+    })
+
+
+def generate_standin(path: str | Path, n_assets: int = 10_000,
+                     sites: list[str] | None = None,
+                     classes_csv: str | Path = DEFAULT_CLASSES_CSV,
+                     seed: int = 0, as_of: datetime | None = None) -> Path:
+    """
+    Build (or rebuild) a stand-in Maximo database.
+
+    Parameters
+    ----------
+    path : str or Path
+        SQLite file to write; an existing file is replaced.
+    n_assets : int
+        Assets per site (10k for quick runs, up to ~5M for benchmarks).
+    sites : list of str, optional
+        SITEIDs to populate (default ['HMA']).
+    classes_csv : str or Path
+        Normalized config classes (class_id, class_name) used as
+        CLASSSTRUCTURE descriptions.
+    seed : int
+        Random seed; the same arguments give the same database.
+    as_of : datetime, optional
+        Reference time for reading dates (default: now).
+    """
+    if n_assets < 1:
+        raise ValueError(f"n_assets must be positive, got {n_assets}")
+    path = Path(path)
+    sites = sites or ['HMA']
+    as_of = as_of or datetime.now()
+    rng = np.random.default_rng(seed)
+    stamps = _Rowstamps()
+    start = time.perf_counter()
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)
+    con = sqlite3.connect(path)
+    try:
+        con.executescript('PRAGMA journal_mode = OFF; PRAGMA synchronous = OFF;' + SCHEMA)
+
+        classes = pd.read_csv(classes_csv)
+        n_classes = len(classes)
+        _insert(con, 'CLASSSTRUCTURE', {
+            'CLASSSTRUCTUREID': np.arange(1, n_classes + 1),
+            'DESCRIPTION': classes['class_name'].to_numpy(dtype=object),
+            'ROWSTAMP': stamps.take(n_classes),
+        })
+        meter_names, meter_types = _meter_names()
+        _insert(con, 'METER', {
+            'METERNAME': meter_names,
+            'DESCRIPTION': meter_names + ' METER',
+            'METERTYPE': meter_types,
+            'ROWSTAMP': stamps.take(len(meter_names)),
+        })
+
+        for i, site in enumerate(sites):
+            # ASSETUID is unique across sites; ASSETNUM repeats per site
+            for first in range(0, n_assets, BATCH_ASSETS):
+                _write_assets(con, rng, stamps, site, first,
+                              min(BATCH_ASSETS, n_assets - first), n_classes,
+                              meter_names, as_of, uid_start=i * n_assets)
+            _write_routes(con, rng, stamps, site, n_assets)
+            con.commit()
+
+        con.executescript(INDEXES)
+        con.commit()
+    finally:
+        con.close()
+
+    print(f"✓ Stand-in Maximo: {n_assets:,} assets × {len(sites)} site(s) → {path} "
+          f"({path.stat().st_size / 1024**2:.0f} MB, {time.perf_counter() - start:.1f}s)")
+    return path
+
+
+# ── Client ────────────────────────────────────────────────────────────────────
+
+_LEFT = re.compile(r'\bLEFT\s*\(\s*([^(),]+?)\s*,\s*(\d+)\s*\)', re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=128)
+def translate_sql(sql: str) -> str:
+    """Maximo SQL → SQLite: ``LEFT(x, n)`` becomes ``SUBSTR(x, 1, n)``."""
+    return _LEFT.sub(r'SUBSTR(\1, 1, \2)', sql)
+
+
+@functools.lru_cache(maxsize=64)
+def _regex(pattern: str) -> re.Pattern:
+    return re.compile(pattern)
+
+
+def _regexp_like(value, pattern) -> bool:
+    return value is not None and _regex(pattern).search(value) is not None
+
+
+def _greatest(*values):
+    present = [v for v in values if v is not None]
+    return max(present) if present else None
+
+
+class StandinClient(MaximoClient):
+    """
+    ``MaximoClient`` on a stand-in database file instead of the ODBC DSN.
+    Pooling, metrics and typed fetching are inherited unchanged.
+    """
+
+    def __init__(self, db_path: str | Path, pool_size: int = DEFAULT_POOL_SIZE):
+        self.db_path = Path(db_path)
+        if not self.db_path.exists():
+            raise FileNotFoundError(f"Stand-in Maximo database not found: {self.db_path} "
+                                    f"(build it with python -m acm.standin)")
+        super().__init__(f'standin:{self.db_path}', 'standin', '', pool_size=pool_size)
+
+    def _connect(self):
+        conn = sqlite3.connect(':memory:', check_same_thread=False)
+        conn.execute('ATTACH DATABASE ? AS MAXIMO', (str(self.db_path),))
+        conn.create_function('REGEXP_LIKE', 2, _regexp_like, deterministic=True)
+        conn.create_function('GREATEST', -1, _greatest, deterministic=True)
+        return conn, conn.cursor()
+
+    def run_query(self, sql: str, params: tuple = (), **options) -> pd.DataFrame:
+        return super().run_query(translate_sql(sql), params, **options)
+
+
+# ── Command line ──────────────────────────────────────────────────────────────
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(prog='python -m acm.standin',
+                                     description='Build a stand-in Maximo database.')
+    parser.add_argument('--assets', type=int, default=10_000, help='assets per site')
+    parser.add_argument('--sites', nargs='+', default=['HMA'])
+    parser.add_argument('--out', default='data/standin/maximo.db')
+    parser.add_argument('--classes', default=DEFAULT_CLASSES_CSV)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    generate_standin(args.out, args.assets, args.sites, args.classes, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,24 +1,41 @@
 """
 ACM Configuration Manager
 ==========================
-Manages the five normalized config CSVs that define monitoring requirements:
+Manages the five normalized config tables that define monitoring requirements:
 
-    components.csv              — master list of monitorable component types
-    technologies.csv            — master list of technology codes
-    classes.csv                 — master list of asset classes (from Maximo)
-    component_technology.csv    — junction: component_name × technology_code × application_type
-    class_component.csv         — junction: class_name × component_name
+    components              — master list of monitorable component types
+    technologies            — master list of technology codes
+    classes                 — master list of asset classes (from Maximo)
+    component_technology    — junction: component_name × technology_code × application_type
+    class_component         — junction: class_name × component_name
 
 Junction tables use natural keys (component_name, class_name) — no integer
 foreign key lookups required.
 
-All mutations (add, remove) are logged to change_log.csv.
+All mutations (add, remove) are logged to the change_log table.
 Removals are never executed immediately — they are written as pending requests
 and must be approved via the admin app before any data is changed.
+
+Storage is pluggable. By default the tables are the six CSVs in the config
+directory (``components.csv`` …). Once ``acm_config.db`` exists there they
+are read from and written to that SQLite database instead (WAL mode): each
+mutation is one transaction that writes only the rows it changes, so an
+approved removal and its change-log entry land together or not at all, and
+readers in other app processes are never blocked by a writer.
+
+    python acm_config.py --to-sqlite            # CSVs → normalized_config/acm_config.db
+    python acm_config.py --to-csv               # acm_config.db → CSVs (Excel, git diffs)
 """
 
+import argparse
 import json
+import os
+import sqlite3
+import threading
+import numpy as np
 import pandas as pd
+from collections import defaultdict
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
@@ -26,9 +43,306 @@ from typing import Optional
 
 # ── Constants ─────────────────────────────────────────────────────────────────
 
+DEFAULT_CONFIG_DIR = Path(__file__).resolve().parent / 'data' / 'st_tbl' / 'normalized_config'
+
 VALID_APPLICATION_TYPES = {'Primary', 'Secondary'}
 VALID_STATUSES = {'applied', 'pending', 'approved', 'rejected'}
 
+# Highest priority wins when several components drive the same technology
+APPLICATION_PRIORITY = {'Primary': 1, 'Secondary': 2}
+
+# Config tables (one CSV each, named <table>.csv), in load order
+CONFIG_TABLES = ['components', 'technologies', 'classes',
+                 'component_technology', 'class_component', 'change_log']
+
+# Legacy integer ids of the master lists (optional columns)
+ID_COLUMNS = {'components': 'component_id', 'technologies': 'technology_id',
+              'classes': 'class_id'}
+
+SQLITE_FILENAME = 'acm_config.db'
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS components (
+    component_id     INTEGER,
+    component_name   TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS technologies (
+    technology_id    INTEGER,
+    technology_code  TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS classes (
+    class_id         INTEGER,
+    class_name       TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS component_technology (
+    component_name   TEXT NOT NULL,
+    technology_code  TEXT NOT NULL,
+    application_type TEXT NOT NULL CHECK (application_type IN ('Primary', 'Secondary')),
+    PRIMARY KEY (component_name, technology_code)
+);
+CREATE INDEX IF NOT EXISTS component_technology_by_tech
+    ON component_technology (technology_code);
+CREATE TABLE IF NOT EXISTS class_component (
+    class_name       TEXT NOT NULL,
+    component_name   TEXT NOT NULL,
+    PRIMARY KEY (class_name, component_name)
+);
+CREATE INDEX IF NOT EXISTS class_component_by_component
+    ON class_component (component_name);
+CREATE TABLE IF NOT EXISTS change_log (
+    log_id           INTEGER PRIMARY KEY,
+    timestamp        TEXT,
+    entity_type      TEXT,
+    action           TEXT,
+    entity_key       TEXT,
+    payload          TEXT,
+    notes            TEXT,
+    requested_by     TEXT,
+    status           TEXT,
+    reviewed_by      TEXT,
+    reviewed_at      TEXT
+);
+CREATE INDEX IF NOT EXISTS change_log_by_status ON change_log (status);
+"""
+
+
+# ── Storage backends ──────────────────────────────────────────────────────────
+# Both backends expose the same small interface: load(table) returns a whole
+# table; insert / update / delete change single rows, matched on column
+# values; next_id allocates the next integer id; transaction() groups
+# changes. Row operations outside a transaction commit on their own.
+# ACMConfig keeps its in-memory tables (and indexes) in step itself.
+
+def _check_table(table: str):
+    if table not in CONFIG_TABLES:
+        raise ValueError(f"Unknown config table: '{table}'")
+
+
+def _sql_value(value):
+    """Python scalar for sqlite3 (NaN → NULL, numpy scalars unboxed)."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _write_csv(df: pd.DataFrame, path: Path):
+    """Write a CSV to a temporary file next to ``path``, then ``os.replace`` it in."""
+    tmp = path.with_name(f'.{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+    try:
+        df.to_csv(tmp, index=False)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+class CSVStorage:
+    """
+    The config tables as one CSV file each in ``config_dir`` (the default).
+
+    Row operations edit a copy of the table held here; committing a
+    transaction rewrites each touched file once, atomically per file. Files
+    are replaced one after another, so a crash part-way through a multi-table
+    commit can still leave them out of step — ``SQLiteStorage`` cannot.
+    """
+
+    def __init__(self, config_dir: str | Path):
+        self.config_dir = Path(config_dir)
+        self.location = self.config_dir
+        self._frames: dict[str, pd.DataFrame] = {}
+        self._dirty: set[str] = set()
+        self._depth = 0
+        self._lock = threading.RLock()
+
+    def _path(self, table: str) -> Path:
+        _check_table(table)
+        return self.config_dir / f'{table}.csv'
+
+    def load(self, table: str) -> pd.DataFrame:
+        path = self._path(table)
+        if not path.exists():
+            raise FileNotFoundError(f"Config file not found: {path}")
+        df = pd.read_csv(path)
+        with self._lock:
+            if table not in self._dirty:
+                self._frames[table] = df
+        return df.copy()
+
+    def _frame(self, table: str) -> pd.DataFrame:
+        if table not in self._frames:
+            self.load(table)
+        return self._frames[table]
+
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            self._depth += 1
+            try:
+                yield
+                if self._depth == 1:
+                    for table in sorted(self._dirty):
+                        _write_csv(self._frames[table], self._path(table))
+            except BaseException:
+                if self._depth == 1:
+                    for table in self._dirty:     # back to what is on disk
+                        self._frames.pop(table, None)
+                raise
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._dirty.clear()
+
+    def _match(self, frame: pd.DataFrame, where: dict) -> pd.Series:
+        mask = pd.Series(True, index=frame.index)
+        for col, value in where.items():
+            mask &= frame[col] == value
+        return mask
+
+    def insert(self, table: str, row: dict):
+        with self.transaction():
+            frame = self._frame(table)
+            self._frames[table] = pd.concat([frame, pd.DataFrame([row])], ignore_index=True)
+            self._dirty.add(table)
+
+    def update(self, table: str, where: dict, values: dict):
+        with self.transaction():
+            frame = self._frame(table)
+            mask = self._match(frame, where)
+            for col, value in values.items():
+                frame.loc[mask, col] = value
+            self._dirty.add(table)
+
+    def delete(self, table: str, where: dict):
+        with self.transaction():
+            frame = self._frame(table)
+            self._frames[table] = frame[~self._match(frame, where)].reset_index(drop=True)
+            self._dirty.add(table)
+
+    def next_id(self, table: str, column: str) -> int:
+        with self._lock:
+            frame = self._frame(table)
+            valid = frame[column].dropna() if column in frame.columns else frame.iloc[0:0, 0]
+            return int(valid.max()) + 1 if not valid.empty else 1
+
+
+class SQLiteStorage:
+    """
+    The config tables in one SQLite database, in WAL mode.
+
+    Junction tables are keyed on their natural-key pair and indexed on the
+    other column; the change log is indexed on status. A transaction is one
+    ``BEGIN IMMEDIATE … COMMIT`` that writes only the rows it changes. Under
+    WAL, readers — other app processes loading the config — never wait for
+    the writer, and writers from several processes queue on the database
+    lock (up to ``timeout`` seconds) instead of overwriting each other.
+
+    Parameters
+    ----------
+    path : str or Path
+        Database file; created with the schema if missing.
+    timeout : float
+        Seconds to wait for another process's write transaction.
+    """
+
+    def __init__(self, path: str | Path, timeout: float = 30.0):
+        self.path = Path(path)
+        self.config_dir = self.path.parent
+        self.location = self.path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=timeout, isolation_level=None,
+                                     check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SQLITE_SCHEMA)
+        self._depth = 0
+        self._lock = threading.RLock()
+
+    def close(self):
+        self._conn.close()
+
+    def load(self, table: str) -> pd.DataFrame:
+        _check_table(table)
+        with self._lock:
+            df = pd.read_sql_query(f'SELECT * FROM {table} ORDER BY rowid', self._conn)
+        id_col = ID_COLUMNS.get(table)
+        if id_col and df[id_col].isna().all():
+            df = df.drop(columns=id_col)    # imported from a CSV without ids
+        return df
+
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            outermost = self._depth == 0
+            if outermost:
+                self._conn.execute('BEGIN IMMEDIATE')
+            self._depth += 1
+            try:
+                yield
+            except BaseException:
+                if outermost:
+                    self._conn.execute('ROLLBACK')
+                raise
+            else:
+                if outermost:
+                    self._conn.execute('COMMIT')
+            finally:
+                self._depth -= 1
+
+    def _execute(self, sql: str, params: list):
+        with self.transaction():
+            self._conn.execute(sql, [_sql_value(v) for v in params])
+
+    def insert(self, table: str, row: dict):
+        _check_table(table)
+        cols = ', '.join(row)
+        marks = ', '.join('?' * len(row))
+        self._execute(f'INSERT INTO {table} ({cols}) VALUES ({marks})', list(row.values()))
+
+    def update(self, table: str, where: dict, values: dict):
+        _check_table(table)
+        sets = ', '.join(f'{col} = ?' for col in values)
+        cond = ' AND '.join(f'{col} = ?' for col in where)
+        self._execute(f'UPDATE {table} SET {sets} WHERE {cond}',
+                      [*values.values(), *where.values()])
+
+    def delete(self, table: str, where: dict):
+        _check_table(table)
+        cond = ' AND '.join(f'{col} = ?' for col in where)
+        self._execute(f'DELETE FROM {table} WHERE {cond}', list(where.values()))
+
+    def next_id(self, table: str, column: str) -> int:
+        _check_table(table)
+        with self._lock:
+            (next_id,) = self._conn.execute(
+                f'SELECT COALESCE(MAX({column}), 0) + 1 FROM {table}').fetchone()
+        return int(next_id)
+
+    def import_csv(self, config_dir: str | Path):
+        """Replace every table with the CSVs in ``config_dir``, in one transaction."""
+        source = CSVStorage(config_dir)
+        frames = {table: source.load(table) for table in CONFIG_TABLES}
+        with self.transaction():
+            for table, df in frames.items():
+                self._conn.execute(f'DELETE FROM {table}')
+                cols = ', '.join(df.columns)
+                marks = ', '.join('?' * len(df.columns))
+                self._conn.executemany(
+                    f'INSERT INTO {table} ({cols}) VALUES ({marks})',
+                    ([_sql_value(v) for v in row] for row in df.itertuples(index=False)))
+        print(f"✓ Imported {len(frames)} config tables from '{source.config_dir}' → {self.path}")
+
+
+def open_storage(location: str | Path) -> CSVStorage | SQLiteStorage:
+    """
+    Storage backend for a config location: a ``.db`` file, or a directory
+    holding ``acm_config.db``, is SQLite; any other directory is the CSVs.
+    """
+    location = Path(location)
+    if location.suffix == '.db':
+        return SQLiteStorage(location)
+    if (location / SQLITE_FILENAME).exists():
+        return SQLiteStorage(location / SQLITE_FILENAME)
+    return CSVStorage(location)
+
 
 # ── ACMConfig ─────────────────────────────────────────────────────────────────
 
@@ -39,38 +353,90 @@ class ACMConfig:
     Parameters
     ----------
     config_dir : str | Path
-        Directory containing the six CSV files. Defaults to 'normalized_config'.
+        Directory containing the six CSV files (or ``acm_config.db``), or the
+        path of a SQLite config database. Defaults to 'normalized_config'.
+    storage : CSVStorage | SQLiteStorage, optional
+        Explicit storage backend; overrides ``config_dir``.
     """
 
-    def __init__(self, config_dir: str | Path = None):
-        if config_dir is None:
-            config_dir = Path(__file__).resolve().parent / 'data' / 'st_tbl' / 'normalized_config'
-        self.config_dir = Path(config_dir)
+    def __init__(self, config_dir: str | Path = None,
+                 storage: CSVStorage | SQLiteStorage | None = None):
+        if storage is None:
+            storage = open_storage(DEFAULT_CONFIG_DIR if config_dir is None else config_dir)
+        self.storage = storage
+        self.config_dir = storage.config_dir
+        self.version = 0
         self._load_all()
-        print(f"✓ ACMConfig loaded from '{self.config_dir}'")
+        print(f"✓ ACMConfig loaded from '{storage.location}'")
 
     # ── Load ──────────────────────────────────────────────────────────────────
 
     def _load_all(self):
-        """Load all config files from disk."""
-        self.components          = self._load_csv('components.csv')
-        self.technologies        = self._load_csv('technologies.csv')
-        self.classes             = self._load_csv('classes.csv')
-        self.component_technology = self._load_csv('component_technology.csv')
-        self.class_component     = self._load_csv('class_component.csv')
-        self.change_log          = self._load_csv('change_log.csv')
-
-    def _load_csv(self, filename: str) -> pd.DataFrame:
-        path = self.config_dir / filename
-        if not path.exists():
-            raise FileNotFoundError(f"Config file not found: {path}")
-        return pd.read_csv(path)
+        """Load all config tables from storage."""
+        self.components          = self.storage.load('components')
+        self.technologies        = self.storage.load('technologies')
+        self.classes             = self.storage.load('classes')
+        self.component_technology = self.storage.load('component_technology')
+        self.class_component     = self.storage.load('class_component')
+        self.change_log          = self.storage.load('change_log')
+        self._build_indexes()
+        self._build_class_tech_matrix()
+        self.version += 1
 
     def reload(self):
-        """Reload all files from disk. Call after external edits."""
+        """Reload all tables from storage. Call after external edits."""
         self._load_all()
         print("✓ Configuration reloaded from disk")
 
+    # ── Indexes ───────────────────────────────────────────────────────────────
+    # Hash indexes over the loaded tables so queries and existence checks are
+    # dict/set lookups instead of DataFrame scans. Rebuilt on load and after
+    # every mutation of the table they cover. Rebuilding a junction index also
+    # drops the memoized results derived from it (self._derived).
+
+    def _build_indexes(self):
+        """Rebuild every index from the in-memory tables."""
+        self._derived = {}
+        self._index_masters()
+        self._index_component_technology()
+        self._index_class_component()
+
+    def _index_masters(self):
+        """Existence sets for the three master lists."""
+        self._component_set = set(self.components['component_name'])
+        self._class_set = set(self.classes['class_name'])
+        self._tech_set = set(self.technologies['technology_code'])
+
+    def _index_component_technology(self):
+        """(component, tech) → application_type, plus per-component / per-tech frames."""
+        ct = self.component_technology
+        self._ct_pairs = dict(zip(
+            zip(ct['component_name'], ct['technology_code']), ct['application_type']
+        ))
+        self._ct_by_component = {
+            name: grp[['technology_code', 'application_type']]
+                  .sort_values('technology_code').reset_index(drop=True)
+            for name, grp in ct.groupby('component_name', sort=False)
+        }
+        self._ct_by_tech = {
+            code: grp[['component_name', 'application_type']]
+                  .sort_values('component_name').reset_index(drop=True)
+            for code, grp in ct.groupby('technology_code', sort=False)
+        }
+        self._derived.clear()
+
+    def _index_class_component(self):
+        """(class, component) pairs, plus sorted components per class and classes per component."""
+        cc = self.class_component
+        self._cc_pairs = set(zip(cc['class_name'], cc['component_name']))
+        by_class, by_component = defaultdict(list), defaultdict(list)
+        for class_name, component_name in self._cc_pairs:
+            by_class[class_name].append(component_name)
+            by_component[component_name].append(class_name)
+        self._cc_by_class = {k: tuple(sorted(v)) for k, v in by_class.items()}
+        self._cc_by_component = {k: tuple(sorted(v)) for k, v in by_component.items()}
+        self._derived.clear()
+
     # ── Lookup helpers ────────────────────────────────────────────────────────
 
     @property
@@ -86,15 +452,15 @@ class ACMConfig:
         return sorted(self.classes['class_name'].tolist())
 
     def _assert_component_exists(self, name: str):
-        if name not in self.components['component_name'].values:
+        if name not in self._component_set:
             raise ValueError(f"Component not found: '{name}'")
 
     def _assert_class_exists(self, name: str):
-        if name not in self.classes['class_name'].values:
+        if name not in self._class_set:
             raise ValueError(f"Asset class not found: '{name}'")
 
     def _assert_tech_exists(self, code: str):
-        if code not in self.technologies['technology_code'].values:
+        if code not in self._tech_set:
             raise ValueError(f"Technology code not found: '{code}'")
 
     # ── Component queries ─────────────────────────────────────────────────────
@@ -108,22 +474,15 @@ class ACMConfig:
         DataFrame with columns: technology_code, application_type
         """
         self._assert_component_exists(component_name)
-        return (
-            self.component_technology[
-                self.component_technology['component_name'] == component_name
-            ][['technology_code', 'application_type']]
-            .sort_values('technology_code')
-            .reset_index(drop=True)
-        )
+        cached = self._ct_by_component.get(component_name)
+        if cached is None:
+            return pd.DataFrame(columns=['technology_code', 'application_type'])
+        return cached.copy()
 
     def get_component_classes(self, component_name: str) -> list[str]:
         """Get all asset class names that include this component."""
         self._assert_component_exists(component_name)
-        return sorted(
-            self.class_component[
-                self.class_component['component_name'] == component_name
-            ]['class_name'].tolist()
-        )
+        return list(self._cc_by_component.get(component_name, ()))
 
     # ── Technology queries ────────────────────────────────────────────────────
 
@@ -144,29 +503,21 @@ class ACMConfig:
         DataFrame with columns: component_name, application_type
         """
         self._assert_tech_exists(tech_code)
-        result = self.component_technology[
-            self.component_technology['technology_code'] == tech_code
-        ].copy()
+        result = self._ct_by_tech.get(tech_code)
+        if result is None:
+            result = pd.DataFrame(columns=['component_name', 'application_type'])
         if application_type:
             if application_type not in VALID_APPLICATION_TYPES:
                 raise ValueError(f"application_type must be one of {VALID_APPLICATION_TYPES}")
             result = result[result['application_type'] == application_type]
-        return (
-            result[['component_name', 'application_type']]
-            .sort_values('component_name')
-            .reset_index(drop=True)
-        )
+        return result.reset_index(drop=True).copy()
 
     # ── Class queries ─────────────────────────────────────────────────────────
 
     def get_class_components(self, class_name: str) -> list[str]:
         """Get all component names in an asset class."""
         self._assert_class_exists(class_name)
-        return sorted(
-            self.class_component[
-                self.class_component['class_name'] == class_name
-            ]['component_name'].tolist()
-        )
+        return list(self._cc_by_class.get(class_name, ()))
 
     def get_class_technologies(self, class_name: str) -> pd.DataFrame:
         """
@@ -179,36 +530,135 @@ class ACMConfig:
         DataFrame with columns: technology_code, application_type, driving_components
         """
         self._assert_class_exists(class_name)
-        components = self.get_class_components(class_name)
-        if not components:
+        cached = self._class_technologies_by_class().get(class_name)
+        if cached is None:
             return pd.DataFrame(columns=['technology_code', 'application_type', 'driving_components'])
+        return cached.copy()
 
-        ct = self.component_technology[
-            self.component_technology['component_name'].isin(components)
-        ].copy()
+    def get_all_class_technologies(self) -> pd.DataFrame:
+        """
+        Technologies applicable to every asset class, in one pass.
+        Same rules as get_class_technologies: highest priority wins
+        (Primary > Secondary), driving components are listed alphabetically.
 
-        if ct.empty:
-            return pd.DataFrame(columns=['technology_code', 'application_type', 'driving_components'])
+        Memoized until the next mutation of class_component or component_technology.
 
-        # Highest priority wins: Primary > Secondary
-        priority = {'Primary': 1, 'Secondary': 2}
-        ct['_priority'] = ct['application_type'].map(priority)
-
-        # Group by technology: take best priority, collect driving component names
-        def agg_tech(grp):
-            best_idx = grp['_priority'].idxmin()
-            return pd.Series({
-                'application_type': grp.loc[best_idx, 'application_type'],
-                'driving_components': ', '.join(sorted(grp['component_name'].tolist()))
-            })
-
-        result = (
-            ct.groupby('technology_code')
-            .apply(agg_tech)
-            .reset_index()
-            .sort_values('technology_code')
-        )
-        return result
+        Returns
+        -------
+        DataFrame with columns: class_name, technology_code, application_type,
+        driving_components
+        """
+        if 'class_technologies' not in self._derived:
+            merged = self.class_component.merge(
+                self.component_technology, on='component_name'
+            )
+            merged['_priority'] = merged['application_type'].map(APPLICATION_PRIORITY)
+            result = (
+                merged.sort_values('component_name')
+                .groupby(['class_name', 'technology_code'])
+                .agg(_priority=('_priority', 'min'),
+                     driving_components=('component_name', ', '.join))
+                .reset_index()
+            )
+            label = {p: t for t, p in APPLICATION_PRIORITY.items()}
+            result['application_type'] = result['_priority'].map(label)
+            self._derived['class_technologies'] = result[
+                ['class_name', 'technology_code', 'application_type', 'driving_components']
+            ]
+        return self._derived['class_technologies'].copy()
+
+    def _class_technologies_by_class(self) -> dict[str, pd.DataFrame]:
+        """class_name → its slice of get_all_class_technologies() (memoized)."""
+        if 'class_technologies_by_class' not in self._derived:
+            self._derived['class_technologies_by_class'] = {
+                name: grp.drop(columns='class_name').reset_index(drop=True)
+                for name, grp in self.get_all_class_technologies().groupby('class_name', sort=False)
+            }
+        return self._derived['class_technologies_by_class']
+
+    # ── Class × technology matrix ─────────────────────────────────────────────
+    # Materialized NEEDS / USE matrix (classes × technologies). Each cell counts
+    # the components in the class that drive the technology — Primary only for
+    # NEEDS, Primary or Secondary for USE — so a junction row change is applied
+    # as a +1 / -1 on the affected cells instead of re-deriving the whole matrix.
+
+    def _build_class_tech_matrix(self):
+        """Full build of the count matrices from the junction indexes."""
+        self._matrix_techs = {code: j for j, code in enumerate(self.technology_codes)}
+        self._matrix_classes = {}
+        self._needs_count = np.zeros((0, len(self._matrix_techs)), dtype=np.int32)
+        self._use_count = np.zeros((0, len(self._matrix_techs)), dtype=np.int32)
+        for class_name in self.class_names:
+            self._matrix_row(class_name)
+        for class_name, component_name in self._cc_pairs:
+            self._matrix_on_class_component(class_name, component_name, +1)
+
+    def _matrix_row(self, class_name: str) -> int:
+        """Row index of a class in the matrix, appending an empty row if new."""
+        row = self._matrix_classes.get(class_name)
+        if row is None:
+            row = self._matrix_classes[class_name] = len(self._matrix_classes)
+            empty = np.zeros((1, len(self._matrix_techs)), dtype=np.int32)
+            self._needs_count = np.vstack([self._needs_count, empty])
+            self._use_count = np.vstack([self._use_count, empty])
+        return row
+
+    def _component_tech_vectors(self, component_name: str) -> tuple[np.ndarray, np.ndarray]:
+        """(needs, use) 0/1 vectors over technologies for one component."""
+        needs = np.zeros(len(self._matrix_techs), dtype=np.int32)
+        use = np.zeros(len(self._matrix_techs), dtype=np.int32)
+        techs = self._ct_by_component.get(component_name)
+        if techs is not None:
+            for code, app_type in zip(techs['technology_code'], techs['application_type']):
+                j = self._matrix_techs.get(code)
+                if j is None:
+                    continue   # tech code not in the master list (see validate)
+                use[j] = 1
+                needs[j] = int(app_type == 'Primary')
+        return needs, use
+
+    def _matrix_on_class_component(self, class_name: str, component_name: str, sign: int):
+        """Add (+1) or remove (-1) one component's technologies from a class row."""
+        row = self._matrix_row(class_name)
+        needs, use = self._component_tech_vectors(component_name)
+        self._needs_count[row] += sign * needs
+        self._use_count[row] += sign * use
+
+    def _matrix_on_component_technology(self, component_name: str, tech_code: str,
+                                        old_type: Optional[str], new_type: Optional[str]):
+        """Apply an add / update / remove of one component↔technology row."""
+        j = self._matrix_techs.get(tech_code)
+        classes = self._cc_by_component.get(component_name, ())
+        if j is None or not classes:
+            return
+        rows = [self._matrix_row(c) for c in classes]
+        self._needs_count[rows, j] += int(new_type == 'Primary') - int(old_type == 'Primary')
+        self._use_count[rows, j] += int(new_type is not None) - int(old_type is not None)
+
+    def get_class_tech_matrix(self) -> pd.DataFrame:
+        """
+        NEEDS / USE flags for every asset class × technology.
+
+        NEEDS_<tech> = 'Y' if any component in the class has a Primary
+        application of the technology; USE_<tech> = 'Y' for Primary or Secondary.
+        Maintained incrementally on every class_component / component_technology
+        change; the DataFrame view is memoized until the next mutation.
+        Compare ``self.version`` to tell whether a cached copy is stale.
+
+        Returns
+        -------
+        DataFrame with columns: ASSET_CLASS, NEEDS_<tech>..., USE_<tech>...
+        """
+        if 'class_tech_matrix' not in self._derived:
+            techs = list(self._matrix_techs)
+            flags = {'ASSET_CLASS': list(self._matrix_classes)}
+            for prefix, counts in (('NEEDS_', self._needs_count), ('USE_', self._use_count)):
+                for j, tech in enumerate(techs):
+                    flags[f'{prefix}{tech}'] = np.where(counts[:, j] > 0, 'Y', 'N')
+            self._derived['class_tech_matrix'] = (
+                pd.DataFrame(flags).sort_values('ASSET_CLASS').reset_index(drop=True)
+            )
+        return self._derived['class_tech_matrix'].copy()
 
     # ── Add operations (immediate, logged as 'applied') ───────────────────────
 
@@ -218,53 +668,60 @@ class ACMConfig:
 
         Returns True if added, False if already exists.
         """
-        if component_name in self.components['component_name'].values:
+        if component_name in self._component_set:
             print(f"  Component already exists: '{component_name}'")
             return False
 
-        new_row = pd.DataFrame({'component_name': [component_name]})
-
-        # Preserve component_id if it exists as a column (for backwards compat)
-        if 'component_id' in self.components.columns:
-            next_id = int(self.components['component_id'].max()) + 1
-            new_row.insert(0, 'component_id', next_id)
-
-        self.components = pd.concat([self.components, new_row], ignore_index=True)
-        self._save('components.csv', self.components)
-
-        self._log_change(
-            entity_type='component',
-            action='add',
-            entity_key=component_name,
-            payload={'component_name': component_name},
-            requested_by=requested_by,
-            status='applied',
-        )
+        new_row = {'component_name': component_name}
+
+        with self._transaction():
+            # Preserve component_id if it exists as a column (for backwards compat)
+            if 'component_id' in self.components.columns:
+                new_row = {'component_id': self.storage.next_id('components', 'component_id'),
+                           **new_row}
+
+            self._insert('components', new_row)
+            self.components = pd.concat([self.components, pd.DataFrame([new_row])],
+                                        ignore_index=True)
+            self._index_masters()
+
+            self._log_change(
+                entity_type='component',
+                action='add',
+                entity_key=component_name,
+                payload={'component_name': component_name},
+                requested_by=requested_by,
+                status='applied',
+            )
         print(f"  ✓ Added component: '{component_name}'")
         return True
 
     def add_class(self, class_name: str, requested_by: str = 'system') -> bool:
         """Add a new asset class. Returns True if added, False if already exists."""
-        if class_name in self.classes['class_name'].values:
+        if class_name in self._class_set:
             print(f"  Asset class already exists: '{class_name}'")
             return False
 
-        new_row = pd.DataFrame({'class_name': [class_name]})
-        if 'class_id' in self.classes.columns:
-            next_id = int(self.classes['class_id'].max()) + 1
-            new_row.insert(0, 'class_id', next_id)
-
-        self.classes = pd.concat([self.classes, new_row], ignore_index=True)
-        self._save('classes.csv', self.classes)
-
-        self._log_change(
-            entity_type='class',
-            action='add',
-            entity_key=class_name,
-            payload={'class_name': class_name},
-            requested_by=requested_by,
-            status='applied',
-        )
+        new_row = {'class_name': class_name}
+
+        with self._transaction():
+            if 'class_id' in self.classes.columns:
+                new_row = {'class_id': self.storage.next_id('classes', 'class_id'), **new_row}
+
+            self._insert('classes', new_row)
+            self.classes = pd.concat([self.classes, pd.DataFrame([new_row])], ignore_index=True)
+            self._index_masters()
+            self._matrix_row(class_name)
+            self._derived.clear()
+
+            self._log_change(
+                entity_type='class',
+                action='add',
+                entity_key=class_name,
+                payload={'class_name': class_name},
+                requested_by=requested_by,
+                status='applied',
+            )
         print(f"  ✓ Added class: '{class_name}'")
         return True
 
@@ -286,35 +743,30 @@ class ACMConfig:
         if application_type not in VALID_APPLICATION_TYPES:
             raise ValueError(f"application_type must be one of {VALID_APPLICATION_TYPES}")
 
-        exists = (
-            (self.component_technology['component_name'] == component_name) &
-            (self.component_technology['technology_code'] == tech_code)
-        ).any()
-
-        if exists:
+        if (component_name, tech_code) in self._ct_pairs:
             print(f"  Assignment already exists: {component_name} — {tech_code}")
             return False
 
-        new_row = pd.DataFrame({
-            'component_name': [component_name],
-            'technology_code': [tech_code],
-            'application_type': [application_type],
-        })
-        self.component_technology = pd.concat([self.component_technology, new_row], ignore_index=True)
-        self._save('component_technology.csv', self.component_technology)
-
-        self._log_change(
-            entity_type='component_technology',
-            action='add',
-            entity_key=f"{component_name} → {tech_code}",
-            payload={
-                'component_name': component_name,
-                'technology_code': tech_code,
-                'application_type': application_type,
-            },
-            requested_by=requested_by,
-            status='applied',
-        )
+        new_row = {
+            'component_name': component_name,
+            'technology_code': tech_code,
+            'application_type': application_type,
+        }
+        with self._transaction():
+            self._insert('component_technology', new_row)
+            self.component_technology = pd.concat(
+                [self.component_technology, pd.DataFrame([new_row])], ignore_index=True)
+            self._index_component_technology()
+            self._matrix_on_component_technology(component_name, tech_code, None, application_type)
+
+            self._log_change(
+                entity_type='component_technology',
+                action='add',
+                entity_key=f"{component_name} → {tech_code}",
+                payload=new_row,
+                requested_by=requested_by,
+                status='applied',
+            )
         print(f"  ✓ Assigned {tech_code} ({application_type}) → '{component_name}'")
         return True
 
@@ -327,34 +779,29 @@ class ACMConfig:
         if new_application_type not in VALID_APPLICATION_TYPES:
             raise ValueError(f"application_type must be one of {VALID_APPLICATION_TYPES}")
 
-        mask = (
-            (self.component_technology['component_name'] == component_name) &
-            (self.component_technology['technology_code'] == tech_code)
-        )
-        if not mask.any():
+        old_type = self._ct_pairs.get((component_name, tech_code))
+        if old_type is None:
             raise ValueError(f"No assignment found: {component_name} — {tech_code}")
-
-        old_type = self.component_technology.loc[mask, 'application_type'].iloc[0]
         if old_type == new_application_type:
             print(f"  No change needed: already '{new_application_type}'")
             return False
 
-        self.component_technology.loc[mask, 'application_type'] = new_application_type
-        self._save('component_technology.csv', self.component_technology)
-
-        self._log_change(
-            entity_type='component_technology',
-            action='update',
-            entity_key=f"{component_name} → {tech_code}",
-            payload={
-                'component_name': component_name,
-                'technology_code': tech_code,
-                'old_application_type': old_type,
-                'new_application_type': new_application_type,
-            },
-            requested_by=requested_by,
-            status='applied',
-        )
+        with self._transaction():
+            self._set_application_type(component_name, tech_code, new_application_type)
+
+            self._log_change(
+                entity_type='component_technology',
+                action='update',
+                entity_key=f"{component_name} → {tech_code}",
+                payload={
+                    'component_name': component_name,
+                    'technology_code': tech_code,
+                    'old_application_type': old_type,
+                    'new_application_type': new_application_type,
+                },
+                requested_by=requested_by,
+                status='applied',
+            )
         print(f"  ✓ Updated {component_name} — {tech_code}: {old_type} → {new_application_type}")
         return True
 
@@ -372,14 +819,9 @@ class ACMConfig:
         if new_application_type not in VALID_APPLICATION_TYPES:
             raise ValueError(f"application_type must be one of {VALID_APPLICATION_TYPES}")
 
-        mask = (
-            (self.component_technology['component_name'] == component_name) &
-            (self.component_technology['technology_code'] == tech_code)
-        )
-        if not mask.any():
+        old_type = self._ct_pairs.get((component_name, tech_code))
+        if old_type is None:
             raise ValueError(f"No assignment found: {component_name} — {tech_code}")
-
-        old_type = self.component_technology.loc[mask, 'application_type'].iloc[0]
         if old_type == new_application_type:
             raise ValueError(f"No change: already '{new_application_type}'")
 
@@ -410,30 +852,26 @@ class ACMConfig:
         self._assert_class_exists(class_name)
         self._assert_component_exists(component_name)
 
-        exists = (
-            (self.class_component['class_name'] == class_name) &
-            (self.class_component['component_name'] == component_name)
-        ).any()
-
-        if exists:
+        if (class_name, component_name) in self._cc_pairs:
             print(f"  Assignment already exists: {class_name} ← {component_name}")
             return False
 
-        new_row = pd.DataFrame({
-            'class_name': [class_name],
-            'component_name': [component_name],
-        })
-        self.class_component = pd.concat([self.class_component, new_row], ignore_index=True)
-        self._save('class_component.csv', self.class_component)
-
-        self._log_change(
-            entity_type='class_component',
-            action='add',
-            entity_key=f"{class_name} ← {component_name}",
-            payload={'class_name': class_name, 'component_name': component_name},
-            requested_by=requested_by,
-            status='applied',
-        )
+        new_row = {'class_name': class_name, 'component_name': component_name}
+        with self._transaction():
+            self._insert('class_component', new_row)
+            self.class_component = pd.concat(
+                [self.class_component, pd.DataFrame([new_row])], ignore_index=True)
+            self._index_class_component()
+            self._matrix_on_class_component(class_name, component_name, +1)
+
+            self._log_change(
+                entity_type='class_component',
+                action='add',
+                entity_key=f"{class_name} ← {component_name}",
+                payload=new_row,
+                requested_by=requested_by,
+                status='applied',
+            )
         print(f"  ✓ Assigned '{component_name}' → class '{class_name}'")
         return True
 
@@ -480,11 +918,7 @@ class ACMConfig:
         self._assert_class_exists(class_name)
         self._assert_component_exists(component_name)
 
-        exists = (
-            (self.class_component['class_name'] == class_name) &
-            (self.class_component['component_name'] == component_name)
-        ).any()
-        if not exists:
+        if (class_name, component_name) not in self._cc_pairs:
             raise ValueError(f"Assignment not found: {class_name} ← {component_name}")
 
         log_id = self._log_change(
@@ -508,11 +942,7 @@ class ACMConfig:
         self._assert_component_exists(component_name)
         self._assert_tech_exists(tech_code)
 
-        exists = (
-            (self.component_technology['component_name'] == component_name) &
-            (self.component_technology['technology_code'] == tech_code)
-        ).any()
-        if not exists:
+        if (component_name, tech_code) not in self._ct_pairs:
             raise ValueError(f"Assignment not found: {component_name} — {tech_code}")
 
         log_id = self._log_change(
@@ -551,59 +981,75 @@ class ACMConfig:
                 f"and update_request can be approved."
             )
 
-        # Handle P\u2194S update requests
         if action == 'update_request':
-            mask = (
-                (self.component_technology['component_name'] == payload['component_name']) &
-                (self.component_technology['technology_code'] == payload['technology_code'])
-            )
-            self.component_technology.loc[mask, 'application_type'] = \
-                payload['new_application_type']
-            self._save('component_technology.csv', self.component_technology)
-            print(f"  \u2713 Applied update: {payload['component_name']} \u2014 "
-                  f"{payload['technology_code']}: "
-                  f"{payload['old_application_type']} \u2192 {payload['new_application_type']}")
+            # The assignment may have been removed since the request was filed
+            pair = (payload['component_name'], payload['technology_code'])
+            if pair not in self._ct_pairs:
+                raise ValueError(f"No assignment found: {pair[0]} — {pair[1]}")
+
+        with self._transaction():
+            # Handle P\u2194S update requests
+            if action == 'update_request':
+                self._set_application_type(payload['component_name'], payload['technology_code'],
+                                           payload['new_application_type'])
+                print(f"  \u2713 Applied update: {payload['component_name']} \u2014 "
+                      f"{payload['technology_code']}: "
+                      f"{payload['old_application_type']} \u2192 {payload['new_application_type']}")
+                self._update_log_status(log_id, 'approved', reviewed_by)
+                return True
+
+            # Execute the deletion — the entity, its junction rows and the log
+            # status change commit together
+            if entity_type == 'component':
+                name = payload['component_name']
+                for class_name in self._cc_by_component.get(name, ()):
+                    self._matrix_on_class_component(class_name, name, -1)
+                self._delete('components', {'component_name': name})
+                self._delete('component_technology', {'component_name': name})
+                self._delete('class_component', {'component_name': name})
+                self.components = self.components[self.components['component_name'] != name]
+                self.component_technology = self.component_technology[
+                    self.component_technology['component_name'] != name]
+                self.class_component = self.class_component[
+                    self.class_component['component_name'] != name]
+                self._build_indexes()
+                print(f"  ✓ Removed component '{name}' and all its assignments")
+
+            elif entity_type == 'class_component':
+                pair = (payload['class_name'], payload['component_name'])
+                self._delete('class_component',
+                             {'class_name': pair[0], 'component_name': pair[1]})
+                mask = (
+                    (self.class_component['class_name'] == pair[0]) &
+                    (self.class_component['component_name'] == pair[1])
+                )
+                self.class_component = self.class_component[~mask]
+                if pair in self._cc_pairs:
+                    self._matrix_on_class_component(*pair, -1)
+                self._index_class_component()
+                print(f"  ✓ Removed class↔component assignment: "
+                      f"{payload['class_name']} ← {payload['component_name']}")
+
+            elif entity_type == 'component_technology':
+                component_name, tech_code = payload['component_name'], payload['technology_code']
+                self._delete('component_technology',
+                             {'component_name': component_name, 'technology_code': tech_code})
+                mask = (
+                    (self.component_technology['component_name'] == component_name) &
+                    (self.component_technology['technology_code'] == tech_code)
+                )
+                old_type = self._ct_pairs.get((component_name, tech_code))
+                self.component_technology = self.component_technology[~mask]
+                self._index_component_technology()
+                self._matrix_on_component_technology(component_name, tech_code, old_type, None)
+                print(f"  ✓ Removed component↔technology assignment: "
+                      f"{component_name} — {tech_code}")
+
+            else:
+                raise ValueError(f"Unknown entity_type for removal: '{entity_type}'")
+
+            # Update log entry
             self._update_log_status(log_id, 'approved', reviewed_by)
-            return True
-
-        # Execute the deletion
-        if entity_type == 'component':
-            name = payload['component_name']
-            self.components = self.components[self.components['component_name'] != name]
-            self.component_technology = self.component_technology[
-                self.component_technology['component_name'] != name]
-            self.class_component = self.class_component[
-                self.class_component['component_name'] != name]
-            self._save('components.csv', self.components)
-            self._save('component_technology.csv', self.component_technology)
-            self._save('class_component.csv', self.class_component)
-            print(f"  ✓ Removed component '{name}' and all its assignments")
-
-        elif entity_type == 'class_component':
-            mask = (
-                (self.class_component['class_name'] == payload['class_name']) &
-                (self.class_component['component_name'] == payload['component_name'])
-            )
-            self.class_component = self.class_component[~mask]
-            self._save('class_component.csv', self.class_component)
-            print(f"  ✓ Removed class↔component assignment: "
-                  f"{payload['class_name']} ← {payload['component_name']}")
-
-        elif entity_type == 'component_technology':
-            mask = (
-                (self.component_technology['component_name'] == payload['component_name']) &
-                (self.component_technology['technology_code'] == payload['technology_code'])
-            )
-            self.component_technology = self.component_technology[~mask]
-            self._save('component_technology.csv', self.component_technology)
-            print(f"  ✓ Removed component↔technology assignment: "
-                  f"{payload['component_name']} — {payload['technology_code']}")
-
-        else:
-            raise ValueError(f"Unknown entity_type for removal: '{entity_type}'")
-
-        # Update log entry
-        self._update_log_status(log_id, 'approved', reviewed_by)
         return True
 
     def reject_removal(self, log_id: int, reviewed_by: str) -> bool:
@@ -695,10 +1141,24 @@ class ACMConfig:
         print("="*60)
         print(f"\n  Technologies : {', '.join(self.technology_codes)}")
         print(f"  Config dir   : {self.config_dir.resolve()}")
+        print(f"  Storage      : {type(self.storage).__name__} ({self.storage.location})")
         print()
 
     # ── Export (backwards compatibility for pipeline) ─────────────────────────
 
+    def export_csv(self, output_dir: str | Path | None = None) -> Path:
+        """
+        Write every config table as ``<table>.csv`` (the CSV backend's layout)
+        to ``output_dir`` (default: the config directory). With SQLite storage
+        this keeps the CSVs available for Excel review and git diffs.
+        """
+        output_dir = Path(output_dir or self.config_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for table in CONFIG_TABLES:
+            _write_csv(getattr(self, table), output_dir / f'{table}.csv')
+        print(f"✓ Exported {len(CONFIG_TABLES)} config tables → {output_dir}")
+        return output_dir
+
     def export_comp_xref_tech(self, output_file: str = 'comp_xref_tech_export.csv') -> pd.DataFrame:
         """
         Export component_technology in the legacy cross-tab format
@@ -739,45 +1199,83 @@ class ACMConfig:
 
     # ── Internal helpers ──────────────────────────────────────────────────────
 
-    def _save(self, filename: str, df: pd.DataFrame):
-        """Write a DataFrame back to its CSV file."""
-        df.to_csv(self.config_dir / filename, index=False)
-
-    def _next_log_id(self) -> int:
-        if self.change_log.empty or 'log_id' not in self.change_log.columns:
-            return 1
-        valid = self.change_log['log_id'].dropna()
-        return int(valid.max()) + 1 if not valid.empty else 1
+    @contextmanager
+    def _transaction(self):
+        """
+        One storage transaction. If it fails, the in-memory tables (which may
+        hold part of the rolled-back change) are reloaded from storage.
+        """
+        try:
+            with self.storage.transaction():
+                yield
+        except BaseException:
+            self._load_all()
+            raise
+
+    def _insert(self, table: str, row: dict):
+        self.storage.insert(table, row)
+        if table != 'change_log':
+            self.version += 1
+
+    def _update(self, table: str, where: dict, values: dict):
+        self.storage.update(table, where, values)
+        if table != 'change_log':
+            self.version += 1
+
+    def _delete(self, table: str, where: dict):
+        self.storage.delete(table, where)
+        if table != 'change_log':
+            self.version += 1
+
+    def _set_application_type(self, component_name: str, tech_code: str, new_type: str):
+        """Change one component↔technology row's application_type (storage, indexes, matrix)."""
+        old_type = self._ct_pairs.get((component_name, tech_code))
+        self._update('component_technology',
+                     {'component_name': component_name, 'technology_code': tech_code},
+                     {'application_type': new_type})
+        mask = (
+            (self.component_technology['component_name'] == component_name) &
+            (self.component_technology['technology_code'] == tech_code)
+        )
+        self.component_technology.loc[mask, 'application_type'] = new_type
+        self._index_component_technology()
+        self._matrix_on_component_technology(component_name, tech_code, old_type, new_type)
 
     def _log_change(self, entity_type: str, action: str, entity_key: str,
                     payload: dict, requested_by: str, status: str,
                     notes: str = '') -> int:
         """Append one row to the change log and persist it. Returns the new log_id."""
-        log_id = self._next_log_id()
-        new_row = pd.DataFrame([{
-            'log_id': log_id,
-            'timestamp': datetime.now(timezone.utc).isoformat(),
-            'entity_type': entity_type,
-            'action': action,
-            'entity_key': entity_key,
-            'payload': json.dumps(payload),
-            'notes': notes,
-            'requested_by': requested_by,
-            'status': status,
-            'reviewed_by': '',
-            'reviewed_at': '',
-        }])
-        self.change_log = pd.concat([self.change_log, new_row], ignore_index=True)
-        self._save('change_log.csv', self.change_log)
+        with self._transaction():
+            log_id = self.storage.next_id('change_log', 'log_id')
+            new_row = {
+                'log_id': log_id,
+                'timestamp': datetime.now(timezone.utc).isoformat(),
+                'entity_type': entity_type,
+                'action': action,
+                'entity_key': entity_key,
+                'payload': json.dumps(payload),
+                'notes': notes,
+                'requested_by': requested_by,
+                'status': status,
+                'reviewed_by': '',
+                'reviewed_at': '',
+            }
+            self._insert('change_log', new_row)
+            self.change_log = pd.concat([self.change_log, pd.DataFrame([new_row])],
+                                        ignore_index=True)
         return log_id
 
     def _update_log_status(self, log_id: int, status: str, reviewed_by: str):
         """Update status, reviewed_by, and reviewed_at for a log entry."""
+        values = {
+            'status': status,
+            'reviewed_by': reviewed_by,
+            'reviewed_at': datetime.now(timezone.utc).isoformat(),
+        }
+        self._update('change_log', {'log_id': log_id}, values)
         mask = self.change_log['log_id'] == log_id
-        self.change_log.loc[mask, 'status'] = status
-        self.change_log.loc[mask, 'reviewed_by'] = reviewed_by
-        self.change_log.loc[mask, 'reviewed_at'] = datetime.now(timezone.utc).isoformat()
-        self._save('change_log.csv', self.change_log)
+        for col, value in values.items():
+            self.change_log.loc[mask, col] = value
 
     def _get_pending_request(self, log_id: int) -> pd.Series:
         """Fetch a pending log row, raising clearly if not found or not pending."""
@@ -791,3 +1289,38 @@ class ACMConfig:
                 f"Only pending requests can be approved or rejected."
             )
         return row
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        prog='python acm_config.py',
+        description="Move the ACM config between the CSV files and the SQLite store.")
+    parser.add_argument('--config-dir', default=str(DEFAULT_CONFIG_DIR),
+                        help="directory holding the config CSVs")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument('--to-sqlite', action='store_true',
+                      help=f"import the CSVs into <config-dir>/{SQLITE_FILENAME}; "
+                           f"ACMConfig uses the database from then on")
+    mode.add_argument('--to-csv', metavar='DIR', nargs='?', const='',
+                      help="export the current config as CSVs (default: into config-dir)")
+    parser.add_argument('--force', action='store_true',
+                        help="with --to-sqlite, replace an existing database")
+    args = parser.parse_args(argv)
+
+    config_dir = Path(args.config_dir)
+    if args.to_sqlite:
+        db_path = config_dir / SQLITE_FILENAME
+        if db_path.exists() and not args.force:
+            parser.error(f"{db_path} already exists — it may hold edits newer than the "
+                         f"CSVs; export it with --to-csv first, or pass --force")
+        storage = SQLiteStorage(db_path)
+        storage.import_csv(config_dir)
+        storage.close()
+    else:
+        ACMConfig(config_dir).export_csv(args.to_csv or None)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,14 @@
+/* Asset Dimension: one row per active asset — attributes + rank, shared by the
+   pipeline, the Asset Rank page and the dashboard (joined on ASSET_KEY) */
+
+SELECT A.ASSETUID AS ASSET_KEY,
+A.ASSETNUM,
+A.DESCRIPTION AS ASSET_DESC,
+CL.DESCRIPTION AS ASSET_CLASS,
+LEFT(A.LOCATION,3) AS ASSET_DEPT,
+SPEC.ALNVALUE AS RANK
+FROM MAXIMO.ASSET A
+JOIN MAXIMO.CLASSSTRUCTURE CL ON A.CLASSSTRUCTUREID = CL.CLASSSTRUCTUREID 
+LEFT JOIN MAXIMO.ASSETSPEC SPEC ON SPEC.ASSETNUM = A.ASSETNUM AND SPEC.SITEID = A.SITEID
+     AND SPEC.ASSETATTRID = 'A8539' AND SPEC.ALNVALUE IN ('S','A','B','C')
+WHERE A.SITEID = ? AND A.STATUS = 'A-ACTIVE'
@@ -8,5 +8,5 @@ FROM MAXIMO.ASSETSPEC SPEC
 JOIN MAXIMO.ASSET A ON A.ASSETNUM = SPEC.ASSETNUM AND SPEC.SITEID = A.SITEID
 JOIN MAXIMO.CLASSSTRUCTURE CLASS ON A.CLASSSTRUCTUREID = CLASS.CLASSSTRUCTUREID
 WHERE SPEC.ASSETATTRID = 'A8539'
-AND SPEC.SITEID = 'HMA' 
+AND SPEC.SITEID = ? 
 AND SPEC.ALNVALUE IN ('S','A','B','C')
\ No newline at end of file
@@ -0,0 +1,16 @@
+/* Asset Dimension — delta: rows changed since the watermark (first parameter = SITEID, the rest = last ROW_STAMP) */
+/* A deleted ASSETSPEC rank row advances no ROWSTAMP here; the RANK check at reconcile re-pulls those assets (acm/incremental.py) */
+
+SELECT A.ASSETUID AS ASSET_KEY,
+A.ASSETNUM,
+A.DESCRIPTION AS ASSET_DESC,
+CL.DESCRIPTION AS ASSET_CLASS,
+LEFT(A.LOCATION,3) AS ASSET_DEPT,
+SPEC.ALNVALUE AS RANK,
+GREATEST(A.ROWSTAMP, CL.ROWSTAMP, COALESCE(SPEC.ROWSTAMP, 0)) AS ROW_STAMP
+FROM MAXIMO.ASSET A
+JOIN MAXIMO.CLASSSTRUCTURE CL ON A.CLASSSTRUCTUREID = CL.CLASSSTRUCTUREID 
+LEFT JOIN MAXIMO.ASSETSPEC SPEC ON SPEC.ASSETNUM = A.ASSETNUM AND SPEC.SITEID = A.SITEID
+     AND SPEC.ASSETATTRID = 'A8539' AND SPEC.ALNVALUE IN ('S','A','B','C')
+WHERE A.SITEID = ? AND A.STATUS = 'A-ACTIVE'
+AND (A.ROWSTAMP > ? OR CL.ROWSTAMP > ? OR SPEC.ROWSTAMP > ?)
@@ -0,0 +1,17 @@
+/*Assets with Meters, per asset — delta: assets with any row changed since the watermark (first parameter = SITEID, the rest = last ROW_STAMP)*/
+/* Removing one of an asset's meters advances no remaining ROWSTAMP; the METER_COUNT check at reconcile re-pulls those assets (acm/incremental.py) */
+
+SELECT AM.ASSETNUM,
+COUNT(AM.METERNAME) AS METER_COUNT,
+MAX(AM.LASTREADINGDATE) AS MAX_LASTREADING_DATE,
+SUM(CASE WHEN AM.LASTREADINGDATE IS NULL THEN 1 ELSE 0 END) AS NULL_READING_COUNT,
+A.DESCRIPTION AS ASSET_DESC,
+CL.DESCRIPTION AS CLASS,
+LEFT(A.LOCATION,3) AS DEPT,
+MAX(GREATEST(AM.ROWSTAMP, A.ROWSTAMP, M.ROWSTAMP, COALESCE(CL.ROWSTAMP, 0))) AS ROW_STAMP
+FROM MAXIMO.ASSETMETER AM JOIN MAXIMO.ASSET A ON AM.ASSETNUM = A.ASSETNUM AND AM.SITEID = A.SITEID
+JOIN MAXIMO.METER M ON AM.METERNAME = M.METERNAME
+LEFT JOIN MAXIMO.CLASSSTRUCTURE CL ON A.CLASSSTRUCTUREID = CL.CLASSSTRUCTUREID 
+WHERE A.SITEID = ? AND A.STATUS = 'A-ACTIVE'
+GROUP BY AM.ASSETNUM, A.DESCRIPTION, CL.DESCRIPTION, LEFT(A.LOCATION,3)
+HAVING MAX(GREATEST(AM.ROWSTAMP, A.ROWSTAMP, M.ROWSTAMP, COALESCE(CL.ROWSTAMP, 0))) > ?
@@ -0,0 +1,23 @@
+/*Assets with Meters — delta: rows changed since the watermark (first parameter = SITEID, the rest = last ROW_STAMP)*/
+
+SELECT AM.ASSETNUM,
+A.DESCRIPTION AS ASSET_DESC,
+AM.METERNAME ,
+M.DESCRIPTION METERDESCRIPTION,
+M.METERTYPE ,
+AM.AVGCALCMETHOD ,
+AM.ROLLDOWNSOURCE ,
+AM.REMARKS ,
+AM.POINTNUM ,
+AM.LASTREADING ,
+AM.LASTREADINGDATE AS LASTREADING_DATE,
+AM.CHANGEBY ,
+AM.LASTREADINGINSPCTR,
+CL.DESCRIPTION AS CLASS,
+LEFT(A.LOCATION,3) AS DEPT,
+GREATEST(AM.ROWSTAMP, A.ROWSTAMP, M.ROWSTAMP, COALESCE(CL.ROWSTAMP, 0)) AS ROW_STAMP
+FROM MAXIMO.ASSETMETER AM JOIN MAXIMO.ASSET A ON AM.ASSETNUM = A.ASSETNUM AND AM.SITEID = A.SITEID
+JOIN MAXIMO.METER M ON AM.METERNAME = M.METERNAME
+LEFT JOIN MAXIMO.CLASSSTRUCTURE CL ON A.CLASSSTRUCTUREID = CL.CLASSSTRUCTUREID 
+WHERE A.SITEID = ? AND A.STATUS = 'A-ACTIVE'
+AND (AM.ROWSTAMP > ? OR A.ROWSTAMP > ? OR M.ROWSTAMP > ? OR CL.ROWSTAMP > ?)
@@ -0,0 +1,15 @@
+/* ACM Assets Dimension Table: from Routes — delta: rows changed since the watermark (first parameter = SITEID, the rest = last ROW_STAMP) */ 
+SELECT R.ROUTE ,
+R.DESCRIPTION AS ROUTE_DESC,
+RS.ASSETNUM ,
+A.DESCRIPTION AS ASSET_DESC,
+CL.DESCRIPTION AS CLASS,
+LEFT(A.LOCATION, 3) DEPT,
+GREATEST(RS.ROWSTAMP, R.ROWSTAMP, A.ROWSTAMP, COALESCE(CL.ROWSTAMP, 0)) AS ROW_STAMP
+FROM MAXIMO.ROUTE_STOP RS 
+LEFT JOIN MAXIMO.ROUTES R ON R.ROUTE = RS.ROUTE AND R.SITEID =RS.SITEID 
+LEFT JOIN MAXIMO.ASSET A ON RS.ASSETNUM = A.ASSETNUM AND RS.SITEID = A.SITEID 
+LEFT JOIN MAXIMO.CLASSSTRUCTURE CL ON A.CLASSSTRUCTUREID = CL.CLASSSTRUCTUREID 
+WHERE REGEXP_LIKE(R.DESCRIPTION, '^[A-Z0-9]+_[A-Z0-9]+_[A-Z0-9]+ - .+') 
+AND RS.SITEID = ? AND A.STATUS = 'A-ACTIVE'
+AND (RS.ROWSTAMP > ? OR R.ROWSTAMP > ? OR A.ROWSTAMP > ? OR CL.ROWSTAMP > ?)
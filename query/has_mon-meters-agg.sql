@@ -0,0 +1,18 @@
+-- Purpose: Meters on assets in a certain area, aggregated to one row per asset
+-- (server-side twin of has_mon-meters.sql; per-meter rows only for drill-down)
+
+
+/*Assets with Meters — meter count, latest reading and null-reading count per asset*/
+
+SELECT AM.ASSETNUM,
+COUNT(AM.METERNAME) AS METER_COUNT,
+MAX(AM.LASTREADINGDATE) AS MAX_LASTREADING_DATE,
+SUM(CASE WHEN AM.LASTREADINGDATE IS NULL THEN 1 ELSE 0 END) AS NULL_READING_COUNT,
+A.DESCRIPTION AS ASSET_DESC,
+CL.DESCRIPTION AS CLASS,
+LEFT(A.LOCATION,3) AS DEPT
+FROM MAXIMO.ASSETMETER AM JOIN MAXIMO.ASSET A ON AM.ASSETNUM = A.ASSETNUM AND AM.SITEID = A.SITEID
+JOIN MAXIMO.METER M ON AM.METERNAME = M.METERNAME
+LEFT JOIN MAXIMO.CLASSSTRUCTURE CL ON A.CLASSSTRUCTUREID = CL.CLASSSTRUCTUREID 
+WHERE A.SITEID = ? AND A.STATUS = 'A-ACTIVE'
+GROUP BY AM.ASSETNUM, A.DESCRIPTION, CL.DESCRIPTION, LEFT(A.LOCATION,3)
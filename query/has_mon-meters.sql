@@ -24,6 +24,6 @@ LEFT(A.LOCATION,3) AS DEPT
 FROM MAXIMO.ASSETMETER AM JOIN MAXIMO.ASSET A ON AM.ASSETNUM = A.ASSETNUM AND AM.SITEID = A.SITEID
 JOIN MAXIMO.METER M ON AM.METERNAME = M.METERNAME
 LEFT JOIN MAXIMO.CLASSSTRUCTURE CL ON A.CLASSSTRUCTUREID = CL.CLASSSTRUCTUREID 
-WHERE A.SITEID = 'HMA' AND A.STATUS = 'A-ACTIVE'
+WHERE A.SITEID = ? AND A.STATUS = 'A-ACTIVE'
 
 
@@ -20,22 +20,66 @@ st.set_page_config(
     layout="wide"
 )
 
+from acm.artifacts import ArtifactStore
+from acm.coverage import judge_column, overall_status, coverage_cube, cube_status_counts
+from acm.dimension import KEY_COL, join_dimension, load_dimension
+from acm.extract import DEFAULT_SITE
+
+def report_tech_codes(report: pd.DataFrame) -> list[str]:
+    """Technology codes present in the report, from its *_judge columns"""
+    return [col.replace('_judge', '').upper()
+            for col in report.columns if col.endswith('_judge')]
+
+# Columns the dashboard displays (plus every *_judge column); nothing else is mapped
+REPORT_COLS = ['ASSET_KEY', 'ASSETNUM', 'ASSET_DESC', 'ASSET_CLASS', 'ASSET_DEPT', 'overall_status']
+
+def published_mtime() -> float:
+    """Modification time of the published report (cache key: a re-publish reloads)"""
+    return ArtifactStore().mapped_path('coverage_report', DEFAULT_SITE).stat().st_mtime
+
 # Load coverage report
-@st.cache_data
-def load_coverage_data():
-    """Load the coverage report"""
-    return pd.read_pickle('data/coverage_report.pkl')
+@st.cache_resource(max_entries=1)
+def load_coverage_data(mtime: float):
+    """
+    Memory-map the site's published coverage report (overall_status is
+    precomputed by the pipeline) and convert only the displayed columns.
+    The file is read through the OS page cache; the converted frame
+    (categoricals) is private to this process, and cache_resource hands each
+    rerun the same frame instead of a copy.
+    """
+    store = ArtifactStore()
+    available = store.mapped_columns('coverage_report', site=DEFAULT_SITE)
+    columns = [col for col in available if col in REPORT_COLS or col.endswith('_judge')]
+    report = store.map_frame('coverage_report', columns, site=DEFAULT_SITE)
+    if 'overall_status' not in report.columns:
+        # Reports written before overall_status was persisted
+        report['overall_status'] = overall_status(report, report_tech_codes(report))
+
+    # Asset rank from the site's asset dimension, joined by ASSET_KEY
+    # (reports written before ASSET_KEY was exported have no rank)
+    dimension = load_dimension(DEFAULT_SITE)
+    if dimension is not None and KEY_COL in report.columns:
+        report = join_dimension(report, dimension, ['RANK'])
+
+    # Rename ALL FA% to Facilities
+    report['ASSET_DEPT'] = report['ASSET_DEPT'].str.replace(r'^FA.+', 'FAC', regex=True)
+    return report
+
+@st.cache_data(max_entries=1)
+def load_coverage_cube(mtime: float):
+    """Asset counts by dept × class × status × tech × judge — every chart is a slice"""
+    report = load_coverage_data(mtime)
+    return coverage_cube(report, report_tech_codes(report))
 
 try:
-    coverage_data = load_coverage_data()
+    mtime = published_mtime()
+    coverage_data = load_coverage_data(mtime)
+    cube = load_coverage_cube(mtime)
 except FileNotFoundError:
-    st.error("⚠️ Coverage report not found at 'output/coverage_report.csv'")
+    st.error(f"⚠️ Coverage report not found at '{ArtifactStore().mapped_path('coverage_report', DEFAULT_SITE)}'")
     st.info("Please run your QMD analysis first to generate the coverage report.")
     st.stop()
 
-# Rename ALL FA% to Facilities 
-coverage_data['ASSET_DEPT'] = coverage_data['ASSET_DEPT'].str.replace(r'^FA.+', 'FAC', regex=True)
-
 from acm_config import ACMConfig
 
 @st.cache_resource
@@ -46,8 +90,10 @@ def load_acm_config():
 config = load_acm_config()
 
 # Get technology codes from judge columns
-tech_codes = [col.replace('_judge', '').upper() 
-              for col in coverage_data.columns if col.endswith('_judge')]
+tech_codes = report_tech_codes(coverage_data)
+
+# Asset counts per department × overall status (slice of the cube)
+dept_status = cube_status_counts(cube, ['ASSET_DEPT'])
 
 # Header
 st.title("📊 ACM Coverage Dashboard")
@@ -63,7 +109,7 @@ st.header("Department Coverage Overview")
 with st.sidebar:
     st.header("Chart Filters")
     
-    all_departments = sorted(coverage_data['ASSET_DEPT'].unique())
+    all_departments = sorted(dept_status.index)
     
     st.markdown("### Departments to Display")
     st.caption("Uncheck departments to hide from the overview chart")
@@ -89,40 +135,13 @@ with st.sidebar:
 
 st.markdown("---")
 
-# Calculate department-level metrics for FILTERED departments
-dept_metrics = []
-
-for dept in departments_to_show:
-    dept_data_temp = coverage_data[coverage_data['ASSET_DEPT'] == dept]
-    
-    # Classify each asset
-    def classify_asset(row):
-        judgments = [row[f'{tech.lower()}_judge'] for tech in tech_codes]
-        if 'R' in judgments:
-            return 'RED'
-        if 'G' in judgments:
-            return 'GREEN'
-        if 'Y' in judgments:
-            return 'YELLOW'
-        return 'N'
-    
-    dept_data_temp['overall_status'] = dept_data_temp.apply(classify_asset, axis=1)
-    
-    # Count status distribution
-    total_red = (dept_data_temp['overall_status'] == 'RED').sum()
-    total_green = (dept_data_temp['overall_status'] == 'GREEN').sum()
-    total_yellow = (dept_data_temp['overall_status'] == 'YELLOW').sum()
-    total_na = (dept_data_temp['overall_status'] == 'N').sum()
-    
-    dept_metrics.append({
-        'Department': dept,
-        'RED': total_red,
-        'GREEN': total_green,
-        'YELLOW': total_yellow,
-        'N': total_na,
-    })
-
-dept_metrics_df = pd.DataFrame(dept_metrics)
+# Department-level metrics for FILTERED departments
+dept_metrics_df = (
+    dept_status.reindex(departments_to_show, fill_value=0)
+    .rename_axis('Department')
+    .reset_index()
+)
+dept_metrics_df.columns.name = None
 
 # Add sorting options with color-based ordering
 col1, col2 = st.columns([3, 1])
@@ -207,41 +226,19 @@ st.markdown("---")
 # Department selector
 selected_dept = st.selectbox(
     "Select Department",
-    options=sorted(coverage_data['ASSET_DEPT'].unique())
+    options=sorted(dept_status.index)
 )
 
 st.subheader(f"Department: {selected_dept}")
 
-dept_data = coverage_data[coverage_data['ASSET_DEPT'] == selected_dept]
-st.markdown(f"**{len(dept_data):,} assets** in this department")
+# Count assets in each category (one overall status per asset)
+dept_status_counts = dept_status.loc[selected_dept]
+dept_red = dept_status_counts['RED']
+dept_green = dept_status_counts['GREEN']
+dept_yellow = dept_status_counts['YELLOW']
+dept_na = dept_status_counts['N']
 
-# Classify each asset into ONE category based on overall status
-def classify_asset(row):
-    """Classify asset based on all its technology judgments"""
-    judgments = [row[f'{tech.lower()}_judge'] for tech in tech_codes]
-    
-    # If ANY red → Critical Gap
-    if 'R' in judgments:
-        return 'RED'
-    
-    # If ANY green (and no red) → Covered
-    if 'G' in judgments:
-        return 'GREEN'
-    
-    # If ANY yellow (and no red/green) → Partially Montiored
-    if 'Y' in judgments:
-        return 'YELLOW'
-    
-    # If ALL N → Not Applicable
-    return 'N'
-
-dept_data['overall_status'] = dept_data.apply(classify_asset, axis=1)
-
-# Count assets in each category
-dept_red = (dept_data['overall_status'] == 'RED').sum()
-dept_green = (dept_data['overall_status'] == 'GREEN').sum()
-dept_yellow = (dept_data['overall_status'] == 'YELLOW').sum()
-dept_na = (dept_data['overall_status'] == 'N').sum()
+st.markdown(f"**{dept_status_counts.sum():,} assets** in this department")
 
 # Create pie chart for selected department
 labels = []
@@ -293,28 +290,11 @@ st.markdown("---")
 
 st.header("Asset Class Breakdown")
 
-# Calculate asset class metrics for the selected department
-class_status_metrics = []
-
-for asset_class in dept_data['ASSET_CLASS'].dropna().unique():
-    class_data = dept_data[dept_data['ASSET_CLASS'] == asset_class]
-    
-    # Count assets in each status for this class
-    red_count = (class_data['overall_status'] == 'RED').sum()
-    green_count = (class_data['overall_status'] == 'GREEN').sum()
-    yellow_count = (class_data['overall_status'] == 'YELLOW').sum()
-    na_count = (class_data['overall_status'] == 'N').sum()
-    
-    class_status_metrics.append({
-        'Asset_Class': asset_class,
-        'RED': red_count,
-        'GREEN': green_count,
-        'YELLOW': yellow_count,
-        'N': na_count,
-        'Total': len(class_data)
-    })
-
-class_metrics_df = pd.DataFrame(class_status_metrics)
+# Asset class metrics for the selected department (slice of the cube)
+class_metrics_df = cube_status_counts(cube[cube['ASSET_DEPT'] == selected_dept], ['ASSET_CLASS'])
+class_metrics_df['Total'] = class_metrics_df.sum(axis=1)
+class_metrics_df = class_metrics_df.rename_axis('Asset_Class').reset_index()
+class_metrics_df.columns.name = None
 
 # Create 2x2 grid for 4-block view
 col1, col2 = st.columns(2)
@@ -451,7 +431,7 @@ st.markdown("---")
 st.header("Asset Detail View")
 
 # Get list of asset classes in selected department
-asset_classes_in_dept = sorted(dept_data['ASSET_CLASS'].dropna().unique())
+asset_classes_in_dept = sorted(class_metrics_df['Asset_Class'])
 
 # Asset class selector
 selected_class = st.selectbox(
@@ -509,25 +489,40 @@ if selected_class:
                 use_container_width=True,
                 hide_index=True
             )
-            
+
+            # Class-level rollup straight from the config's class × tech matrix
+            class_matrix = config.get_class_tech_matrix().set_index('ASSET_CLASS')
+            if selected_class in class_matrix.index:
+                class_flags = class_matrix.loc[selected_class]
+                needs_techs = [t for t in config.technology_codes if class_flags[f'NEEDS_{t}'] == 'Y']
+                use_techs = [t for t in config.technology_codes if class_flags[f'USE_{t}'] == 'Y']
+                st.markdown(
+                    f"**Class NEEDS:** {', '.join(needs_techs) or '—'} &nbsp;|&nbsp; "
+                    f"**Class can USE:** {', '.join(use_techs) or '—'}"
+                )
+
             st.caption("P = Primary (NEEDS monitoring) | S = Secondary (CAN USE for monitoring)")
         else:
             st.info("No technology requirements configured for this asset class.")
     
     st.markdown("---")
 
-    class_assets = dept_data[dept_data['ASSET_CLASS'] == selected_class].copy()
+    class_assets = coverage_data[
+        (coverage_data['ASSET_DEPT'] == selected_dept) &
+        (coverage_data['ASSET_CLASS'] == selected_class)
+    ].copy()
     
     st.subheader(f"Assets in {selected_class}")
     st.markdown(f"**{len(class_assets)} assets**")
     
     # Build display table with colored status boxes
-    display_cols = ['ASSETNUM', 'ASSET_DESC'] + [f'{tech.lower()}_judge' for tech in tech_codes]
+    rank_cols = ['RANK'] if 'RANK' in class_assets.columns else []
+    display_cols = ['ASSETNUM', 'ASSET_DESC'] + rank_cols + [judge_column(tech) for tech in tech_codes]
     
     asset_display = class_assets[display_cols].copy()
     
     # Rename judge columns to just tech codes
-    rename_dict = {f'{tech.lower()}_judge': tech for tech in tech_codes}
+    rename_dict = {judge_column(tech): tech for tech in tech_codes}
     asset_display = asset_display.rename(columns=rename_dict)
     
     # Style the dataframe
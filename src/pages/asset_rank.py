@@ -1,16 +1,22 @@
 """
 Asset Rank Page
-Browse and filter ranked assets from Maximo asset_rank query.
-Loads from cached pickle; refresh button re-runs the query.
+Browse and filter ranked assets from the shared Maximo asset dimension.
+Loads from cached pickle; refresh button re-runs the query in the background
+(one shared run for all sessions) while the cached data stays browsable.
 """
 
 import streamlit as st
-import pandas as pd
-import pyodbc
-import os
+import sys
 from pathlib import Path
 from datetime import datetime
-from dotenv import load_dotenv, find_dotenv
+
+# Project root on the path for the acm package
+sys.path.insert(0, '.')
+
+from acm.dimension import dimension_path, load_dimension
+from acm.extract import DEFAULT_SITE, EXTRACTS
+from acm.maximo import MaximoClient
+from acm.refresh import RefreshJob, atomic_to_pickle, DONE, FAILED
 
 # ── Page config ──────────────────────────────────────────────────────────────
 st.set_page_config(
@@ -20,13 +26,21 @@ st.set_page_config(
 )
 
 # ── Paths & credentials ───────────────────────────────────────────────────────
-PICKLE_PATH = Path('data/asset_rank.pkl')
-SQL_PATH    = Path('query/asset_rank.sql')
+# Same dimension file the pipeline's export stage writes for this site
+PICKLE_PATH = dimension_path(DEFAULT_SITE)
+SQL_PATH    = Path(EXTRACTS['asset_dim']['sql'])
+
+
+@st.cache_resource
+def get_maximo() -> MaximoClient:
+    """Pooled Maximo client shared across reruns and sessions (credentials from .env)."""
+    return MaximoClient.from_env()
+
 
-load_dotenv(find_dotenv())
-DSN      = os.getenv('MAXIMO_DSN')
-USER     = os.getenv('MAXIMO_USER')
-PASSWORD = os.getenv('MAXIMO_PASS')
+@st.cache_resource
+def get_refresh_job() -> RefreshJob:
+    """One refresh job per server process — concurrent clicks share its run."""
+    return RefreshJob('asset_rank')
 
 # ── Rank color map ────────────────────────────────────────────────────────────
 # S → A → B → C, highest to lowest criticality
@@ -42,28 +56,47 @@ def rank_cell_style(val):
     return f'background-color: {color}; color: black; font-weight: bold; text-align: center;'
 
 # ── Query runner ──────────────────────────────────────────────────────────────
-def run_asset_rank_query() -> pd.DataFrame:
-    """Connect to Maximo and execute asset_rank.sql."""
+def run_asset_rank_query(job: RefreshJob, maximo: MaximoClient) -> int:
+    """Background refresh: execute asset-dimension.sql and swap in the new pickle."""
     if not SQL_PATH.exists():
         raise FileNotFoundError(f"SQL script not found: {SQL_PATH}")
 
-    conn  = pyodbc.connect(f"DSN={DSN};UID={USER};PWD={PASSWORD}")
-    query = SQL_PATH.read_text()
-    df    = pd.read_sql(query, conn)
-    conn.close()
+    # Same site and query as the pipeline's dimension extract; typed per fetched
+    # chunk by the asset-dimension schema (acm/schema.py)
+    job.update("Running query against Maximo…")
+    df = maximo.run_query_from_file(
+        SQL_PATH, (DEFAULT_SITE,),
+        progress=lambda rows: job.update(f"Fetched {rows:,} rows…", rows),
+    )
+
+    # Readers see the old pickle until the new one is complete
+    job.update("Saving…", len(df))
+    atomic_to_pickle(df, PICKLE_PATH)
+    return len(df)
 
-    # Consistent dtypes (mirrors asset_rank.py)
-    for col in ['ASSETNUM', 'ASSET_DESC', 'ASSET_CLASS', 'ASSET_DEPT', 'RANK']:
-        if col in df.columns:
-            df[col] = df[col].astype('category')
 
-    return df
+@st.fragment(run_every=2)
+def refresh_status(loaded_mtime: float | None):
+    """Polls the shared job; reloads the page once a newer pickle is in place."""
+    status = get_refresh_job().status()
+    if status.running:
+        st.info(f"🔄 {status.message} ({status.elapsed_seconds:.0f}s)")
+    elif status.state == FAILED:
+        st.error(f"Query failed: {status.error}")
+    elif status.state == DONE:
+        st.success(f"✅ Query complete — {status.rows:,} rows "
+                   f"({status.elapsed_seconds:.0f}s)")
+
+    mtime = PICKLE_PATH.stat().st_mtime if PICKLE_PATH.exists() else None
+    if mtime is not None and mtime != loaded_mtime:
+        st.rerun()
 
 # ── Load data (cache-first) ───────────────────────────────────────────────────
-def load_data() -> tuple[pd.DataFrame | None, str | None]:
-    """Return (dataframe, last_refreshed_str) from pickle, or (None, None)."""
-    if PICKLE_PATH.exists():
-        df        = pd.read_pickle(PICKLE_PATH)
+def load_data():
+    """Return (ranked assets, last_refreshed_str) from pickle, or (None, None)."""
+    dimension = load_dimension(DEFAULT_SITE)
+    if dimension is not None:
+        df        = dimension[dimension['RANK'].notna()]
         ts        = datetime.fromtimestamp(PICKLE_PATH.stat().st_mtime)
         refreshed = ts.strftime('%Y-%m-%d  %H:%M')
         return df, refreshed
@@ -78,6 +111,7 @@ st.markdown("---")
 with st.sidebar:
     st.header("Data Source")
 
+    loaded_mtime = PICKLE_PATH.stat().st_mtime if PICKLE_PATH.exists() else None
     df, last_refreshed = load_data()
 
     if df is not None:
@@ -89,22 +123,17 @@ with st.sidebar:
 
     refresh_clicked = st.button(
         "🔄 Refresh from Maximo",
-        help="Re-runs asset_rank.sql against Maximo and saves a new pickle",
-        use_container_width=True
+        help=f"Re-runs {SQL_PATH.as_posix()} against Maximo in the background and swaps in a new {PICKLE_PATH.name}",
+        use_container_width=True,
+        disabled=get_refresh_job().status().running,
     )
 
     if refresh_clicked:
-        with st.spinner("Running query against Maximo…"):
-            try:
-                df = run_asset_rank_query()
-                PICKLE_PATH.parent.mkdir(parents=True, exist_ok=True)
-                df.to_pickle(PICKLE_PATH)
-                st.success("✅ Query complete — data refreshed")
-                st.rerun()
-            except FileNotFoundError as e:
-                st.error(str(e))
-            except Exception as e:
-                st.error(f"Query failed: {e}")
+        maximo = get_maximo()
+        if not get_refresh_job().start(lambda job: run_asset_rank_query(job, maximo)):
+            st.caption("A refresh is already running — showing its progress")
+
+    refresh_status(loaded_mtime)
 
     # ── Filters (only show when data is loaded) ───────────────────────────────
     if df is not None:
@@ -129,7 +158,8 @@ with st.sidebar:
 
 # ── Main content ──────────────────────────────────────────────────────────────
 if df is None:
-    st.info("No data available. Use **Refresh from Maximo** in the sidebar to run the query, or ensure `data/asset_rank.pkl` exists.")
+    st.info(f"No data available. Use **Refresh from Maximo** in the sidebar to run the query, "
+            f"or run the pipeline's export stage to write `{PICKLE_PATH.as_posix()}`.")
     st.stop()
 
 # Apply filters